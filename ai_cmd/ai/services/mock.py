@@ -1,5 +1,5 @@
 from asyncio import sleep
-from typing import TYPE_CHECKING, Any, AsyncGenerator
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional
 
 from ...ai.base import AI
 from ...ai.types import ContentToken, Token, ToolsCallsToken
@@ -51,33 +51,47 @@ tool_calls_4 = ToolsCallsToken(
 
 tokens_5 = "Si restas 3 queda 0".split(" ")
 
+DEFAULT_DELAY = 0.2
+
 
 class MockAI(AI):
-    def __init__(self, *_: Any, **_1: Any):
+    def __init__(
+        self,
+        *_: Any,
+        delay: float = DEFAULT_DELAY,
+        answer: Optional[str] = None,
+        **_1: Any,
+    ):
         self.flag = 0
+        self.delay = delay
+        self.answer = answer
 
     async def chat(
         self,
         messages: list["Message"],
         tools: list[Tool],
     ) -> AsyncGenerator[Token, Any]:
-        if not self.flag:
+        if self.answer is not None:
+            for token in self.answer.split(" "):
+                yield ContentToken(token + " ")
+                await sleep(self.delay)
+        elif not self.flag:
             self.flag = 1
             for token in tokens_1:
                 yield ContentToken(token + " ")
-                await sleep(0.2)
+                await sleep(self.delay)
             yield tool_calls_1
         elif self.flag == 1:
             self.flag = 2
             for token in tokens_2:
                 yield ContentToken(token + " ")
-                await sleep(0.2)
+                await sleep(self.delay)
             yield tool_calls_2
         elif self.flag == 2:
             self.flag = 3
             for token in tokens_3:
                 yield ContentToken(token + " ")
-                await sleep(0.2)
+                await sleep(self.delay)
         elif self.flag == 3:
             self.flag = 4
             yield tool_calls_4
@@ -85,4 +99,4 @@ class MockAI(AI):
             self.flag = 0
             for token in tokens_5:
                 yield ContentToken(token + " ")
-                await sleep(0.2)
+                await sleep(self.delay)
@@ -1,6 +1,5 @@
-from typing import TYPE_CHECKING, Any, AsyncGenerator
-
-from openai import APIConnectionError, AsyncOpenAI
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional
 
 from ...base import AI
 from ...exceptions import ConnectionError
@@ -8,20 +7,41 @@ from ...types import ContentToken, Token, ToolsCallsToken
 from .mappers import MessageMapper, ToolCallMapper, ToolMapper
 
 if TYPE_CHECKING:
+    from openai import AsyncOpenAI
     from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
+    from openai.types.chat.chat_completion_message_param import (
+        ChatCompletionMessageParam,
+    )
+    from openai.types.chat.chat_completion_tool_param import ChatCompletionToolParam
     from ....core.history.types import Message
     from ....tools.types import Tool
 
 
 class OpenAI(AI):
     def __init__(self, api_key: str, base_url: str, model: str, temperature: float):
-        self.openai = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        self.api_key = api_key
+        self.base_url = base_url
         self.model = model
         self.temperature = temperature
+        self.message_params: dict[
+            int, tuple["Message", str, int, "ChatCompletionMessageParam"]
+        ] = {}
+        self.tool_params: Optional[
+            tuple[list["Tool"], list["ChatCompletionToolParam"]]
+        ] = None
+
+    @cached_property
+    def openai(self) -> "AsyncOpenAI":
+        # openai tarda en importarse, se carga con la primera peticion
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
 
     async def chat(
         self, messages: list["Message"], tools: list["Tool"]
     ) -> AsyncGenerator["Token", None]:
+        from openai import APIConnectionError
+
         delta_tools_calls: list["ChoiceDeltaToolCall"] = []
         try:
             async for chunk in await self._create_chat(messages, tools):
@@ -36,16 +56,16 @@ class OpenAI(AI):
             raise ConnectionError("Por favor revise su conexion a internet") from exc
         if len(delta_tools_calls):
             yield ToolsCallsToken(
-                tools_calls=await ToolCallMapper.to_domain_list(delta_tools_calls),
+                tools_calls=ToolCallMapper.to_domain_list(delta_tools_calls),
             )
 
     async def _create_chat(self, messages: list["Message"], tools: list["Tool"]):
         arguments: dict[str, Any] = {}
         if len(tools):
-            arguments["tools"] = await ToolMapper.to_openai_list(tools)
+            arguments["tools"] = self._map_tools(tools)
             arguments["tool_choice"] = "auto"
         return await self.openai.chat.completions.create(
-            messages=await MessageMapper.to_openai_list(messages[:-1]),
+            messages=self._map_messages(messages[:-1]),
             model=self.model,
             temperature=self.temperature,
             stream=True,
@@ -53,6 +73,37 @@ class OpenAI(AI):
             **arguments
         )
 
+    def _map_messages(
+        self, messages: list["Message"]
+    ) -> list["ChatCompletionMessageParam"]:
+        """Mapea los mensajes reutilizando los de la peticion anterior que no
+        cambiaron (mismo objeto, mismo contenido y mismas llamadas)"""
+        previous = self.message_params
+        self.message_params = {}
+        params: list["ChatCompletionMessageParam"] = []
+        for message in messages:
+            calls = len(message.tool_calls or ()) if message.role == "assistant" else 0
+            cached = previous.get(id(message))
+            if (
+                cached
+                and cached[0] is message
+                and cached[1] is message.content
+                and cached[2] == calls
+            ):
+                param = cached[3]
+            else:
+                param = MessageMapper.to_openai(message)
+            self.message_params[id(message)] = (message, message.content, calls, param)
+            params.append(param)
+        return params
+
+    def _map_tools(self, tools: list["Tool"]) -> list["ChatCompletionToolParam"]:
+        """Mapea las herramientas, la lista de Tools se reutiliza mientras no
+        cambie asi que basta con comparar su identidad"""
+        if not self.tool_params or self.tool_params[0] is not tools:
+            self.tool_params = (tools, ToolMapper.to_openai_list(tools))
+        return self.tool_params[1]
+
     async def _collecte_tool_calls(
         self,
         delta_tools_calls: list["ChoiceDeltaToolCall"],
@@ -1,4 +1,3 @@
-from asyncio import gather
 from typing import TYPE_CHECKING
 
 from ....tools.types import FunctionCall, Tool, ToolCall
@@ -40,13 +39,13 @@ class _DefaultFunction:
 
 class MessageMapper:
     @staticmethod
-    async def to_openai_list(
+    def to_openai_list(
         messages: list["Message"],
     ) -> list["ChatCompletionMessageParam"]:
-        return await gather(*map(MessageMapper.to_openai, messages))
+        return [MessageMapper.to_openai(message) for message in messages]
 
     @staticmethod
-    async def to_openai(message: "Message") -> "ChatCompletionMessageParam":
+    def to_openai(message: "Message") -> "ChatCompletionMessageParam":
         match message.role:
             case "user":
                 message_param_user: "ChatCompletionUserMessageParam" = {
@@ -63,7 +62,7 @@ class MessageMapper:
                 }
                 if message.tool_calls:
                     message_param_assistant["tool_calls"] = (
-                        await ToolCallMapper.to_openai_list(message.tool_calls)
+                        ToolCallMapper.to_openai_list(message.tool_calls)
                     )
                 return message_param_assistant
             case "tool":
@@ -83,7 +82,7 @@ class MessageMapper:
 
 class ToolCallMapper:
     @staticmethod
-    async def to_openai(tool_call: "ToolCall") -> "ChatCompletionMessageToolCallParam":
+    def to_openai(tool_call: "ToolCall") -> "ChatCompletionMessageToolCallParam":
         return {
             "id": tool_call.id,
             "type": "function",
@@ -94,13 +93,13 @@ class ToolCallMapper:
         }
 
     @staticmethod
-    async def to_openai_list(
+    def to_openai_list(
         tools_calls: list["ToolCall"],
     ) -> list["ChatCompletionMessageToolCallParam"]:
-        return await gather(*map(ToolCallMapper.to_openai, tools_calls))
+        return [ToolCallMapper.to_openai(tool_call) for tool_call in tools_calls]
 
     @staticmethod
-    async def to_domain(delta_tool_call: "ChoiceDeltaToolCall") -> "ToolCall":
+    def to_domain(delta_tool_call: "ChoiceDeltaToolCall") -> "ToolCall":
         function = delta_tool_call.function or _DefaultFunction
         return ToolCall(
             id=delta_tool_call.id or DEFAULT_ID,
@@ -111,15 +110,18 @@ class ToolCallMapper:
         )
 
     @staticmethod
-    async def to_domain_list(
+    def to_domain_list(
         delta_tools_calls: list["ChoiceDeltaToolCall"],
     ) -> list["ToolCall"]:
-        return await gather(*map(ToolCallMapper.to_domain, delta_tools_calls))
+        return [
+            ToolCallMapper.to_domain(delta_tool_call)
+            for delta_tool_call in delta_tools_calls
+        ]
 
 
 class ToolMapper:
     @staticmethod
-    async def to_openai(tool: "Tool") -> "ChatCompletionToolParam":
+    def to_openai(tool: "Tool") -> "ChatCompletionToolParam":
         parameters = tool.function.parameters
         return {
             "type": "function",
@@ -131,5 +133,5 @@ class ToolMapper:
         }
 
     @staticmethod
-    async def to_openai_list(tools: list["Tool"]) -> list["ChatCompletionToolParam"]:
-        return await gather(*map(ToolMapper.to_openai, tools))
+    def to_openai_list(tools: list["Tool"]) -> list["ChatCompletionToolParam"]:
+        return [ToolMapper.to_openai(tool) for tool in tools]
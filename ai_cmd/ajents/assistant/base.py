@@ -2,7 +2,11 @@ from typing import TYPE_CHECKING
 
 from ...ai.services.openai.base import OpenAI
 from ...core.base import Core
+from ...core.budget import ContextBudgeter
+from ...core.coalescer import TokenCoalescer
 from ...core.history.base import History
+from ...core.history.const import HISTORY_FILE
+from ...core.history.storage.sqlite import SQLiteHistoryStorage
 from ...core.history.types import SystemMessage
 from .const import ASSISTANT_SYSTEM_MESSAGE
 from .tools import create_assistant_tools
@@ -25,6 +29,14 @@ def create_assistant_core(
     history = History(
         controller=controller,
         messages=[SystemMessage(content=ASSISTANT_SYSTEM_MESSAGE)],
+        storage=SQLiteHistoryStorage(path=HISTORY_FILE),
     )
     tools = create_assistant_tools(controller, settings=settings, window=window)
-    return Core(controller=controller, ai=ai, history=history, tools=tools)
+    return Core(
+        controller=controller,
+        ai=ai,
+        history=history,
+        tools=tools,
+        coalescer=TokenCoalescer(),
+        budgeter=ContextBudgeter(),
+    )
@@ -37,3 +37,16 @@ ASSISTANT_SYSTEM_MESSAGE = """
      • Breves, en lenguaje natural.  
      • Incluyen: Acciones realizadas + Resultado obtenido + Sugerencias basadas en historial.  
 """
+
+ASSISTANT_TOOL_PACKS = [
+    ("ai_cmd.tools.tools_packs.files", "FilesPack"),
+    ("ai_cmd.tools.tools_packs.paths", "PathsPack"),
+    ("ai_cmd.tools.tools_packs.http", "HttpPack"),
+    ("ai_cmd.tools.tools_packs.dirs.base", "DirsPack"),
+    ("ai_cmd.tools.tools_packs.python.base", "PythonPack"),
+    ("ai_cmd.tools.tools_packs.os", "OSPack"),
+    ("ai_cmd.tools.tools_packs.app", "AppPack"),
+    ("ai_cmd.tools.tools_packs.display", "DisplayPack"),
+    ("ai_cmd.tools.tools_packs.time", "TimePack"),
+    ("ai_cmd.tools.tools_packs.web", "WebPack"),
+]
@@ -1,44 +1,45 @@
+from importlib import import_module
 from typing import TYPE_CHECKING
 
 from ...settings.base import Settings
-from ...tools.tools_packs.app import AppPack
-from ...tools.tools_packs.dirs.base import DirsPack
-from ...tools.tools_packs.display import DisplayPack
-from ...tools.tools_packs.files import FilesPack
-from ...tools.tools_packs.http import HttpPack
-from ...tools.tools_packs.os import OSPack
-from ...tools.tools_packs.paths import PathsPack
-from ...tools.tools_packs.python.base import PythonPack
-from ...tools.tools_packs.time import TimePack
-from ...tools.tools_packs.web import WebPack
+from ...tools.lazy import LazyToolPack
 from ..reasoner.pack import create_ia_reasoner_pack
+from .const import ASSISTANT_TOOL_PACKS
 
 if TYPE_CHECKING:
     from ...controller.base import Controller
+    from ...tools.tool_pack import ToolPack
     from ...window.base import Window
 
 from ...tools.base import Tools
 
 
+def create_tool_pack(
+    module: str, class_name: str, controller: "Controller", window: "Window", lazy: bool
+) -> "ToolPack":
+    if lazy:
+        return LazyToolPack(
+            module=module, class_name=class_name, controller=controller, window=window
+        )
+    pack_class = getattr(import_module(module), class_name)
+    return pack_class(controller=controller, window=window)
+
+
 def create_assistant_tools(
-    controller: "Controller", settings: "Settings", window: "Window"
+    controller: "Controller", settings: "Settings", window: "Window", lazy: bool = True
 ) -> Tools:
+    """Crea las herramientas del asistente, con `lazy` los modulos de los
+    paquetes se importan al ejecutar su primera herramienta"""
     ai_reasoner_pack = create_ia_reasoner_pack(
         controller=controller, settings=settings, window=window
     )
     return Tools(
         controller=controller,
         tool_packs=[
-            FilesPack(controller=controller, window=window),
-            PathsPack(controller=controller, window=window),
-            HttpPack(controller=controller, window=window),
-            DirsPack(controller=controller, window=window),
-            PythonPack(controller=controller, window=window),
-            OSPack(controller=controller, window=window),
-            AppPack(controller=controller, window=window),
-            DisplayPack(controller=controller, window=window),
-            TimePack(controller=controller, window=window),
-            WebPack(controller=controller, window=window),
+            *(
+                create_tool_pack(module, class_name, controller, window, lazy)
+                for module, class_name in ASSISTANT_TOOL_PACKS
+            ),
             ai_reasoner_pack,
         ],
     )
@@ -1,25 +1,13 @@
 from asyncio import CancelledError, Task, create_task
 from dataclasses import dataclass, field
+from time import monotonic
 from traceback import format_exception
 from typing import TYPE_CHECKING
 
 from prompt_toolkit import HTML, PromptSession, print_formatted_text
-from prompt_toolkit.formatted_text.pygments import PygmentsTokens
 from prompt_toolkit.shortcuts import PromptSession, print_formatted_text
-from prompt_toolkit.styles import style_from_pygments_cls
-from pygments import lex
-from pygments.lexers.python import PythonTracebackLexer  # type: ignore
-from pygments.styles.onedark import OneDarkStyle  # type: ignore
-from rich.live import Live
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.style import Style
 
 from ..ai.exceptions import ConnectionError
-from ..app.renders.tool_messages import (
-    render_dirs_list_tool_message,
-    render_generic_tool_message,
-)
 from ..controller.utils import decorator_listener
 from ..core.events import (
     CoreGenerationEndEvent,
@@ -28,18 +16,19 @@ from ..core.events import (
     CoreGenerationStartEvent,
 )
 from ..core.history.types import ToolMessage
-from ..tools.events import ToolsExecuteEndEvent, ToolsExecuteStartEvent
-from .const import COMMAND_START
-from .exceptions import AppClose
-from .renders.tool_calls import (
-    render_dirs_list_tool_call,
-    render_files_read_tool_call,
-    render_files_write_tool_call,
-    render_generic_tool_call,
-    render_os_shell_tool_call,
+from ..tools.events import (
+    ToolPackProcessEndEvent,
+    ToolPackProcessOutputEvent,
+    ToolPackProcessStartEvent,
+    ToolsExecuteEndEvent,
+    ToolsExecuteStartEvent,
 )
+from .const import COMMAND_START, RENDER_FPS
+from .exceptions import AppClose
 
 if TYPE_CHECKING:
+    from rich.live import Live
+
     from ..controller.base import Controller
     from ..core.base import Core
     from ..settings.base import Settings
@@ -56,9 +45,11 @@ class App:
     window: "Window"
     settings: "Settings"
     prompt: str = field(default="+ ", init=False)
+    render_fps: float = field(default=RENDER_FPS)
 
     task: Task[None] | None = None
-    live: Live | None = None
+    live: "Live | None" = None
+    process_live: "Live | None" = None
     running: bool = False
 
     def __post_init__(self):
@@ -95,12 +86,29 @@ class App:
                 tool_call=event.tool_call, tool_message=event.tool_message
             )
 
+        @decorator_listener(controller=controller, event_type=ToolPackProcessStartEvent)
+        async def _(event: "ToolPackProcessStartEvent"):
+            await self.on_process_start(command=event.command)
+
+        @decorator_listener(
+            controller=controller, event_type=ToolPackProcessOutputEvent
+        )
+        async def _(event: "ToolPackProcessOutputEvent"):
+            await self.on_process_output(content=event.content)
+
+        @decorator_listener(controller=controller, event_type=ToolPackProcessEndEvent)
+        async def _(event: "ToolPackProcessEndEvent"):
+            await self.on_process_end()
+
     async def run(self):
         self.running = True
-        while self.running:
-            value = await self.session.prompt_async()
-            await self.create_task(value)
-            await self.wait_for_task()
+        try:
+            while self.running:
+                value = await self.session.prompt_async()
+                await self.create_task(value)
+                await self.wait_for_task()
+        finally:
+            await self.core.close()
 
     async def create_task(self, value: str):
         if value.startswith(COMMAND_START):
@@ -140,6 +148,13 @@ class App:
             await self.print_exception(error=event.error)
 
     async def print_exception(self, error: Exception):
+        # Los renderizadores se importan al usarse por primera vez
+        from prompt_toolkit.formatted_text.pygments import PygmentsTokens
+        from prompt_toolkit.styles import style_from_pygments_cls
+        from pygments import lex
+        from pygments.lexers.python import PythonTracebackLexer  # type: ignore
+        from pygments.styles.onedark import OneDarkStyle  # type: ignore
+
         traceback = "\n".join(format_exception(error))
         formatted_text = PygmentsTokens(
             list(lex(traceback, lexer=PythonTracebackLexer()))
@@ -150,32 +165,87 @@ class App:
     ### On Start Generation
 
     async def on_generation_start(self):
-        self.content_buffer = ""
-        self.live = Live(auto_refresh=False)
-        self.live.start()
+        from rich.panel import Panel
+        from rich.style import Style
+
+        from .renders.markdown import StreamingMarkdown
+
+        self.markdown = StreamingMarkdown()
+        self.panel = Panel(
+            self.markdown,
+            title="Asistente",
+            padding=1,
+            border_style=Style(color="blue"),
+        )
+        self.last_refresh = 0.0
+        await self.start_live()
 
     async def on_generation_content(self, content: str):
-        self.content_buffer += content
-        markdown = Markdown(self.content_buffer)
+        self.markdown.feed(content)
         if not self.live:
-            self.live = Live(auto_refresh=False)
-            self.live.start()
+            await self.start_live()
         if self.live:
-            self.live.update(
-                Panel(
-                    markdown,
-                    title="Asistente",
-                    padding=1,
-                    border_style=Style(color="blue"),
-                ),
-                refresh=True,
-            )
+            now = monotonic()
+            if self.live.renderable is not self.panel:
+                self.live.update(self.panel)
+            elif now - self.last_refresh < 1 / self.render_fps:
+                return
+            self.last_refresh = now
+            self.live.refresh()
 
     async def on_generation_end(self):
+        await self.stop_live()
+
+    async def start_live(self):
+        from rich.live import Live
+
+        self.live = Live(auto_refresh=False)
+        self.live.start()
+
+    async def stop_live(self):
         if self.live:
+            self.markdown.finish()
             self.live.stop()
             self.live = None
 
+    ### On Process
+
+    async def on_process_start(self, command: str):
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.style import Style
+
+        from .renders.process import ProcessOutput
+
+        await self.stop_live()
+        self.process_output = ProcessOutput()
+        self.process_live = Live(
+            Panel(
+                self.process_output,
+                title=command,
+                title_align="left",
+                border_style=Style(color="yellow"),
+            ),
+            auto_refresh=False,
+            transient=True,
+        )
+        self.process_live.start()
+        self.last_refresh = 0.0
+
+    async def on_process_output(self, content: str):
+        if not self.process_live:
+            return
+        self.process_output.feed(content)
+        now = monotonic()
+        if now - self.last_refresh >= 1 / self.render_fps:
+            self.last_refresh = now
+            self.process_live.refresh()
+
+    async def on_process_end(self):
+        if self.process_live:
+            self.process_live.stop()
+            self.process_live = None
+
     async def on_cancell_task(self):
         pass
 
@@ -186,9 +256,15 @@ class App:
         self.task = None
 
     async def on_tool_call_start(self, tool_call: "ToolCall"):
-        if self.live:
-            self.live.stop()
-            self.live = None
+        from .renders.tool_calls import (
+            render_dirs_list_tool_call,
+            render_files_read_tool_call,
+            render_files_write_tool_call,
+            render_generic_tool_call,
+            render_os_shell_tool_call,
+        )
+
+        await self.stop_live()
         match tool_call.function.name:
             case "files_read":
                 await render_files_read_tool_call(tool_call=tool_call)
@@ -202,6 +278,12 @@ class App:
                 await render_generic_tool_call(tool_call=tool_call)
 
     async def on_tool_message(self, tool_call: "ToolCall", tool_message: "ToolMessage"):
+        from .renders.tool_calls import render_os_shell_tool_call
+        from .renders.tool_messages import (
+            render_dirs_list_tool_message,
+            render_generic_tool_message,
+        )
+
         match tool_call.function.name:
             case "dirs_list":
                 await render_dirs_list_tool_message(
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 
 from prompt_toolkit import HTML, print_formatted_text
@@ -15,22 +16,14 @@ COLORS_BY_ROLE = {
 
 
 class HistoryPack(CommandPack):
-    def do_info(self):
+    async def do_info(self):
         """Muestar informacion sobre el historial de mensajes"""
-        system_msgs = 0
-        user_msgs = 0
-        tool_msgs = 0
-        assistant_msgs = 0
-        for msg in self.app.core.history.messages:
-            if msg.role == "assistant":
-                assistant_msgs += 1
-            elif msg.role == "tool":
-                tool_msgs += 1
-            elif msg.role == "user":
-                user_msgs += 1
-            elif msg.role == "system":
-                system_msgs += 1
-        lenght = len(self.app.core.history.messages)
+        counts = await self.app.core.history.count()
+        system_msgs = counts.get("system", 0)
+        user_msgs = counts.get("user", 0)
+        tool_msgs = counts.get("tool", 0)
+        assistant_msgs = counts.get("assistant", 0)
+        lenght = sum(counts.values())
         print_formatted_text(
             HTML(f"<yellow>{system_msgs}</yellow> mensajes del sistema")
         )
@@ -43,36 +36,33 @@ class HistoryPack(CommandPack):
         )
         print_formatted_text(HTML(f"<white>{lenght} mensajes en total</white>"))
 
-    def do_schema(self, top: Optional[int] = 0):
+    async def do_schema(self, top: Optional[int] = 0):
         """Muesta el orden y el rol del historial de mensajes"""
 
-        for i, message in enumerate(self.app.core.history.messages[top:]):
-            style = COLORS_BY_ROLE[message.role]
+        for schema in await self.app.core.history.schema(offset=top or 0):
+            style = COLORS_BY_ROLE[schema.role]
             print_formatted_text(
                 HTML(
-                    f"<{style}>index -> {i:0>3} role -> {message.role} lenght -> {len(message.content)}</{style}>"
+                    f"<{style}>index -> {schema.index:0>3} role -> {schema.role} lenght -> {schema.length}</{style}>"
                 )
             )
-            if message.role == "assistant" and message.tool_calls:
-                for tool_call in message.tool_calls:
-                    style = COLORS_BY_ROLE["function"]
-                    print_formatted_text(
-                        HTML(
-                            f"<{style}>tool_call {tool_call.function.name} lenght -> {len(tool_call.function.arguments)}</{style}>"
-                        )
-                    )
+            for name, length in schema.tool_calls:
+                style = COLORS_BY_ROLE["function"]
+                print_formatted_text(
+                    HTML(f"<{style}>tool_call {name} lenght -> {length}</{style}>")
+                )
 
-    def do_delete(self, index: Optional[int] = None):
+    async def do_delete(self, index: Optional[int] = None):
         """Elimina mensajes del chat"""
         try:
-            self.app.core.history.messages.pop(index if index else -1)
+            await self.app.core.history.delete(index if index else -1)
             print_formatted_text(HTML("<green>Mensaje borrado con exito</green>"))
         except IndexError:
             print_formatted_text(HTML("<red>Indice fuera de rango</red>"))
 
-    def do_show(self, range: Optional[int] = None):
+    async def do_show(self, range: Optional[int] = None):
         """Muestra mensajes del chat"""
-        messages = self.app.core.history.messages[(-(range) if range else -1) :]
+        messages = await self.app.core.history.tail(range if range else 1)
         if not messages:
             return print_formatted_text(HTML("<gray>Sin mensajes que borrar</gray>"))
         for message in messages:
@@ -80,7 +70,30 @@ class HistoryPack(CommandPack):
                 HTML(f"<green>{message.role} > {message.content}</green>")
             )
 
+    async def do_sessions(self):
+        """Lista las sesiones guardadas"""
+        sessions = await self.app.core.history.sessions()
+        if not sessions:
+            return print_formatted_text(HTML("<gray>Sin sesiones guardadas</gray>"))
+        for session, count, created in sessions:
+            date = datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M")
+            style = "green" if session == self.app.core.history.session else "white"
+            print_formatted_text(
+                HTML(f"<{style}>{session} {date} -> {count} mensajes</{style}>")
+            )
+
+    async def do_resume(self, session: str):
+        """Continua una sesion guardada"""
+        await self.app.core.history.resume(session)
+        print_formatted_text(
+            HTML(
+                f"<green>{len(self.app.core.history.messages)} mensajes cargados</green>"
+            )
+        )
+
     async def do_reset(self):
+        """Empieza una sesion nueva"""
+        await self.app.core.close()
         self.app.core = create_assistant_core(
             self.app.controller, self.app.settings, self.app.window
         )
@@ -1 +1,3 @@
 COMMAND_START: str = "/"
+RENDER_FPS: float = 15
+PROCESS_OUTPUT_LINES: int = 20
@@ -0,0 +1,112 @@
+from typing import TYPE_CHECKING, Optional
+
+from rich.markdown import Markdown
+from rich.segment import Segment
+
+if TYPE_CHECKING:
+    from rich.console import Console, ConsoleOptions, RenderResult
+
+FENCES = ("```", "~~~")
+
+
+class MarkdownBlock:
+    """Bloque de markdown terminado, guarda las lineas renderizadas"""
+
+    def __init__(self, markup: str):
+        self.markdown = Markdown(markup)
+        self.width: Optional[int] = None
+        self.lines: list[list[Segment]] = []
+
+    def __rich_console__(
+        self, console: "Console", options: "ConsoleOptions"
+    ) -> "RenderResult":
+        if self.width != options.max_width:
+            lines = console.render_lines(self.markdown, options, pad=False)
+            while lines and not any(segment.text for segment in lines[0]):
+                lines.pop(0)
+            self.lines = lines
+            self.width = options.max_width
+        new_line = Segment.line()
+        for line in self.lines:
+            yield from line
+            yield new_line
+
+
+class StreamingMarkdown:
+    """Markdown que se construye token a token.
+
+    Los bloques terminados (separados por una linea vacia fuera de un bloque
+    de codigo) se parsean una sola vez y se cachean, solo el ultimo bloque
+    sin terminar se vuelve a parsear en cada renderizado.
+    """
+
+    def __init__(self):
+        self.blocks: list[MarkdownBlock] = []
+        self.tail = ""
+        self.offset = 0
+        self.fence: Optional[str] = None
+        self.boundary: Optional[int] = None
+        self._tail_block: Optional[MarkdownBlock] = None
+
+    def feed(self, content: str) -> None:
+        """Agrega contenido al final del markdown"""
+        self.tail += content
+        self._tail_block = None
+        self._split()
+
+    def finish(self) -> None:
+        """Cierra el ultimo bloque"""
+        self._commit(len(self.tail))
+
+    def _split(self) -> None:
+        while (end := self.tail.find("\n", self.offset)) != -1:
+            line = self.tail[self.offset : end]
+            start = self.offset
+            self.offset = end + 1
+            stripped = line.strip()
+            if self.fence:
+                if stripped.startswith(self.fence):
+                    self.fence = None
+                continue
+            if not stripped:
+                if self.boundary is None:
+                    self.boundary = start
+                continue
+            if self.boundary is not None and not line[0].isspace():
+                self._commit(self.boundary, start)
+            self.boundary = None
+            for fence in FENCES:
+                if stripped.startswith(fence):
+                    self.fence = fence
+                    break
+        if (
+            self.boundary is not None
+            and self.offset < len(self.tail)
+            and not self.tail[self.offset].isspace()
+        ):
+            self._commit(self.boundary, self.offset)
+
+    def _commit(self, end: int, start: Optional[int] = None) -> None:
+        markup = self.tail[:end]
+        if markup.strip():
+            self.blocks.append(MarkdownBlock(markup))
+        start = end if start is None else start
+        self.tail = self.tail[start:]
+        self.offset = max(0, self.offset - start)
+        self.boundary = None
+        self._tail_block = None
+
+    def __rich_console__(
+        self, console: "Console", options: "ConsoleOptions"
+    ) -> "RenderResult":
+        new_line = Segment.line()
+        for index, block in enumerate(self.blocks):
+            if index:
+                yield new_line
+            yield block
+        if self.tail.strip():
+            if self.blocks:
+                yield new_line
+            if self._tail_block is None:
+                self._tail_block = MarkdownBlock(self.tail)
+            yield self._tail_block
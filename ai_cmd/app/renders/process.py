@@ -0,0 +1,29 @@
+from collections import deque
+from typing import TYPE_CHECKING
+
+from rich.text import Text
+
+from ..const import PROCESS_OUTPUT_LINES
+
+if TYPE_CHECKING:
+    from rich.console import Console, ConsoleOptions, RenderResult
+
+
+class ProcessOutput:
+    """Ultimas lineas de la salida de un proceso en ejecucion"""
+
+    def __init__(self, max_lines: int = PROCESS_OUTPUT_LINES):
+        self.lines: deque[str] = deque([""], maxlen=max_lines)
+
+    def feed(self, content: str) -> None:
+        """Agrega salida del proceso"""
+        first, *rest = content.split("\n")
+        self.lines[-1] += first
+        self.lines.extend(rest)
+
+    def __rich_console__(
+        self, console: "Console", options: "ConsoleOptions"
+    ) -> "RenderResult":
+        yield Text(
+            "\n".join(self.lines), style="dim", no_wrap=True, overflow="ellipsis"
+        )
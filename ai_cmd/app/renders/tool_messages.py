@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from html import escape
+from typing import TYPE_CHECKING, Any
 
 from prompt_toolkit import HTML
 from prompt_toolkit.layout import FormattedTextControl, HSplit, Window
@@ -33,6 +34,19 @@ async def render_generic_tool_message(
     return Window(to_formated_text_controll(text), wrap_lines=True)
 
 
+def format_dirs_element(element: str | dict[str, Any]) -> str:
+    """Un elemento de dirs_list, con su tipo y tamaño si se pidieron los detalles"""
+    if not isinstance(element, dict):
+        return escape(str(element))
+    text = escape(str(element.get("path", "")))
+    details = [str(element["type"])] if "type" in element else []
+    if "size" in element:
+        details.append(f"{element['size']} bytes")
+    if details:
+        text += f" <gray>({escape(', '.join(details))})</gray>"
+    return text
+
+
 @simple_render_tool_message
 async def render_dirs_list_tool_message(
     tool_call: "ToolCall", tool_message: "ToolMessage"
@@ -43,18 +57,25 @@ async def render_dirs_list_tool_message(
         text = f"<red>❌ Error <b>{name}</b>: {error}</red>"
         container = Window(FormattedTextControl(HTML(text)), wrap_lines=True)
     else:
-        elements: list[str] = response.get("elements", [])
+        elements: list[str | dict[str, Any]] = response.get("elements", [])
         path: str = response.get("path", "")
         size = len(str(len(elements)))
-        container = HSplit(
-            [
-                Window(to_formated_text_controll(f"Directorio <b>{path}</b>")),
-                *(
-                    Window(to_formated_text_controll(f" {i:0>{size}}:{element}"))
-                    for i, element in enumerate(elements)
-                ),
-            ]
-        )
+        windows = [
+            Window(to_formated_text_controll(f"Directorio <b>{escape(path)}</b>")),
+            *(
+                Window(
+                    to_formated_text_controll(
+                        f" {i:0>{size}}:{format_dirs_element(element)}"
+                    )
+                )
+                for i, element in enumerate(elements)
+            ),
+        ]
+        if response.get("next_cursor"):
+            windows.append(
+                Window(to_formated_text_controll("<gray>... hay más elementos</gray>"))
+            )
+        container = HSplit(windows)
     return container
 
 
@@ -1,5 +1,6 @@
 from asyncio import gather
-from typing import TYPE_CHECKING, Optional
+from inspect import isawaitable, iscoroutinefunction
+from typing import TYPE_CHECKING, Any, Optional
 from uuid import uuid4
 
 if TYPE_CHECKING:
@@ -7,42 +8,69 @@ if TYPE_CHECKING:
     from .types import Listener as Listener_
 
     Listener = Listener_[Event]
-from ..utils import wrapped_sync
+
+
+Dispatch = tuple[tuple["Listener", ...], tuple["Listener", ...]]
 
 
 class Controller:
     def __init__(self):
-        self.registry: dict[type["Event"], list[tuple[str, "Listener"]]] = {}
+        self.registry: dict[type["Event"], list[tuple[str, "Listener", bool]]] = {}
+        self.dispatch: dict[type["Event"], Dispatch] = {}
 
     def subscribe(self, event_type: type["Event"], listener: "Listener") -> str:
         id = str(uuid4())
-        data = (id, listener)
+        data = (id, listener, is_coroutine(listener))
         if not event_type in self.registry:
             self.registry[event_type] = [data]
         else:
             self.registry[event_type].append(data)
+        self.dispatch.clear()
         return id
 
     def clear(self, id: str, event_type: Optional[type["Event"]] = None):
         for listeners in (
             [self.registry[event_type]] if event_type else self.registry.values()
         ):
-            for index, (listener_id, _) in enumerate(listeners):
+            for index, (listener_id, *_) in enumerate(listeners):
                 if id == listener_id:
                     listeners.pop(index)
+                    self.dispatch.clear()
                     return True
         return False
 
+    def resolve(self, event_type: type["Event"]) -> Dispatch:
+        """Obtiene los listeners de un tipo de evento y de sus padres,
+        separados en sincronos y asincronos"""
+        listeners = [
+            data for type in event_type.__mro__ for data in self.registry.get(type, ())
+        ]
+        dispatch = (
+            tuple(listener for _, listener, coroutine in listeners if not coroutine),
+            tuple(listener for _, listener, coroutine in listeners if coroutine),
+        )
+        self.dispatch[event_type] = dispatch
+        return dispatch
+
     async def trigger(self, event: "Event"):
-        type_event = type(event)
-        if not type_event in self.registry:
+        dispatch = self.dispatch.get(type(event))
+        if dispatch is None:
+            dispatch = self.resolve(type(event))
+        sync_listeners, async_listeners = dispatch
+        for listener in sync_listeners:
+            value = listener(event)
+            if isawaitable(value):
+                await value
+        if not async_listeners:
+            return
+        if len(async_listeners) == 1:
+            await async_listeners[0](event)  # type: ignore
             return
+        await gather(*(listener(event) for listener in async_listeners))  # type: ignore
 
-        def fathers():
-            for type, listeners in self.registry.items():
-                if isinstance(event, type):
-                    for _, listener in listeners:
-                        yield listener
 
-        generator = (wrapped_sync(listener, event) for listener in fathers())
-        await gather(*generator)
+def is_coroutine(listener: Any) -> bool:
+    """Comprueba si un listener es una funcion asincrona"""
+    return iscoroutinefunction(listener) or iscoroutinefunction(
+        getattr(listener, "__call__", None)
+    )
@@ -1,7 +1,9 @@
-from asyncio import CancelledError
+from asyncio import CancelledError, to_thread
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional
 
+from ..tools.http.client import http_client
+from ..tools.offload import cpu_executor, io_executor
 from .events import (
     CoreGenerationEndEvent,
     CoreGenerationErrorEvent,
@@ -20,6 +22,8 @@ if TYPE_CHECKING:
     from ..core.history.base import History
     from ..tools.base import Tools
     from ..tools.types import Tool
+    from .budget import ContextBudgeter
+    from .coalescer import TokenCoalescer
 
 
 #
@@ -29,6 +33,9 @@ class Core:
     ai: "AI"
     history: "History"
     tools: Optional["Tools"] = field(default=None)
+    coalescer: Optional["TokenCoalescer"] = field(default=None)
+    budgeter: Optional["ContextBudgeter"] = field(default=None)
+    content_parts: list[str] = field(default_factory=list, init=False, repr=False)
 
     async def start_generation(self, content: str, name: Optional[str] = None) -> None:
         message = UserMessage(content=content, name=name)
@@ -66,9 +73,15 @@ class Core:
         event = CoreGenerationStartEvent(core=self)
         await self.controller.trigger(event=event)
         tools = await self.list_tools()
-        completion = self.ai.chat(messages=self.history.messages, tools=tools)
         message = AssistantMessage()
         await self.history.add_assistant_message(message=message)
+        messages = self.history.messages
+        if self.budgeter:
+            messages = self.budgeter.window(messages)
+        completion = self.ai.chat(messages=messages, tools=tools)
+        if self.coalescer:
+            completion = self.coalescer.coalesce(completion)
+        self.content_parts = []
         return completion, message
 
     async def process_generation_step(
@@ -94,8 +107,12 @@ class Core:
     ) -> bool:
         event = CoreGenerationEndEvent(core=self)
         await self.controller.trigger(event=event)
+        if self.content_parts:
+            message.content += "".join(self.content_parts)
+            self.content_parts = []
         if message.content == "":
             message.content = "ok"
+        await self.history.flush(message=message)
         return has_next_step
 
     async def handler_content_token(
@@ -105,7 +122,7 @@ class Core:
             core=self, token=token, message=message
         )
         await self.controller.trigger(event=event)
-        message.content += token.content
+        self.content_parts.append(token.content)
         return False
 
     async def handler_tools_calls_token(
@@ -119,9 +136,9 @@ class Core:
             return False
         if not message.tool_calls:
             message.tool_calls = []
-        for tool_call in token.tools_calls:
-            message.tool_calls.append(tool_call)
-            tool_message = await self.tools.execute(tool_call=tool_call)
+        message.tool_calls.extend(token.tools_calls)
+        tool_messages = await self.tools.execute_all(tool_calls=token.tools_calls)
+        for tool_message in tool_messages:
             await self.history.add_tool_message(message=tool_message)
         return True
 
@@ -137,6 +154,18 @@ class Core:
             await self.tools.reset()
         await self.history.reset()
 
+    async def close(self) -> None:
+        """Termina los procesos de las herramientas, cierra las conexiones
+        HTTP compartidas y el historial y detiene los hilos y procesos de los
+        ejecutores, el core no se puede usar despues"""
+        if self.tools:
+            await self.tools.reset()
+        await http_client.close()
+        await self.history.close()
+        # Los ejecutores vuelven a crearse si otro core los necesita
+        await to_thread(cpu_executor.shutdown)
+        await to_thread(io_executor.shutdown)
+
 
 """
 with Progress(console=self.console) as progress:
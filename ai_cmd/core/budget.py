@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from .const import (
+    CHARS_PER_TOKEN,
+    DEFAULT_MAX_TOKENS,
+    DEFAULT_TRUNCATE_CHARS,
+    MESSAGE_OVERHEAD_TOKENS,
+    TRUNCATED_MARK,
+)
+
+if TYPE_CHECKING:
+    from .history.types import Message
+
+
+def message_size(message: "Message") -> int:
+    """Cantidad de caracteres que ocupa un mensaje en la peticion"""
+    size = len(message.content)
+    if message.role == "assistant" and message.tool_calls:
+        for tool_call in message.tool_calls:
+            size += len(tool_call.function.name) + len(tool_call.function.arguments)
+    return size
+
+
+def estimate_tokens(message: "Message") -> int:
+    """Estima los tokens de un mensaje, el resultado se cachea en el mensaje
+    y se invalida cuando cambia su tamaño"""
+    size = message_size(message)
+    if message.token_estimate and message.token_estimate[0] == size:
+        return message.token_estimate[1]
+    tokens = MESSAGE_OVERHEAD_TOKENS + -(-size // CHARS_PER_TOKEN)
+    message.token_estimate = (size, tokens)
+    return tokens
+
+
+@dataclass(kw_only=True)
+class ContextBudgeter:
+    """Limita los mensajes que se envian a la IA a `max_tokens`.
+
+    Los mensajes del sistema siempre se envian. Si el historial no cabe se
+    truncan primero los resultados de herramientas mas antiguos y despues se
+    descartan los mensajes mas antiguos, una llamada a herramientas junto con
+    sus resultados. Nunca se descarta el ultimo mensaje del usuario ni lo que
+    le sigue. El historial no se modifica, los mensajes truncados son copias.
+    """
+
+    max_tokens: int = field(default=DEFAULT_MAX_TOKENS)
+    truncate_chars: int = field(default=DEFAULT_TRUNCATE_CHARS)
+    total: int = field(default=0, init=False)
+    counted: list["Message"] = field(default_factory=list, init=False, repr=False)
+    estimates: list[int] = field(default_factory=list, init=False, repr=False)
+
+    def count(self, messages: list["Message"]) -> int:
+        """Actualiza el total acumulado con los mensajes nuevos.
+
+        Solo se vuelven a estimar los mensajes desde el primero que cambio o el
+        ultimo contado, que puede seguir recibiendo contenido.
+        """
+        start = 0
+        limit = min(len(self.counted), len(messages))
+        while start < limit and self.counted[start] is messages[start]:
+            start += 1
+        start = min(start, max(0, len(self.counted) - 1))
+        for estimate in self.estimates[start:]:
+            self.total -= estimate
+        del self.counted[start:]
+        del self.estimates[start:]
+        for message in messages[start:]:
+            estimate = estimate_tokens(message)
+            self.counted.append(message)
+            self.estimates.append(estimate)
+            self.total += estimate
+        return self.total
+
+    def window(self, messages: list["Message"]) -> list["Message"]:
+        """Mensajes a enviar dentro del presupuesto"""
+        total = self.count(messages)
+        if total <= self.max_tokens:
+            return messages
+        units = self.units(messages)
+        protected = len(units)
+        for index in range(len(units) - 1, -1, -1):
+            protected = index
+            if messages[units[index][0]].role == "user":
+                break
+        window = list(messages)
+
+        # Resultados de herramientas antiguos
+        for start, end in units[:protected]:
+            for index in range(start, end):
+                message = window[index]
+                if message.role != "tool" or self.truncate_chars >= len(
+                    message.content
+                ):
+                    continue
+                truncated = replace(
+                    message,
+                    content=message.content[: self.truncate_chars] + TRUNCATED_MARK,
+                )
+                total += estimate_tokens(truncated) - estimate_tokens(message)
+                window[index] = truncated
+                if total <= self.max_tokens:
+                    return window
+
+        # Mensajes antiguos completos
+        dropped: set[int] = set()
+        for start, end in units[:protected]:
+            if window[start].role == "system":
+                continue
+            for index in range(start, end):
+                total -= estimate_tokens(window[index])
+                dropped.add(index)
+            if total <= self.max_tokens:
+                break
+        return [message for index, message in enumerate(window) if not index in dropped]
+
+    @staticmethod
+    def units(messages: list["Message"]) -> list[tuple[int, int]]:
+        """Agrupa cada llamada a herramientas con sus resultados"""
+        units: list[tuple[int, int]] = []
+        index = 0
+        while index < len(messages):
+            end = index + 1
+            message = messages[index]
+            if message.role == "assistant" and message.tool_calls:
+                while end < len(messages) and messages[end].role == "tool":
+                    end += 1
+            units.append((index, end))
+            index = end
+        return units
@@ -0,0 +1,72 @@
+from asyncio import Future, ensure_future, wait
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional
+
+from ..ai.types import ContentToken
+
+if TYPE_CHECKING:
+    from ..ai.types import Token
+
+DEFAULT_MAX_CHARS = 256
+DEFAULT_MAX_DELAY = 0.05
+
+
+@dataclass(kw_only=True)
+class TokenCoalescer:
+    """Agrupa los tokens de contenido consecutivos de una generacion.
+
+    Un grupo se entrega cuando alcanza `max_chars` caracteres o cuando pasan
+    `max_delay` segundos desde su primer token, lo que ocurra antes. Los
+    tokens de llamadas de herramientas entregan el grupo pendiente y pasan
+    sin cambios.
+    """
+
+    max_chars: int = field(default=DEFAULT_MAX_CHARS)
+    max_delay: float = field(default=DEFAULT_MAX_DELAY)
+
+    async def coalesce(
+        self, completion: AsyncGenerator["Token", Any]
+    ) -> AsyncGenerator["Token", Any]:
+        parts: list[str] = []
+        size = 0
+        deadline = 0.0
+        pending: Optional[Future["Token"]] = None
+        try:
+            while True:
+                try:
+                    if pending is None and not parts:
+                        token = await anext(completion)
+                    else:
+                        if pending is None:
+                            pending = ensure_future(anext(completion))
+                        if parts:
+                            done, _ = await wait(
+                                {pending}, timeout=max(0, deadline - monotonic())
+                            )
+                            if not done:
+                                yield ContentToken(content="".join(parts))
+                                parts, size = [], 0
+                                continue
+                        token = await pending
+                        pending = None
+                except StopAsyncIteration:
+                    break
+                if token.type != "content":
+                    if parts:
+                        yield ContentToken(content="".join(parts))
+                        parts, size = [], 0
+                    yield token
+                    continue
+                if not parts:
+                    deadline = monotonic() + self.max_delay
+                parts.append(token.content)
+                size += len(token.content)
+                if size >= self.max_chars or monotonic() >= deadline:
+                    yield ContentToken(content="".join(parts))
+                    parts, size = [], 0
+            if parts:
+                yield ContentToken(content="".join(parts))
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
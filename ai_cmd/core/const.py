@@ -0,0 +1,5 @@
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+DEFAULT_MAX_TOKENS = 48_000
+DEFAULT_TRUNCATE_CHARS = 400
+TRUNCATED_MARK = "\n...[contenido truncado]"
@@ -1,6 +1,8 @@
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+from uuid import uuid4
 
+from .const import DEFAULT_BATCH_SIZE
 from .events import (
     HistoryMessageAddAssistantEvent,
     HistoryMessageAddSystemEvent,
@@ -8,9 +10,11 @@ from .events import (
     HistoryMessageAddUserEvent,
     HistoryResetEvent,
 )
+from .types import MessageSchema
 
 if TYPE_CHECKING:
     from ...controller.base import Controller
+    from .storage.base import HistoryStorage
     from .types import (
         AssistantMessage,
         Message,
@@ -24,28 +28,140 @@ if TYPE_CHECKING:
 class History:
     controller: "Controller"
     messages: list["Message"]
+    storage: Optional["HistoryStorage"] = field(default=None)
+    session: str = field(default_factory=lambda: uuid4().hex)
+    batch_size: int = field(default=DEFAULT_BATCH_SIZE)
+    pending: set[int] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.pending.update(range(len(self.messages)))
 
     async def reset(self) -> None:
         event = HistoryResetEvent(history=self)
         await self.controller.trigger(event=event)
+        await self.flush()
         self.messages = []
+        self.pending = set()
+        self.session = uuid4().hex
+
+    async def close(self) -> None:
+        """Guarda lo pendiente y cierra el almacenamiento"""
+        if not self.storage:
+            return
+        await self.flush()
+        await self.storage.close()
 
     async def add_user_message(self, message: "UserMessage") -> None:
         event = HistoryMessageAddUserEvent(history=self, message=message)
         await self.controller.trigger(event=event)
-        self.messages.append(message)
+        await self.append(message)
 
     async def add_assistant_message(self, message: "AssistantMessage") -> None:
         event = HistoryMessageAddAssistantEvent(history=self, message=message)
         await self.controller.trigger(event=event)
-        self.messages.append(message)
+        await self.append(message)
 
     async def add_tool_message(self, message: "ToolMessage") -> None:
         event = HistoryMessageAddToolEvent(history=self, message=message)
         await self.controller.trigger(event=event)
-        self.messages.append(message)
+        await self.append(message)
 
     async def add_system_message(self, message: "SystemMessage") -> None:
         event = HistoryMessageAddSystemEvent(history=self, message=message)
         await self.controller.trigger(event=event)
+        await self.append(message)
+
+    async def append(self, message: "Message") -> None:
         self.messages.append(message)
+        self.pending.add(len(self.messages) - 1)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self, message: Optional["Message"] = None) -> None:
+        """Guarda los mensajes pendientes, `message` se marca como modificado"""
+        if not self.storage:
+            return
+        if message is not None:
+            for index in range(len(self.messages) - 1, -1, -1):
+                if self.messages[index] is message:
+                    self.pending.add(index)
+                    break
+        if not self.pending:
+            return
+        batch = [
+            (index, self.messages[index])
+            for index in sorted(self.pending)
+            if index < len(self.messages)
+        ]
+        self.pending = set()
+        await self.storage.save(self.session, batch)
+
+    async def resume(self, session: str) -> None:
+        """Carga los mensajes de una sesion guardada"""
+        if not self.storage:
+            return
+        await self.flush()
+        self.messages = await self.storage.load(session)
+        self.pending = set()
+        self.session = session
+
+    async def sessions(self) -> list[tuple[str, int, float]]:
+        if not self.storage:
+            return []
+        await self.flush()
+        return await self.storage.sessions()
+
+    async def count(self) -> dict[str, int]:
+        """Cantidad de mensajes por rol"""
+        if self.storage:
+            await self.flush()
+            return await self.storage.count(self.session)
+        counts: dict[str, int] = {}
+        for message in self.messages:
+            counts[message.role] = counts.get(message.role, 0) + 1
+        return counts
+
+    async def schema(self, offset: int = 0) -> list["MessageSchema"]:
+        """Resumen de los mensajes desde `offset`"""
+        if self.storage:
+            await self.flush()
+            return await self.storage.schema(self.session, offset)
+        return [
+            MessageSchema(
+                index=index,
+                role=message.role,
+                length=len(message.content),
+                tool_calls=(
+                    [
+                        (tool_call.function.name, len(tool_call.function.arguments))
+                        for tool_call in message.tool_calls
+                    ]
+                    if message.role == "assistant" and message.tool_calls
+                    else []
+                ),
+            )
+            for index, message in enumerate(self.messages[offset:], start=offset)
+        ]
+
+    async def tail(self, count: int) -> list["Message"]:
+        """Ultimos `count` mensajes"""
+        if self.storage:
+            await self.flush()
+            return await self.storage.tail(self.session, count)
+        return self.messages[-count:] if count > 0 else []
+
+    async def delete(self, index: int = -1) -> None:
+        """Elimina un mensaje, lanza IndexError si no existe"""
+        if index < 0:
+            index += len(self.messages)
+        if not 0 <= index < len(self.messages):
+            raise IndexError(index)
+        self.messages.pop(index)
+        if not self.storage:
+            return
+        self.pending = {
+            pending if pending < index else pending - 1
+            for pending in self.pending
+            if pending != index
+        }
+        await self.storage.delete(self.session, index)
@@ -0,0 +1,8 @@
+from os import environ, path
+
+DATA_DIR = path.join(
+    environ.get("XDG_DATA_HOME") or path.join(path.expanduser("~"), ".local", "share"),
+    "ai_cmd",
+)
+HISTORY_FILE = path.join(DATA_DIR, "history.db")
+DEFAULT_BATCH_SIZE = 32
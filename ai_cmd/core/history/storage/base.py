@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..types import Message, MessageSchema
+
+
+class HistoryStorage(ABC):
+    """Almacenamiento persistente de los mensajes de History por sesion"""
+
+    @abstractmethod
+    async def save(self, session: str, messages: list[tuple[int, "Message"]]) -> None:
+        """Guarda (o reemplaza) los mensajes en sus posiciones en un solo lote"""
+
+    @abstractmethod
+    async def load(self, session: str) -> list["Message"]:
+        """Carga todos los mensajes de una sesion"""
+
+    @abstractmethod
+    async def count(self, session: str) -> dict[str, int]:
+        """Cuenta los mensajes de una sesion por rol"""
+
+    @abstractmethod
+    async def schema(self, session: str, offset: int = 0) -> list["MessageSchema"]:
+        """Obtiene el resumen de los mensajes desde una posicion"""
+
+    @abstractmethod
+    async def tail(self, session: str, count: int) -> list["Message"]:
+        """Obtiene los ultimos mensajes de una sesion"""
+
+    @abstractmethod
+    async def delete(self, session: str, index: int) -> None:
+        """Elimina un mensaje y desplaza los siguientes"""
+
+    @abstractmethod
+    async def sessions(self) -> list[tuple[str, int, float]]:
+        """Lista las sesiones con su cantidad de mensajes y ultima fecha"""
+
+    @abstractmethod
+    async def clear(self, session: str) -> None:
+        """Elimina todos los mensajes de una sesion"""
+
+    async def close(self) -> None:
+        """Libera los recursos del almacenamiento"""
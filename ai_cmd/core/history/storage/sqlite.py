@@ -0,0 +1,166 @@
+import os
+import sqlite3
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING
+
+from ....tools.offload import io_bound
+from ..types import MessageSchema
+from .base import HistoryStorage
+from .utils import data_to_message, message_to_data, tool_calls_lengths
+
+if TYPE_CHECKING:
+    from ..types import Message
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (session, position)
+);
+CREATE INDEX IF NOT EXISTS messages_role ON messages (session, role);
+CREATE INDEX IF NOT EXISTS messages_created ON messages (session, created);
+"""
+
+
+class SQLiteHistoryStorage(HistoryStorage):
+    """Guarda el historial en una base de datos SQLite.
+
+    Las consultas se hacen en los hilos de `io_executor`, de a una por vez.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if path != ":memory:" and directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.lock = Lock()
+
+    @io_bound
+    def save(self, session: str, messages: list[tuple[int, "Message"]]) -> None:
+        with self.lock:
+            created = time()
+            with self.connection:
+                self.connection.executemany(
+                    """
+                    INSERT INTO messages (session, position, role, content, data, created)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (session, position) DO UPDATE SET
+                        role = excluded.role,
+                        content = excluded.content,
+                        data = excluded.data
+                    """,
+                    [
+                        (
+                            session,
+                            index,
+                            message.role,
+                            message.content,
+                            message_to_data(message),
+                            created,
+                        )
+                        for index, message in messages
+                    ],
+                )
+
+    @io_bound
+    def load(self, session: str) -> list["Message"]:
+        with self.lock:
+            cursor = self.connection.execute(
+                "SELECT role, content, data FROM messages WHERE session = ? ORDER BY position",
+                (session,),
+            )
+            return [data_to_message(*row) for row in cursor]
+
+    @io_bound
+    def count(self, session: str) -> dict[str, int]:
+        with self.lock:
+            cursor = self.connection.execute(
+                "SELECT role, COUNT(*) FROM messages WHERE session = ? GROUP BY role",
+                (session,),
+            )
+            return dict(cursor.fetchall())
+
+    @io_bound
+    def schema(self, session: str, offset: int = 0) -> list["MessageSchema"]:
+        with self.lock:
+            cursor = self.connection.execute(
+                """
+                SELECT position, role, LENGTH(content), data FROM messages
+                WHERE session = ? AND position >= ? ORDER BY position
+                """,
+                (session, offset),
+            )
+            return [
+                MessageSchema(
+                    index=index,
+                    role=role,
+                    length=length,
+                    tool_calls=tool_calls_lengths(data) if role == "assistant" else [],
+                )
+                for index, role, length, data in cursor
+            ]
+
+    @io_bound
+    def tail(self, session: str, count: int) -> list["Message"]:
+        with self.lock:
+            cursor = self.connection.execute(
+                """
+                SELECT role, content, data FROM messages WHERE session = ?
+                ORDER BY position DESC LIMIT ?
+                """,
+                (session, count),
+            )
+            return [data_to_message(*row) for row in reversed(cursor.fetchall())]
+
+    @io_bound
+    def delete(self, session: str, index: int) -> None:
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM messages WHERE session = ? AND position = ?",
+                    (session, index),
+                )
+                # En dos pasos para no chocar con la clave primaria
+                self.connection.execute(
+                    """
+                    UPDATE messages SET position = -position
+                    WHERE session = ? AND position > ?
+                    """,
+                    (session, index),
+                )
+                self.connection.execute(
+                    """
+                    UPDATE messages SET position = -position - 1
+                    WHERE session = ? AND position < 0
+                    """,
+                    (session,),
+                )
+
+    @io_bound
+    def sessions(self) -> list[tuple[str, int, float]]:
+        with self.lock:
+            cursor = self.connection.execute("""
+                SELECT session, COUNT(*), MAX(created) FROM messages
+                GROUP BY session ORDER BY MAX(created) DESC
+                """)
+            return cursor.fetchall()
+
+    @io_bound
+    def clear(self, session: str) -> None:
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM messages WHERE session = ?", (session,)
+                )
+
+    @io_bound
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
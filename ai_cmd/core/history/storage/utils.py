@@ -0,0 +1,79 @@
+from json import dumps, loads
+from typing import Any
+
+from ....tools.types import FunctionCall, ToolCall
+from ..types import (
+    AssistantMessage,
+    Message,
+    SystemMessage,
+    ToolMessage,
+    UserMessage,
+)
+
+
+def message_to_data(message: "Message") -> str:
+    """Serializa los campos de un mensaje que no son rol ni contenido"""
+    data: dict[str, Any] = {}
+    match message.role:
+        case "user":
+            data["name"] = message.name
+        case "assistant":
+            if message.tool_calls:
+                data["tool_calls"] = [
+                    {
+                        "id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments,
+                    }
+                    for tool_call in message.tool_calls
+                ]
+        case "tool":
+            data["name"] = message.name
+            data["tool_call_id"] = message.tool_call_id
+        case "system":
+            pass
+    return dumps(data)
+
+
+def data_to_message(role: str, content: str, data: str) -> "Message":
+    """Reconstruye un mensaje a partir de su rol, contenido y datos"""
+    values: dict[str, Any] = loads(data) if data else {}
+    match role:
+        case "user":
+            return UserMessage(content=content, name=values.get("name"))
+        case "assistant":
+            tool_calls = values.get("tool_calls")
+            return AssistantMessage(
+                content=content,
+                tool_calls=(
+                    [
+                        ToolCall(
+                            id=tool_call["id"],
+                            function=FunctionCall(
+                                name=tool_call["name"],
+                                arguments=tool_call["arguments"],
+                            ),
+                        )
+                        for tool_call in tool_calls
+                    ]
+                    if tool_calls
+                    else None
+                ),
+            )
+        case "tool":
+            return ToolMessage(
+                name=values.get("name"),
+                content=content,
+                tool_call_id=values.get("tool_call_id", ""),
+            )
+        case _:
+            return SystemMessage(content=content)
+
+
+def tool_calls_lengths(data: str) -> list[tuple[str, int]]:
+    """Obtiene el nombre y la longitud de los argumentos de cada llamada"""
+    values: dict[str, Any] = loads(data) if data else {}
+    return [
+        (tool_call["name"], len(tool_call["arguments"]))
+        for tool_call in values.get("tool_calls", [])
+    ]
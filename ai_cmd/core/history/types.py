@@ -9,6 +9,7 @@ __all__ = [
     "AssistantMessage",
     "ToolMessage",
     "SystemMessage",
+    "MessageSchema",
 ]
 
 
@@ -17,6 +18,9 @@ class UserMessage:
     content: str
     name: Optional[str] = field(default=None)
     role: Literal["user"] = field(default="user")
+    token_estimate: Optional[tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass
@@ -24,6 +28,9 @@ class AssistantMessage:
     content: str = field(default="")
     tool_calls: Optional[list["ToolCall"]] = field(default=None)
     role: Literal["assistant"] = field(default="assistant")
+    token_estimate: Optional[tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass
@@ -32,12 +39,28 @@ class ToolMessage:
     content: str
     tool_call_id: str
     role: Literal["tool"] = field(default="tool")
+    token_estimate: Optional[tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass
 class SystemMessage:
     content: str
     role: Literal["system"] = field(default="system")
+    token_estimate: Optional[tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 Message: TypeAlias = UserMessage | AssistantMessage | ToolMessage | SystemMessage
+
+
+@dataclass
+class MessageSchema:
+    """Resumen de un mensaje guardado"""
+
+    index: int
+    role: str
+    length: int
+    tool_calls: list[tuple[str, int]] = field(default_factory=list)
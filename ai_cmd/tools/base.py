@@ -1,6 +1,7 @@
+from asyncio import Semaphore, gather
 from dataclasses import dataclass, field
 from json import dumps
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from ai_cmd.tools.events import (
     ToolsExecuteEndEvent,
@@ -21,6 +22,7 @@ if TYPE_CHECKING:
     from .types import Tool, ToolCall
 
 DEFAULT_DISABLEDS: list[str] = []
+DEFAULT_MAX_CONCURRENCY = 4
 
 
 @dataclass(kw_only=True)
@@ -30,6 +32,13 @@ class Tools:
     controller: "Controller"
     tool_packs: list["ToolPack"]
     disableds: list[str] = field(default_factory=lambda: DEFAULT_DISABLEDS)
+    max_concurrency: int = field(default=DEFAULT_MAX_CONCURRENCY)
+    listed: "Optional[tuple[list[ToolPack], list[Tool]]]" = field(
+        default=None, init=False, repr=False
+    )
+    indexed: "Optional[tuple[list[ToolPack], dict[str, tuple[ToolPack, Tool]]]]" = (
+        field(default=None, init=False, repr=False)
+    )
 
     async def add(self, tool_pack: "ToolPack") -> None:
         """Add tool pack to the handler."""
@@ -41,13 +50,22 @@ class Tools:
                     f"ToolPack with name '{tool_pack.name}' already exists."
                 )
         self.tool_packs.append(tool_pack)
+        self.invalidate()
 
     async def list(self) -> list["Tool"]:
-        """Get all tools enableds."""
-        tools: list["Tool"] = []
-        for tool_pack in self.tool_packs:
-            if not tool_pack.name in self.disableds:
-                tools.extend(await tool_pack.tools())
+        """Get all tools enableds.
+
+        The list is cached until the tool packs change, callers must not
+        modify it.
+        """
+        if self.listed and self.listed[0] is self.tool_packs:
+            tools = self.listed[1]
+        else:
+            tools = []
+            for tool_pack in self.tool_packs:
+                if not tool_pack.name in self.disableds:
+                    tools.extend(await tool_pack.tools())
+            self.listed = (self.tool_packs, tools)
         event = ToolsListEvent(tools=self, list=tools)
         await self.controller.trigger(event=event)
         return tools
@@ -59,6 +77,7 @@ class Tools:
                     event = ToolsStateDisableEvent(tools=self, name=name)
                     await self.controller.trigger(event=event)
                     self.disableds.append(name)
+                    self.invalidate()
                 return
         raise ValueError(f"ToolPack with name '{name}' not found.")
 
@@ -69,6 +88,7 @@ class Tools:
                     event = ToolsStateEnableEvent(tools=self, name=name)
                     await self.controller.trigger(event=event)
                     self.disableds.remove(name)
+                    self.invalidate()
                 return
         raise ValueError(f"ToolPack with name '{name}' not found.")
 
@@ -86,6 +106,12 @@ class Tools:
         self.tool_packs = [tp for tp in self.tool_packs if tp.name != name]
         if name in self.disableds:
             self.disableds.remove(name)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Discards the cached tool list and index."""
+        self.listed = None
+        self.indexed = None
 
     async def execute(self, tool_call: "ToolCall") -> ToolMessage:
         """Executes a tool.
@@ -98,17 +124,15 @@ class Tools:
         """
         event = ToolsExecuteStartEvent(tools=self, tool_call=tool_call)
         await self.controller.trigger(event=event)
-        tool_pack = None
         name: None | str = None
         try:
-            for element in self.tool_packs:
-                if await element.exists(tool_name=tool_call.function.name):
-                    tool_pack = element
-                    break
+            tool_pack, tool = await self.find(tool_name=tool_call.function.name)
             if not tool_pack:
                 content = {
                     "error": f"Herramienta '{tool_call.function.name}' no registrada"
                 }
+            elif tool:
+                content = await tool_pack.execute(tool_call=tool_call, tool=tool)
             else:
                 content = await tool_pack.execute(tool_call=tool_call)
         except Exception as exc:
@@ -124,3 +148,65 @@ class Tools:
         )
         await self.controller.trigger(event=event)
         return tool_message
+
+    async def execute_all(self, tool_calls: "list[ToolCall]") -> "list[ToolMessage]":
+        """Executes several tools, running the independent ones concurrently.
+
+        Calls to tool packs that are not concurrent act as barriers: they wait
+        for the previous calls and run alone.
+
+        Args:
+            tool_calls (list[ToolCall]): The tool calls in the model order.
+
+        Returns:
+            list[ToolMessage]: The messages in the same order as the calls.
+        """
+        semaphore = Semaphore(max(1, self.max_concurrency))
+
+        async def execute(tool_call: "ToolCall") -> ToolMessage:
+            async with semaphore:
+                return await self.execute(tool_call=tool_call)
+
+        tool_messages: "list[ToolMessage]" = []
+        batch: "list[ToolCall]" = []
+        for tool_call in tool_calls:
+            if await self.is_concurrent(tool_call=tool_call):
+                batch.append(tool_call)
+                continue
+            tool_messages.extend(await gather(*map(execute, batch)))
+            batch = []
+            tool_messages.append(await self.execute(tool_call=tool_call))
+        tool_messages.extend(await gather(*map(execute, batch)))
+        return tool_messages
+
+    async def is_concurrent(self, tool_call: "ToolCall") -> bool:
+        """Checks if a tool call can run together with other calls."""
+        tool_pack, _ = await self.find(tool_name=tool_call.function.name)
+        return tool_pack.concurrent if tool_pack else True
+
+    async def find(self, tool_name: str) -> "tuple[Optional[ToolPack], Optional[Tool]]":
+        """Finds the tool pack and the tool for a tool name.
+
+        Uses an index of the tools of every pack, rebuilt when the tool packs
+        change. Packs that do not list a tool but report it through `exists`
+        are still found by scanning them in order.
+
+        Args:
+            tool_name (str): The name of the tool.
+
+        Returns:
+            tuple[ToolPack | None, Tool | None]: The pack and the tool, the
+                tool is None if the pack was found by scanning.
+        """
+        if not self.indexed or self.indexed[0] is not self.tool_packs:
+            index: "dict[str, tuple[ToolPack, Tool]]" = {}
+            for tool_pack in self.tool_packs:
+                for tool in await tool_pack.tools():
+                    index.setdefault(tool.function.name, (tool_pack, tool))
+            self.indexed = (self.tool_packs, index)
+        if found := self.indexed[1].get(tool_name):
+            return found
+        for tool_pack in self.tool_packs:
+            if await tool_pack.exists(tool_name=tool_name):
+                return tool_pack, None
+        return None, None
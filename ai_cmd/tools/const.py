@@ -0,0 +1,55 @@
+from os import cpu_count, path
+
+CACHE_DIR = path.join(path.expanduser("~"), ".cache", "ai_cmd")
+SCHEMA_CACHE_FILE = path.join(CACHE_DIR, "schemas.json")
+HTTP_CACHE_DIR = path.join(CACHE_DIR, "http")
+TRIGRAM_INDEX_DIR = path.join(CACHE_DIR, "trigrams")
+
+DEFAULT_SHELL_TIMEOUT = 300.0
+DEFAULT_MAX_OUTPUT = 50_000
+"""Caracteres de salida de un proceso que se devuelven, mitad principio y mitad final"""
+PROCESS_CHUNK_SIZE = 64 * 1024
+SHELL_DRAIN_TIMEOUT = 1.0
+"""Segundos que se sigue leyendo la salida de una terminal que termino sin recibir el comando"""
+
+DEFAULT_IO_WORKERS = 8
+"""Hilos del ejecutor de las operaciones de archivos"""
+IO_CHUNK_SIZE = 1024 * 1024
+DEFAULT_READ_BYTES = 200_000
+"""Bytes que devuelve una lectura de un archivo si no se indica otra cantidad"""
+LINE_INDEX_STEP = 1024
+"""Cada cuantas lineas se guarda una posicion en el indice de lineas"""
+LINE_INDEX_ENTRIES = 32
+STAT_CACHE_ENTRIES = 4096
+"""Rutas cuyo stat se mantiene en memoria"""
+STAT_CACHE_TTL = 1.0
+"""Segundos que vale un stat guardado si no se puede vigilar con inotify"""
+STAT_CACHE_MAX_AGE = 30.0
+"""Segundos que vale como mucho un stat guardado vigilado con inotify"""
+
+DEFAULT_CPU_WORKERS = cpu_count() or 1
+"""Procesos del ejecutor de las herramientas que usan la CPU"""
+DEFAULT_CPU_WARM_UP = False
+"""Si los procesos se inician al crear un paquete con herramientas que usan la CPU"""
+
+DEFAULT_SEARCH_RESULTS = 200
+"""Coincidencias o archivos que devuelve una busqueda antes de dar un cursor"""
+SEARCH_BATCH_FILES = 256
+"""Archivos que revisa cada tarea de una busqueda en paralelo"""
+BINARY_SNIFF_BYTES = 8192
+"""Bytes del principio de un archivo donde un byte nulo indica que es binario"""
+MAX_MATCH_LINE = 500
+MMAP_THRESHOLD = 1024 * 1024
+"""Tamaño a partir del cual una busqueda mapea el archivo en vez de leerlo"""
+
+DEFAULT_SCAN_DEPTH = 3
+"""Niveles de subdirectorios que recorre dirs_scan"""
+DEFAULT_SCAN_ENTRIES = 500
+"""Entradas que devuelve dirs_scan antes de dar un cursor"""
+DEFAULT_LIST_ENTRIES = 1000
+"""Entradas que devuelve dirs_list antes de dar un cursor"""
+
+MAX_INDEXED_FILE = 4 * 1024 * 1024
+"""Archivos mas grandes no se indexan y se revisan siempre en las busquedas"""
+TRIGRAM_INDEX_ENTRIES = 4
+"""Indices de trigramas que se mantienen cargados en memoria"""
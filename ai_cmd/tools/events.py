@@ -11,10 +11,15 @@
         - ToolsExecuteEndEvent
     - ToolsResetEvent
     - ToolsListEvent
+- ToolPackEvent
+    - ToolPackProcessEvent
+        - ToolPackProcessStartEvent
+        - ToolPackProcessOutputEvent
+        - ToolPackProcessEndEvent
 """
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from ..controller.types import Event
 
@@ -118,3 +123,44 @@ class ToolsListEvent(ToolsEvent):
 
     list: list["Tool"]
     type: str = field(default="tools_list")
+
+
+
+@dataclass(kw_only=True)
+class ToolPackEvent(Event):
+    """Evento de un paquete de herramientas"""
+
+    tool_pack: "ToolPack"
+    type: str = field(default="tool_pack")
+
+
+@dataclass(kw_only=True)
+class ToolPackProcessEvent(ToolPackEvent):
+    """Evento de un proceso lanzado por un paquete de herramientas"""
+
+    command: str
+    type: str = field(default="tool_pack_process")
+
+
+@dataclass(kw_only=True)
+class ToolPackProcessStartEvent(ToolPackProcessEvent):
+    """Inicio de un proceso"""
+
+    type: str = field(default="tool_pack_process_start")
+
+
+@dataclass(kw_only=True)
+class ToolPackProcessOutputEvent(ToolPackProcessEvent):
+    """Salida de un proceso mientras se ejecuta"""
+
+    stream: str
+    content: str
+    type: str = field(default="tool_pack_process_output")
+
+
+@dataclass(kw_only=True)
+class ToolPackProcessEndEvent(ToolPackProcessEvent):
+    """Final de un proceso"""
+
+    returncode: Optional[int]
+    type: str = field(default="tool_pack_process_end")
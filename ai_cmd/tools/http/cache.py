@@ -0,0 +1,275 @@
+import sqlite3
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from json import dumps, loads
+from os import makedirs, path, remove, replace
+from threading import RLock
+from time import time
+from typing import Any, Mapping, Optional
+
+from .const import DEFAULT_CACHE_SIZE, DEFAULT_PARSED_ENTRIES, HTTP_CACHE_INDEX
+from .types import CacheEntry, HttpResponse
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+)
+"""
+
+
+def cache_control(headers: Mapping[str, str]) -> dict[str, Optional[str]]:
+    """Directivas de Cache-Control en minusculas"""
+    directives: dict[str, Optional[str]] = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def expiration(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """Hasta cuando es fresca una respuesta, None si no se puede guardar.
+
+    Las respuestas sin tiempo de vida pero con ETag o Last-Modified se
+    guardan vencidas, para revalidarlas con una peticion condicional.
+    """
+    directives = cache_control(headers)
+    if "no-store" in directives or headers.get("vary", "").strip() == "*":
+        return None
+    validators = "etag" in headers or "last-modified" in headers
+    lifetime: Optional[float] = None
+    if "no-cache" in directives:
+        lifetime = 0
+    elif (max_age := directives.get("max-age")) is not None:
+        try:
+            lifetime = max(0, int(max_age) - int(headers.get("age", "0") or 0))
+        except ValueError:
+            lifetime = 0
+    elif expires := headers.get("expires"):
+        try:
+            lifetime = max(0, parsedate_to_datetime(expires).timestamp() - now)
+        except (TypeError, ValueError):
+            lifetime = 0
+    if not lifetime and not validators:
+        return None
+    return now + (lifetime or 0)
+
+
+class HttpCache:
+    """Cache HTTP en disco.
+
+    Guarda el cuerpo de las respuestas GET en archivos y sus metadatos en un
+    indice SQLite, que se mantiene en memoria. Respeta Cache-Control, Expires,
+    ETag y Last-Modified, y cuando pasa de `max_size` bytes elimina las
+    entradas usadas hace mas tiempo.
+
+    Los metodos hacen E/S de disco y se pueden llamar desde los hilos de
+    `io_executor`, de a uno por vez.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.connection: Optional[sqlite3.Connection] = None
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.touched: set[str] = set()
+        self.size = 0
+        self.lock = RLock()
+
+    def _load(self) -> sqlite3.Connection:
+        if self.connection is None:
+            makedirs(self.directory, exist_ok=True)
+            self.connection = sqlite3.connect(
+                path.join(self.directory, HTTP_CACHE_INDEX), check_same_thread=False
+            )
+            self.connection.execute(SCHEMA)
+            cursor = self.connection.execute("""
+                SELECT url, file, size, digest, status_code, headers, encoding,
+                    expires, accessed, etag, last_modified
+                FROM entries ORDER BY accessed
+                """)
+            for row in cursor:
+                entry = CacheEntry(*row[:5], loads(row[5]), *row[6:])
+                self.entries[entry.url] = entry
+                self.size += entry.size
+        return self.connection
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Entrada guardada de una url, None si no esta o se perdio su archivo"""
+        with self.lock:
+            self._load()
+            entry = self.entries.get(url)
+            if entry and not path.exists(path.join(self.directory, entry.file)):
+                self._delete(entry)
+                return None
+            return entry
+
+    def validators(self, entry: CacheEntry) -> dict[str, str]:
+        """Cabeceras para revalidar una entrada con una peticion condicional"""
+        headers: dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def response(self, entry: CacheEntry) -> HttpResponse:
+        """Respuesta de una entrada, marcandola como usada.
+
+        El uso se guarda en el indice junto con la siguiente escritura.
+        """
+        with self.lock:
+            entry.accessed = time()
+            self.entries.move_to_end(entry.url)
+            self.touched.add(entry.url)
+            return HttpResponse(
+                url=entry.url,
+                status_code=entry.status_code,
+                headers=entry.headers,
+                encoding=entry.encoding,
+                path=path.join(self.directory, entry.file),
+                digest=entry.digest,
+                from_cache=True,
+            )
+
+    def refresh(self, entry: CacheEntry, headers: Mapping[str, str]) -> HttpResponse:
+        """Actualiza una entrada revalidada (304 Not Modified)"""
+        with self.lock:
+            now = time()
+            expires = expiration(headers, now)
+            entry.expires = now if expires is None else expires
+            entry.etag = headers.get("etag", entry.etag)
+            entry.last_modified = headers.get("last-modified", entry.last_modified)
+            connection = self._load()
+            with connection:
+                connection.execute(
+                    """
+                    UPDATE entries SET expires = ?, etag = ?, last_modified = ?
+                    WHERE url = ?
+                    """,
+                    (entry.expires, entry.etag, entry.last_modified, entry.url),
+                )
+            return self.response(entry)
+
+    def store(self, response: HttpResponse) -> None:
+        """Guarda una respuesta si sus cabeceras lo permiten"""
+        with self.lock:
+            now = time()
+            expires = expiration(response.headers, now)
+            if expires is None or response.truncated:
+                return
+            connection = self._load()
+            if previous := self.entries.get(response.url):
+                self._delete(previous)
+            content = response.content
+            entry = CacheEntry(
+                url=response.url,
+                file=response.digest,
+                size=len(content),
+                digest=response.digest,
+                status_code=response.status_code,
+                headers=response.headers,
+                encoding=response.encoding,
+                expires=expires,
+                accessed=now,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+            file = path.join(self.directory, entry.file)
+            if not path.exists(file):
+                temporary = f"{file}.tmp"
+                with open(temporary, "wb") as body:
+                    body.write(content)
+                replace(temporary, file)
+            with connection:
+                connection.execute(
+                    """
+                    INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        entry.url,
+                        entry.file,
+                        entry.size,
+                        entry.digest,
+                        entry.status_code,
+                        dumps(entry.headers),
+                        entry.encoding,
+                        entry.expires,
+                        entry.accessed,
+                        entry.etag,
+                        entry.last_modified,
+                    ),
+                )
+            self.entries[entry.url] = entry
+            self.size += entry.size
+            self._evict()
+            self.flush()
+
+    def flush(self) -> None:
+        """Guarda en el indice cuando se usaron las entradas"""
+        with self.lock:
+            if not self.touched or self.connection is None:
+                return
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE entries SET accessed = ? WHERE url = ?",
+                    [
+                        (self.entries[url].accessed, url)
+                        for url in self.touched
+                        if url in self.entries
+                    ],
+                )
+            self.touched = set()
+
+    def _evict(self) -> None:
+        while self.size > self.max_size and self.entries:
+            self._delete(next(iter(self.entries.values())))
+
+    def _delete(self, entry: CacheEntry) -> None:
+        del self.entries[entry.url]
+        self.size -= entry.size
+        connection = self._load()
+        with connection:
+            connection.execute("DELETE FROM entries WHERE url = ?", (entry.url,))
+        # Varias urls pueden compartir el archivo si tienen el mismo contenido
+        if not any(other.file == entry.file for other in self.entries.values()):
+            try:
+                remove(path.join(self.directory, entry.file))
+            except OSError:
+                pass
+
+
+class ParsedCache:
+    """Cache en memoria de resultados derivados de un contenido (texto,
+    enlaces) por el hash del contenido"""
+
+    def __init__(self, max_entries: int = DEFAULT_PARSED_ENTRIES):
+        self.max_entries = max_entries
+        self.values: "OrderedDict[tuple[str, str], Any]" = OrderedDict()
+
+    def get(self, digest: str, kind: str) -> Optional[Any]:
+        value = self.values.get((digest, kind))
+        if value is not None:
+            self.values.move_to_end((digest, kind))
+        return value
+
+    def put(self, digest: str, kind: str, value: Any) -> None:
+        if not digest:
+            return
+        self.values[(digest, kind)] = value
+        self.values.move_to_end((digest, kind))
+        while len(self.values) > self.max_entries:
+            self.values.popitem(last=False)
+
+
+parsed_cache = ParsedCache()
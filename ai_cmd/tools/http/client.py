@@ -0,0 +1,187 @@
+from asyncio import AbstractEventLoop, Semaphore, get_running_loop
+from contextlib import asynccontextmanager
+from hashlib import sha256
+from time import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional
+
+from ..const import HTTP_CACHE_DIR
+from ..offload import io_executor
+from .cache import HttpCache
+from .const import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_PER_HOST,
+    DEFAULT_TIMEOUT,
+    USER_AGENT,
+)
+from .types import HttpResponse
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class HttpClient:
+    """Cliente HTTP asincrono compartido por los paquetes de herramientas.
+
+    Reutiliza las conexiones (keep-alive) y limita las peticiones simultaneas
+    a un mismo host. El cliente se crea con la primera peticion y se vuelve a
+    crear si cambia el bucle de eventos. Con `cache` las peticiones GET pasan
+    por la cache HTTP en disco.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: Optional[HttpCache] = None,
+    ):
+        self.cache = cache
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.client: Optional["httpx.AsyncClient"] = None
+        self.loop: Optional[AbstractEventLoop] = None
+        self.semaphores: dict[str, Semaphore] = {}
+
+    async def _client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        loop = get_running_loop()
+        if self.client is None or self.loop is not loop:
+            await self._close_client()
+            self.client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self.loop = loop
+            self.semaphores = {}
+        return self.client
+
+    def _semaphore(self, url: "httpx.URL") -> Semaphore:
+        host = f"{url.scheme}://{url.host}:{url.port}"
+        if host not in self.semaphores:
+            self.semaphores[host] = Semaphore(self.max_per_host)
+        return self.semaphores[host]
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        data: Optional[str | bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator["httpx.Response"]:
+        """Abre una peticion cuyo cuerpo se lee por partes"""
+        import httpx
+
+        client = await self._client()
+        request = client.build_request(
+            method.upper(),
+            url,
+            content=data,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        async with self._semaphore(request.url):
+            response = await client.send(request, stream=True)
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[str | bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        on_chunk: Optional[Callable[[bytes, str], bool]] = None,
+    ) -> HttpResponse:
+        """Hace una peticion y lee hasta `max_bytes` del cuerpo.
+
+        `on_chunk` recibe cada parte del cuerpo descargado con su codificacion,
+        si devuelve False se deja de leer y la respuesta queda truncada. No se
+        llama si la respuesta sale de la cache. Las consultas a la cache y la
+        lectura del cuerpo guardado se hacen en `io_executor`.
+
+        Lanza httpx.HTTPStatusError si la respuesta es un error.
+        """
+        cache = self.cache if method.lower() == "get" and data is None else None
+        entry = (await io_executor.run(cache.get, url)) if cache else None
+        if cache and entry:
+            if entry.expires > time():
+                return await self._cached(cache.response, entry)
+            headers = {**(headers or {}), **cache.validators(entry)}
+        async with self.stream(
+            method, url, data=data, headers=headers, timeout=timeout
+        ) as response:
+            if cache and entry and response.status_code == 304:
+                return await self._cached(cache.refresh, entry, response.headers)
+            response.raise_for_status()
+            chunks: list[bytes] = []
+            size = 0
+            truncated = False
+            encoding = response.encoding or "utf-8"
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > max_bytes:
+                    truncated = True
+                    break
+                if on_chunk is not None and not on_chunk(chunk, encoding):
+                    truncated = True
+                    break
+            content = b"".join(chunks)[:max_bytes]
+            result = HttpResponse(
+                url=url,
+                status_code=response.status_code,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                encoding=encoding,
+                body=content,
+                digest=sha256(content).hexdigest(),
+                truncated=truncated,
+            )
+        if cache:
+            await io_executor.run(cache.store, result)
+        return result
+
+    async def _cached(
+        self, function: Callable[..., HttpResponse], *args: Any
+    ) -> HttpResponse:
+        """Respuesta de la cache con el cuerpo ya leido"""
+
+        def read() -> HttpResponse:
+            response = function(*args)
+            response.load()
+            return response
+
+        return await io_executor.run(read)
+
+    async def close(self) -> None:
+        """Cierra las conexiones abiertas, la siguiente peticion crea otras"""
+        if self.cache:
+            await io_executor.run(self.cache.flush)
+        await self._close_client()
+
+    async def _close_client(self) -> None:
+        client, self.client = self.client, None
+        if client is None:
+            return
+        try:
+            await client.aclose()
+        except (RuntimeError, OSError):
+            # Las conexiones son de otro bucle de eventos, que ya puede estar
+            # cerrado; sus sockets se cierran al descartarlas
+            pass
+
+
+http_client = HttpClient(cache=HttpCache(directory=HTTP_CACHE_DIR))
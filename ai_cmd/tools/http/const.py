@@ -0,0 +1,11 @@
+USER_AGENT = "Mozilla/5.0"
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_CACHE_SIZE = 100 * 1024 * 1024
+DEFAULT_PARSED_ENTRIES = 256
+HTTP_CACHE_INDEX = "index.db"
+DEFAULT_TEXT_BUDGET = 200_000
+DEFAULT_READ_LIMIT = 20_000
+TEXT_CHUNK_SIZE = 64 * 1024
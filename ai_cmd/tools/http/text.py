@@ -0,0 +1,153 @@
+import re
+from codecs import getincrementaldecoder
+from html.parser import HTMLParser
+
+from .const import DEFAULT_TEXT_BUDGET
+
+SKIPPED_TAGS = {
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "canvas",
+    "iframe",
+    "nav",
+    "footer",
+    "aside",
+    "button",
+    "select",
+}
+"""Etiquetas cuyo contenido no es texto de la pagina"""
+
+HEAD_TAGS = {"base", "link", "meta", "noscript", "script", "style", "template", "title"}
+"""Etiquetas que pueden estar en el head, cualquier otra lo cierra"""
+
+BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "td",
+    "th",
+    "title",
+    "tr",
+    "ul",
+}
+"""Etiquetas que separan el texto en lineas"""
+
+SPACES = re.compile(r"[ \t\r\f\v]+")
+LINES = re.compile(r" *\n[ \n]*")
+
+
+class TextExtractor(HTMLParser):
+    """Extrae el texto de un HTML que llega por partes.
+
+    Descarta el contenido de scripts, estilos, svg y menus de navegacion y
+    del head solo se queda con el titulo; el head termina al cerrarse o al
+    empezar una etiqueta que no puede contener, como en los navegadores. Deja
+    de acumular texto al llegar a `max_chars` caracteres, a partir de ahi
+    `done` es verdadero y el resto del documento se puede descartar.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_TEXT_BUDGET):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts: list[str] = []
+        self.size = 0
+        self.skipping: list[str] = []
+        self.head = False
+        self.title = False
+        self.done = False
+        self.decoder = None
+
+    def feed_bytes(self, chunk: bytes, encoding: str = "utf-8") -> bool:
+        """Procesa una parte del cuerpo, devuelve False al agotar el presupuesto"""
+        if self.decoder is None:
+            try:
+                self.decoder = getincrementaldecoder(encoding)(errors="replace")
+            except LookupError:
+                self.decoder = getincrementaldecoder("utf-8")(errors="replace")
+        if not self.done:
+            self.feed(self.decoder.decode(chunk))
+        return not self.done
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if self.head and tag not in HEAD_TAGS:
+            self.head = False
+        if tag == "head":
+            self.head = True
+        elif tag == "title" and not self.skipping:
+            self.title = True
+        elif tag in SKIPPED_TAGS:
+            self.skipping.append(tag)
+        if tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        if tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            self.head = False
+        elif tag == "title":
+            self.title = False
+        elif tag in self.skipping:
+            while self.skipping.pop() != tag:
+                pass
+        if tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if (self.skipping or self.head) and not self.title:
+            return
+        self._append(SPACES.sub(" ", data.replace("\n", " ")))
+
+    def _append(self, text: str) -> None:
+        if self.done or not text:
+            return
+        remaining = self.max_chars - self.size
+        if len(text) >= remaining:
+            text = text[:remaining]
+            self.done = True
+        self.parts.append(text)
+        self.size += len(text)
+
+    def text(self) -> str:
+        """Texto extraido con los espacios y lineas vacias colapsados"""
+        if self.decoder is not None and not self.done:
+            self.feed(self.decoder.decode(b"", final=True))
+        return LINES.sub("\n", "".join(self.parts)).strip()
+
+
+def extract_text(html: str, max_chars: int = DEFAULT_TEXT_BUDGET) -> str:
+    extractor = TextExtractor(max_chars=max_chars)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
@@ -0,0 +1,47 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    encoding: str
+    body: Optional[bytes] = field(default=None, repr=False)
+    path: Optional[str] = field(default=None)
+    """Archivo de la cache con el cuerpo, se lee al pedir `content`"""
+    digest: str = field(default="")
+    truncated: bool = field(default=False)
+    from_cache: bool = field(default=False)
+
+    def load(self) -> bytes:
+        """Lee el cuerpo del archivo de la cache, solo la primera vez"""
+        if self.body is None:
+            with open(self.path or "", "rb") as file:
+                self.body = file.read()
+        return self.body
+
+    @property
+    def content(self) -> bytes:
+        return self.load()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    file: str
+    size: int
+    digest: str
+    status_code: int
+    headers: dict[str, str]
+    encoding: str
+    expires: float
+    """Hasta cuando es fresca, despues hay que revalidarla"""
+    accessed: float
+    etag: Optional[str] = field(default=None)
+    last_modified: Optional[str] = field(default=None)
@@ -0,0 +1,75 @@
+from functools import partial
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..utils import wrapped_sync
+from .schemas.cache import schema_cache
+from .schemas.types import FunctionSchema
+from .tool_pack import ToolPack
+from .types import Tool
+
+if TYPE_CHECKING:
+    from ..controller.base import Controller
+    from ..window.base import Window
+    from .types import ToolCall
+
+
+class LazyToolPack(ToolPack):
+    """Paquete de herramientas que importa su modulo al ejecutar su primera
+    herramienta.
+
+    Su nombre y sus esquemas salen de la cache de esquemas, si no estan (o el
+    modulo cambio) el paquete se importa y se guarda al crearse.
+    """
+
+    def __init__(
+        self,
+        module: str,
+        class_name: str,
+        controller: "Controller",
+        window: "Window",
+    ):
+        self.module = module
+        self.class_name = class_name
+        self.controller = controller
+        self.window = window
+        self.pack: Optional[ToolPack] = None
+        manifest = schema_cache.pack(module, class_name)
+        if manifest is None:
+            manifest = schema_cache.store_pack(self.load())
+        self.name = manifest["name"]
+        self.concurrent = manifest["concurrent"]
+        self._tools = [
+            Tool(
+                function=FunctionSchema(
+                    name=name,
+                    description=description,
+                    parameters=parameters,
+                    callable=partial(self.call, name),
+                )
+            )
+            for name, description, parameters in manifest["tools"]
+        ]
+        self._tools_by_name = {tool.function.name: tool for tool in self._tools}
+
+    def load(self) -> ToolPack:
+        """Importa y crea el paquete real"""
+        if self.pack is None:
+            pack_class = getattr(import_module(self.module), self.class_name)
+            self.pack = pack_class(controller=self.controller, window=self.window)
+        return self.pack
+
+    async def execute(
+        self, tool_call: "ToolCall", tool: "Tool | None" = None
+    ) -> Dict[str, Any]:
+        return await self.load().execute(tool_call=tool_call)
+
+    async def call(self, tool_name: str, **kwargs: Any) -> Any:
+        tool = self.load()._get_tool(tool_name=tool_name)
+        if not tool:
+            raise ValueError(f"Tool '{tool_name}' not found.")
+        return await wrapped_sync(tool.function.callable, **kwargs)
+
+    async def reset(self) -> None:
+        if self.pack is not None:
+            await self.pack.reset()
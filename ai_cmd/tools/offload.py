@@ -0,0 +1,218 @@
+import multiprocessing
+from asyncio import CancelledError, get_running_loop
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar, copy_context
+from functools import partial, reduce, wraps
+from importlib import import_module
+from inspect import unwrap
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Optional, ParamSpec, Sequence, TypeVar
+
+from .const import DEFAULT_CPU_WARM_UP, DEFAULT_CPU_WORKERS, DEFAULT_IO_WORKERS
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+cancelled: ContextVar[Optional[Event]] = ContextVar("cancelled", default=None)
+"""Se activa cuando se cancela la tarea que espera la operacion en curso"""
+
+
+class OperationCancelled(Exception):
+    """La tarea que esperaba la operacion se cancelo"""
+
+
+def checkpoint() -> None:
+    """Lanza OperationCancelled si la operacion en curso se cancelo.
+
+    Las operaciones largas la llaman entre bloques para no seguir ocupando un
+    hilo cuando ya nadie espera el resultado.
+    """
+    event = cancelled.get()
+    if event is not None and event.is_set():
+        raise OperationCancelled()
+
+
+class IOExecutor:
+    """Hilos para las operaciones de archivos que bloquean.
+
+    Los hilos se crean con la primera operacion, `configure` cambia su numero
+    para las operaciones siguientes.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_IO_WORKERS):
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.lock = Lock()
+
+    def configure(self, max_workers: int) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers debe ser mayor que 0")
+        with self.lock:
+            self.max_workers = max_workers
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            # Las operaciones en curso terminan en los hilos anteriores
+            executor.shutdown(wait=False)
+
+    async def run(
+        self, function: Callable[P, R], *args: P.args, **kwargs: P.kwargs
+    ) -> R:
+        """Ejecuta la funcion en un hilo y espera su resultado.
+
+        Si se cancela la tarea que espera, la funcion deja de ejecutarse en el
+        siguiente `checkpoint`.
+        """
+        event = Event()
+        context = copy_context()
+        context.run(cancelled.set, event)
+        call = partial(context.run, function, *args, **kwargs)
+        try:
+            return await get_running_loop().run_in_executor(self._executor(), call)
+        except CancelledError:
+            event.set()
+            raise
+
+    def shutdown(self) -> None:
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ai_cmd_io"
+                )
+            return self.executor
+
+
+io_executor = IOExecutor()
+
+
+def io_bound(method: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """Convierte una herramienta bloqueante en una corrutina que se ejecuta
+    en `io_executor`"""
+
+    @wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await io_executor.run(method, *args, **kwargs)
+
+    return wrapper
+
+
+def call_method(
+    module: str, qualname: str, args: Sequence[Any], kwargs: dict[str, Any]
+) -> Any:
+    """Ejecuta un metodo `cpu_bound` en un proceso del ejecutor.
+
+    El metodo se busca por su modulo y nombre y se llama con una instancia
+    de su clase sin inicializar, por eso no puede usar el estado del paquete.
+    """
+    path = qualname.split(".")
+    owner = reduce(getattr, path[:-1], import_module(module))
+    function = unwrap(getattr(owner, path[-1]))
+    return function(owner.__new__(owner), *args, **kwargs)
+
+
+def preload(modules: Sequence[str]) -> None:
+    for module in modules:
+        import_module(module)
+
+
+class CPUExecutor:
+    """Procesos para las herramientas que usan la CPU.
+
+    Los argumentos y resultados tienen que poderse serializar con pickle. Los
+    procesos se crean a medida que hacen falta, con `warm_up` se inician
+    todos con `start` y ya importan los modulos de las herramientas.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_CPU_WORKERS,
+        warm_up: bool = DEFAULT_CPU_WARM_UP,
+    ):
+        self.max_workers = max_workers
+        self.warm_up = warm_up
+        self.modules: set[str] = set()
+        """Modulos con herramientas `cpu_bound`, se importan al iniciar"""
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = Lock()
+
+    def configure(
+        self, max_workers: Optional[int] = None, warm_up: Optional[bool] = None
+    ) -> None:
+        if max_workers is not None:
+            if max_workers < 1:
+                raise ValueError("max_workers debe ser mayor que 0")
+            self.max_workers = max_workers
+        if warm_up is not None:
+            self.warm_up = warm_up
+        self.shutdown(wait=False)
+
+    def start(self) -> None:
+        """Crea los procesos si `warm_up` esta activo"""
+        if self.warm_up:
+            self._executor()
+
+    async def run(self, function: Callable[..., R], *args: Any) -> R:
+        """Ejecuta la funcion en un proceso y espera su resultado.
+
+        Si un proceso muere el ejecutor se descarta y se crea otro en la
+        siguiente ejecucion. Cancelar la tarea no detiene una funcion que ya
+        se esta ejecutando.
+        """
+        executor = self._executor()
+        try:
+            return await get_running_loop().run_in_executor(executor, function, *args)
+        except BrokenProcessPool:
+            with self.lock:
+                if self.executor is executor:
+                    self.executor = None
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # Con fork los hilos del proceso padre pueden dejar bloqueos
+                # tomados en el hijo
+                method = (
+                    "forkserver"
+                    if "forkserver" in multiprocessing.get_all_start_methods()
+                    else "spawn"
+                )
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method),
+                )
+                if self.warm_up:
+                    modules = sorted(self.modules)
+                    for _ in range(self.max_workers):
+                        self.executor.submit(preload, modules)
+            return self.executor
+
+
+cpu_executor = CPUExecutor()
+
+
+def cpu_bound(method: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """Convierte una herramienta que usa la CPU en una corrutina que se
+    ejecuta en un proceso de `cpu_executor`"""
+    cpu_executor.modules.add(method.__module__)
+
+    @wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        return await cpu_executor.run(
+            call_method, method.__module__, method.__qualname__, args, kwargs
+        )
+
+    wrapper.cpu_bound = True  # type: ignore
+    return wrapper  # type: ignore
@@ -0,0 +1,185 @@
+import sys
+from hashlib import sha1
+from importlib.util import find_spec
+from json import dump, dumps, load
+from os import makedirs, path, replace
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..const import SCHEMA_CACHE_FILE
+from . import generators, mapper, parsers
+from .generators import FunctionSchemaGenerator
+from .types import FunctionSchema
+
+if TYPE_CHECKING:
+    from ..tool_pack import ToolPack
+
+Key = tuple[str, str, Optional[str], Optional[str]]
+Spec = tuple[str, str, dict[str, Any]]
+
+
+def source_hash(module_name: str) -> Optional[str]:
+    """Hash del codigo fuente de un modulo, None si no tiene archivo.
+
+    Si el modulo no esta importado se busca su archivo sin importarlo.
+    """
+    module = sys.modules.get(module_name)
+    if module:
+        file = getattr(module, "__file__", None)
+    else:
+        try:
+            spec = find_spec(module_name)
+        except (ImportError, ValueError):
+            return None
+        file = spec.origin if spec else None
+    if not file:
+        return None
+    try:
+        with open(file, "rb") as source:
+            return sha1(source.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class SchemaCache:
+    """Cachea los esquemas generados de las herramientas.
+
+    En memoria por funcion (modulo, qualname, nombre y descripcion) y en disco
+    por modulo, invalidado cuando cambia el codigo fuente del modulo o el del
+    generador de esquemas. Las funciones locales no se guardan en disco.
+    """
+
+    def __init__(self, path: Optional[str] = SCHEMA_CACHE_FILE):
+        self.path = path
+        self.schemas: dict[Key, Spec] = {}
+        self.hashes: dict[str, Optional[str]] = {}
+        self.modules: Optional[dict[str, Any]] = None
+        self.version: Optional[str] = None
+        self.dirty = False
+
+    def generate(
+        self,
+        function: Callable[..., Any],
+        custom_name: Optional[str] = None,
+        custom_desc: Optional[str] = None,
+    ) -> FunctionSchema:
+        key: Key = (
+            function.__module__,
+            function.__qualname__,
+            custom_name,
+            custom_desc,
+        )
+        spec = self.schemas.get(key) or self._load(key)
+        if spec is None:
+            schema = FunctionSchemaGenerator.generate(
+                function=function, custom_name=custom_name, custom_desc=custom_desc
+            )
+            spec = (schema.name, schema.description, schema.parameters)
+            self._store(key, spec)
+        self.schemas[key] = spec
+        name, description, parameters = spec
+        return FunctionSchema(
+            name=name, description=description, parameters=parameters, callable=function
+        )
+
+    def pack(self, module_name: str, class_name: str) -> Optional[dict[str, Any]]:
+        """Nombre, concurrencia y esquemas guardados de un paquete de
+        herramientas, None si no estan o su modulo cambio"""
+        module = self._module((module_name, class_name, None, None))
+        return module.get("packs", {}).get(class_name) if module else None
+
+    def store_pack(self, tool_pack: "ToolPack") -> dict[str, Any]:
+        """Guarda el nombre, la concurrencia y los esquemas de un paquete"""
+        cls = type(tool_pack)
+        manifest = {
+            "name": tool_pack.name,
+            "concurrent": tool_pack.concurrent,
+            "tools": [
+                [
+                    tool.function.name,
+                    tool.function.description,
+                    tool.function.parameters,
+                ]
+                for tool in tool_pack._tools
+            ],
+        }
+        module = self._module((cls.__module__, cls.__qualname__, None, None))
+        if module is not None:
+            module.setdefault("packs", {})[cls.__qualname__] = manifest
+            self.dirty = True
+            self.save()
+        return manifest
+
+    def clear(self) -> None:
+        """Descarta lo cargado en memoria"""
+        self.schemas = {}
+        self.hashes = {}
+        self.modules = None
+        self.version = None
+        self.dirty = False
+
+    def save(self) -> None:
+        """Escribe en disco los esquemas nuevos"""
+        if not self.dirty or not self.path or self.modules is None:
+            return
+        self.dirty = False
+        try:
+            makedirs(path.dirname(self.path), exist_ok=True)
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                dump({"version": self._version(), "modules": self.modules}, file)
+            replace(temporary, self.path)
+        except OSError:
+            pass
+
+    def _load(self, key: Key) -> Optional[Spec]:
+        module = self._module(key)
+        if module is None:
+            return None
+        spec = module["schemas"].get(dumps(key[1:]))
+        return (spec[0], spec[1], spec[2]) if spec else None
+
+    def _store(self, key: Key, spec: Spec) -> None:
+        module = self._module(key)
+        if module is None:
+            return
+        module["schemas"][dumps(key[1:])] = list(spec)
+        self.dirty = True
+
+    def _module(self, key: Key) -> Optional[dict[str, Any]]:
+        module_name, qualname = key[0], key[1]
+        if not self.path or "<locals>" in qualname:
+            return None
+        if module_name not in self.hashes:
+            self.hashes[module_name] = source_hash(module_name)
+        digest = self.hashes[module_name]
+        if digest is None:
+            return None
+        modules = self._modules()
+        module = modules.get(module_name)
+        if not module or module.get("hash") != digest:
+            module = modules[module_name] = {"hash": digest, "schemas": {}}
+            self.dirty = True
+        return module
+
+    def _modules(self) -> dict[str, Any]:
+        if self.modules is None:
+            self.modules = {}
+            try:
+                with open(self.path or "", encoding="utf-8") as file:
+                    data = load(file)
+                if data.get("version") == self._version():
+                    self.modules = data.get("modules", {})
+            except (OSError, ValueError, AttributeError):
+                pass
+        return self.modules
+
+    def _version(self) -> str:
+        if self.version is None:
+            self.version = "".join(
+                source_hash(module.__name__) or ""
+                for module in (generators, mapper, parsers)
+            )
+        return self.version
+
+
+schema_cache = SchemaCache()
@@ -2,23 +2,38 @@ from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict
 
 from ..utils import load_safe_json, wrapped_sync
 from ..window.base import Window
-from .schemas.generators import FunctionSchemaGenerator
+from .offload import cpu_executor
+from .schemas.cache import schema_cache
 from .types import Tool, ToolCall
 
 if TYPE_CHECKING:
     from ..controller.base import Controller
 
 
+TOOL_METHOD_NAMES: dict[type, list[str]] = {}
+"""Names of the 'tool_' methods of each tool pack class."""
+
+
 class ToolPack:
     """A pack of tools."""
 
     name: str = "tool"
     custom_descs: dict[str, str] = {}
+    concurrent: bool = True
+    """Whether its tools can run alongside other tool calls."""
 
     def __init__(self, controller: "Controller", window: "Window"):
         self.controller = controller
         self.window = window
         self._tools: list[Tool] = self._collect_tools()
+        self._tools_by_name: dict[str, Tool] = {
+            tool.function.name: tool for tool in self._tools
+        }
+        if any(
+            getattr(method, "cpu_bound", False)
+            for _, method in self._get_tool_methods()
+        ):
+            cpu_executor.start()
 
     async def tools(self) -> list["Tool"]:
         """Get all tools."""
@@ -29,16 +44,19 @@ class ToolPack:
         tool = self._get_tool(tool_name=tool_name)
         return True if tool else False
 
-    async def execute(self, tool_call: "ToolCall") -> Dict[str, Any]:
+    async def execute(
+        self, tool_call: "ToolCall", tool: "Tool | None" = None
+    ) -> Dict[str, Any]:
         """Executes a tool.
 
         Args:
             tool_call (ToolCall): The tool call object.
+            tool (Tool | None): The tool if it was already resolved.
 
         Returns:
             dict[str, Any]: The result of the tool execution.
         """
-        tool = self._get_tool(tool_name=tool_call.function.name)
+        tool = tool or self._get_tool(tool_name=tool_call.function.name)
         if not tool:
             return {"error": f"Tool '{tool_call.function.name}' not found."}
 
@@ -67,18 +85,17 @@ class ToolPack:
             return {"success": True}
 
     def _get_tool(self, tool_name: str) -> "Tool | None":
-        for tool in self._tools:
-            if tool.function.name == tool_name:
-                return tool
-        return None
+        return self._tools_by_name.get(tool_name)
 
     def _get_tool_methods(self) -> list[tuple[str, Any]]:
         """Gets all methods starting with 'tool_'."""
-        return [
-            (key[5:], getattr(self, key))
-            for key in dir(self)
-            if key.startswith("tool_")
-        ]
+        cls = type(self)
+        names = TOOL_METHOD_NAMES.get(cls)
+        if names is None:
+            names = TOOL_METHOD_NAMES[cls] = [
+                key for key in dir(cls) if key.startswith("tool_")
+            ]
+        return [(key[5:], getattr(self, key)) for key in names]
 
     def _transform_arguments(
         self, arguments: str, required: list[str]
@@ -93,8 +110,9 @@ class ToolPack:
         for key, element in self._get_tool_methods():
             if isinstance(element, Callable):
                 name = f"{self.name}_{key}"
-                function_schema = FunctionSchemaGenerator.generate(
+                function_schema = schema_cache.generate(
                     function=element, custom_name=name, custom_desc=self.custom_descs.get(name, None)  # type: ignore
                 )
                 tools.append(Tool(function=function_schema))
+        schema_cache.save()
         return tools
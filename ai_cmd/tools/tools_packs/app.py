@@ -7,6 +7,7 @@ from ..tool_pack import ToolPack
 
 class AppPack(ToolPack):
     name = "app"
+    concurrent = False
 
     async def tool_mod(self, code: str):
         """Ejecuta codigo python dentro de la aplicacion.
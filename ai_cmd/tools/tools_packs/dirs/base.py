@@ -1,29 +1,68 @@
 import os
-from typing import Any
+import re
+from typing import Any, Optional
 
+from ...const import (
+    DEFAULT_LIST_ENTRIES,
+    DEFAULT_SCAN_DEPTH,
+    DEFAULT_SCAN_ENTRIES,
+    DEFAULT_SEARCH_RESULTS,
+)
+from ...offload import io_bound
 from ...tool_pack import ToolPack
+from ..stats import invalidates
+from .ignore import parse_rule
+from .search import grep
+from .trigrams import indexed_grep
 from .utils import scan_dir
+from .walk import walk_files
 
 
 class DirsPack(ToolPack):
     name = "dirs"
+    concurrent = False
 
-    async def tool_list(self, path: str) -> dict[str, Any]:
+    @io_bound
+    def tool_list(
+        self,
+        path: str,
+        details: bool = False,
+        sort: str = "name",
+        max_entries: int = DEFAULT_LIST_ENTRIES,
+        cursor: Optional[str] = None,
+    ) -> dict[str, Any]:
         """lista los archivos y directorios en la ruta especificada.
 
         Args:
             path (str): La ruta del directorio a listar.
+            details (bool): Si se devuelven también el tipo, el tamaño y la fecha de modificación de cada elemento.
+            sort (str): Orden de los elementos: 'name', 'size' (de mayor a menor) o 'mtime' (los más recientes primero).
+            max_entries (int): Cantidad máxima de elementos a devolver.
+            cursor (str): El valor de 'next_cursor' de un listado anterior para continuarlo.
 
         Returns:
-            dict: Un diccionario con una lista de archivos en la clave 'files' o un mensaje de error en la clave 'error'.
+            dict: Un diccionario con los nombres en la clave 'elements' (o, si se pidieron los detalles, un diccionario por elemento con 'path', 'type', 'size' y 'modification_time') y, si hay más elementos, 'next_cursor'; o un mensaje de error en la clave 'error'.
         """
         try:
-            elements = os.listdir(path)
-            return {"path": path, "elements": elements}
-        except OSError as e:
+            result = scan_dir(
+                path,
+                max_depth=1,
+                max_entries=max_entries,
+                sort=sort,
+                hidden=True,
+                details=details,
+                cursor=cursor,
+            )
+        except (OSError, ValueError) as e:
             return {"error": str(e)}
+        if not details:
+            result["elements"] = [entry["path"] for entry in result["elements"]]
+        del result["type"]
+        return result
 
-    async def tool_create(self, path: str) -> dict[str, Any]:
+    @invalidates("path")
+    @io_bound
+    def tool_create(self, path: str) -> dict[str, Any]:
         """Crea un directorio en la ruta especificada.
 
         Args:
@@ -38,7 +77,9 @@ class DirsPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_delete(self, path: str) -> dict[str, str]:
+    @invalidates("path")
+    @io_bound
+    def tool_delete(self, path: str) -> dict[str, str]:
         """Elimina el directorio en la ruta especificada. El directorio debe estar vacío.
 
         Args:
@@ -53,7 +94,9 @@ class DirsPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_rename(self, path: str, new_name: str) -> dict[str, str]:
+    @invalidates("path", "new_name")
+    @io_bound
+    def tool_rename(self, path: str, new_name: str) -> dict[str, str]:
         """Le cambia el nombre a un directorio.
 
         Args:
@@ -69,13 +112,54 @@ class DirsPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_scan(self, path: str) -> dict[str, Any]:
+    @io_bound
+    def tool_scan(
+        self,
+        path: str,
+        max_depth: int = DEFAULT_SCAN_DEPTH,
+        max_entries: int = DEFAULT_SCAN_ENTRIES,
+        sort: str = "name",
+        hidden: bool = False,
+        exclude: Optional[list[str]] = None,
+        details: bool = False,
+        group_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Recorre un directorio y sus subdirectorios hasta una profundidad máxima.
+
+        Cada directorio aparece seguido de su contenido. No sigue los enlaces a directorios.
+
+        Args:
+            path (str): La ruta del directorio a recorrer.
+            max_depth (int): Niveles de subdirectorios a recorrer, 1 lista solo el directorio.
+            max_entries (int): Cantidad máxima de elementos a devolver (o a contar si se agrupa).
+            sort (str): Orden dentro de cada directorio: 'name', 'size' (de mayor a menor) o 'mtime' (los más recientes primero).
+            hidden (bool): Si se incluyen los archivos y directorios ocultos.
+            exclude (list[str]): Patrones al estilo .gitignore de rutas a omitir.
+            details (bool): Si se devuelven también el tamaño y la fecha de modificación de cada elemento.
+            group_by (str): En vez de listar los elementos, devuelve la cantidad y el tamaño total de los archivos por 'extension' o por 'size'.
+            cursor (str): El valor de 'next_cursor' de un recorrido anterior para continuarlo.
+
+        Returns:
+            dict: Un diccionario con los elementos (ruta relativa 'path' y 'type') en la clave 'elements', o los grupos en 'groups', y, si quedan elementos, 'next_cursor'; o un mensaje de error en la clave 'error'.
+        """
         try:
-            return scan_dir(path)
-        except Exception as exc:
-            return {"error": str(exc)}
+            return scan_dir(
+                path,
+                max_depth=max_depth,
+                max_entries=max_entries,
+                sort=sort,
+                hidden=hidden,
+                exclude=exclude,
+                details=details,
+                group_by=group_by,
+                cursor=cursor,
+            )
+        except (OSError, ValueError) as e:
+            return {"error": str(e)}
 
-    async def tool_find(self, path: str, pattern: str) -> dict[str, Any]:
+    @io_bound
+    def tool_find(self, path: str, pattern: str) -> dict[str, Any]:
         """Busca archivos que coincidan con un patrón en la ruta especificada.
 
         Args:
@@ -92,3 +176,135 @@ class DirsPack(ToolPack):
             return {"elements": files}
         except OSError as e:
             return {"error": str(e)}
+
+    async def tool_grep(
+        self,
+        path: str,
+        pattern: str,
+        glob: Optional[str] = None,
+        ignore_case: bool = False,
+        fixed: bool = False,
+        hidden: bool = False,
+        exclude: Optional[list[str]] = None,
+        max_results: int = DEFAULT_SEARCH_RESULTS,
+        cursor: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Busca una expresión regular en el contenido de los archivos de un directorio y sus subdirectorios.
+
+        Respeta los archivos .gitignore y omite los archivos binarios y ocultos.
+
+        Args:
+            path (str): La ruta del directorio donde buscar.
+            pattern (str): La expresión regular a buscar.
+            glob (str): Patrón que deben cumplir los archivos (ej., '*.py' o 'src/**/*.ts').
+            ignore_case (bool): Si no se distinguen mayúsculas de minúsculas.
+            fixed (bool): Si el patrón es un texto literal y no una expresión regular.
+            hidden (bool): Si se buscan también los archivos y directorios ocultos.
+            exclude (list[str]): Patrones al estilo .gitignore de rutas a omitir.
+            max_results (int): Cantidad máxima de coincidencias a devolver.
+            cursor (str): El valor de 'next_cursor' de una búsqueda anterior para continuarla.
+
+        Returns:
+            dict: Un diccionario con las coincidencias (ruta relativa 'path', 'line_number' y 'line') en la clave 'matches', la cantidad de archivos revisados en 'files' y, si hay más coincidencias, 'next_cursor'; o un mensaje de error en la clave 'error'.
+        """
+        try:
+            return await grep(
+                path,
+                pattern,
+                glob=glob,
+                ignore_case=ignore_case,
+                fixed=fixed,
+                hidden=hidden,
+                exclude=exclude,
+                max_results=max_results,
+                cursor=cursor,
+            )
+        except re.error as e:
+            return {"error": f"Invalid regular expression: {e}"}
+        except (OSError, ValueError) as e:
+            return {"error": str(e)}
+
+    async def tool_search(
+        self,
+        path: str,
+        pattern: str,
+        glob: Optional[str] = None,
+        ignore_case: bool = False,
+        fixed: bool = False,
+        max_results: int = DEFAULT_SEARCH_RESULTS,
+        cursor: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Busca una expresión regular en los archivos de un directorio usando un índice que se guarda entre búsquedas.
+
+        Mucho más rápida que dirs_grep al buscar varias veces en el mismo directorio: el índice se actualiza solo con los archivos que cambiaron y descarta los que no pueden coincidir. Respeta los archivos .gitignore y omite los archivos binarios y ocultos.
+
+        Args:
+            path (str): La ruta del directorio donde buscar.
+            pattern (str): La expresión regular a buscar.
+            glob (str): Patrón que deben cumplir los archivos (ej., '*.py' o 'src/**/*.ts').
+            ignore_case (bool): Si no se distinguen mayúsculas de minúsculas.
+            fixed (bool): Si el patrón es un texto literal y no una expresión regular.
+            max_results (int): Cantidad máxima de coincidencias a devolver.
+            cursor (str): El valor de 'next_cursor' de una búsqueda anterior para continuarla.
+
+        Returns:
+            dict: Un diccionario con las coincidencias (ruta relativa 'path', 'line_number' y 'line') en la clave 'matches', los archivos revisados en 'files', los indexados en 'indexed' y, si hay más coincidencias, 'next_cursor'; o un mensaje de error en la clave 'error'.
+        """
+        try:
+            return await indexed_grep(
+                path,
+                pattern,
+                glob=glob,
+                ignore_case=ignore_case,
+                fixed=fixed,
+                max_results=max_results,
+                cursor=cursor,
+            )
+        except re.error as e:
+            return {"error": f"Invalid regular expression: {e}"}
+        except (OSError, ValueError) as e:
+            return {"error": str(e)}
+
+    @io_bound
+    def tool_glob(
+        self,
+        path: str,
+        pattern: str,
+        hidden: bool = False,
+        exclude: Optional[list[str]] = None,
+        max_results: int = DEFAULT_SEARCH_RESULTS,
+        cursor: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Busca archivos cuya ruta cumpla un patrón en un directorio y sus subdirectorios.
+
+        Respeta los archivos .gitignore y omite los archivos ocultos.
+
+        Args:
+            path (str): La ruta del directorio donde buscar.
+            pattern (str): El patrón de los archivos, sin '/' se compara con el nombre (ej., '*.py') y con '/' con la ruta relativa (ej., 'src/**/test_*.py').
+            hidden (bool): Si se incluyen los archivos y directorios ocultos.
+            exclude (list[str]): Patrones al estilo .gitignore de rutas a omitir.
+            max_results (int): Cantidad máxima de archivos a devolver.
+            cursor (str): El valor de 'next_cursor' de una búsqueda anterior para continuarla.
+
+        Returns:
+            dict: Un diccionario con las rutas relativas en la clave 'files' y, si hay más archivos, 'next_cursor'; o un mensaje de error en la clave 'error'.
+        """
+        try:
+            rule = parse_rule(pattern)
+            if rule is None:
+                return {"error": f"Invalid pattern: {pattern}"}
+            files: list[str] = []
+            result: dict[str, Any] = {"path": path, "files": files}
+            for relative, _ in walk_files(
+                path, exclude=exclude, hidden=hidden, start=cursor
+            ):
+                if relative == cursor or not rule.regex.fullmatch(relative):
+                    continue
+                if len(files) >= max_results:
+                    result["next_cursor"] = files[-1]
+                    break
+                files.append(relative)
+            return result
+        except OSError as e:
+            return {"error": str(e)}
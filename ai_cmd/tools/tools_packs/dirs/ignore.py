@@ -0,0 +1,121 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional, Pattern
+
+ALWAYS_IGNORED = {".git", ".hg", ".svn"}
+
+
+@dataclass(kw_only=True)
+class IgnoreRule:
+    """Una linea de un .gitignore"""
+
+    regex: Pattern[str]
+    negated: bool = False
+    dir_only: bool = False
+
+
+def translate(pattern: str) -> str:
+    """Convierte un patron de .gitignore ya sin `/` inicial ni final en una
+    expresion regular sobre rutas relativas con `/`"""
+    result = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            result += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i) and i + 2 == len(pattern):
+            result += ".*"
+            i += 2
+            continue
+        if char == "*":
+            result += "[^/]*"
+        elif char == "?":
+            result += "[^/]"
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            result += re.escape(pattern[i])
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1 : i + 2] in "!^" else i + 1)
+            if end == -1:
+                result += re.escape(char)
+            else:
+                content = pattern[i + 1 : end]
+                if content[:1] in ("!", "^"):
+                    content = "^" + content[1:]
+                result += f"[{content.replace(chr(92), chr(92) * 2)}]"
+                i = end
+        else:
+            result += re.escape(char)
+        i += 1
+    return result
+
+
+def parse_rule(line: str) -> Optional[IgnoreRule]:
+    """Convierte una linea de .gitignore en una regla, None si no tiene"""
+    line = line.rstrip("\n").rstrip("\r")
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated or line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # Un patron con `/` al principio o en medio es relativo al directorio
+    # del .gitignore, si no se aplica a cualquier nivel
+    anchored = "/" in line
+    regex = translate(line.lstrip("/"))
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return IgnoreRule(regex=re.compile(regex), negated=negated, dir_only=dir_only)
+
+
+def parse_rules(lines: Iterable[str]) -> list[IgnoreRule]:
+    return [rule for line in lines if (rule := parse_rule(line)) is not None]
+
+
+class IgnoreRules:
+    """Reglas de exclusion de un arbol de directorios al estilo .gitignore.
+
+    Las reglas de cada .gitignore se aplican a las rutas de su directorio y
+    la ultima regla que coincide decide, una regla con `!` vuelve a incluir.
+    """
+
+    def __init__(self, sets: tuple[tuple[str, str, list[IgnoreRule]], ...] = ()):
+        self.sets = sets
+
+    def child(
+        self, base: str, rules: list[IgnoreRule], prefix: str = ""
+    ) -> "IgnoreRules":
+        """Reglas con las de un .gitignore del directorio `base` añadidas.
+
+        `prefix` es la ruta de la raiz respecto a un .gitignore de un
+        directorio superior, con `/` al final.
+        """
+        if not rules:
+            return self
+        return IgnoreRules(self.sets + ((base, prefix, rules),))
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        """Si se excluye la ruta, relativa a la raiz y separada por `/`"""
+        if path.rsplit("/", 1)[-1] in ALWAYS_IGNORED:
+            return True
+        ignored = False
+        for base, prefix, rules in self.sets:
+            if base:
+                if not path.startswith(base + "/"):
+                    continue
+                relative = prefix + path[len(base) + 1 :]
+            else:
+                relative = prefix + path
+            for rule in rules:
+                if rule.dir_only and not is_dir:
+                    continue
+                if ignored == rule.negated and rule.regex.fullmatch(relative):
+                    ignored = not rule.negated
+        return ignored
@@ -0,0 +1,230 @@
+import mmap
+import os
+import re
+from asyncio import Task, create_task, gather
+from collections import deque
+from typing import Any, Optional, Sequence
+
+from ...const import (
+    BINARY_SNIFF_BYTES,
+    DEFAULT_SEARCH_RESULTS,
+    MAX_MATCH_LINE,
+    MMAP_THRESHOLD,
+    SEARCH_BATCH_FILES,
+)
+from ...offload import cpu_executor, io_executor
+from .ignore import parse_rule
+from .walk import walk_files
+
+Match = tuple[int, str]
+"""Numero de linea y linea de una coincidencia"""
+BatchResult = tuple[list[tuple[str, list[Match]]], int]
+"""Archivos con coincidencias y cantidad de archivos binarios omitidos"""
+
+
+def compile_pattern(
+    pattern: str, ignore_case: bool = False, fixed: bool = False
+) -> tuple[bytes, int]:
+    """Patron en bytes y sus flags, listos para enviar a otro proceso.
+
+    Lanza re.error si la expresion no es valida.
+    """
+    source = re.escape(pattern) if fixed else pattern
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    re.compile(source.encode(), flags)
+    return source.encode(), flags
+
+
+def parse_cursor(cursor: Optional[str]) -> tuple[Optional[str], int]:
+    """Archivo y coincidencias ya devueltas de ese archivo"""
+    if not cursor:
+        return None, 0
+    path, _, skip = cursor.rpartition(":")
+    if not path or not skip.isdigit():
+        raise ValueError(f"Cursor no valido: {cursor}")
+    return path, int(skip)
+
+
+def scan(
+    buffer: "bytes | mmap.mmap", regex: "re.Pattern[bytes]", skip: int, limit: int
+) -> Optional[list[Match]]:
+    """Lineas que coinciden en el contenido de un archivo, None si es binario"""
+    matches: list[Match] = []
+    if buffer.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+        return None
+    size = len(buffer)
+    line, counted, position, found = 1, 0, 0, 0
+    while len(matches) < limit and position <= size:
+        match = regex.search(buffer, position)
+        if match is None:
+            break
+        start = buffer.rfind(b"\n", 0, match.start()) + 1
+        end = buffer.find(b"\n", match.start())
+        end = size if end == -1 else end
+        line += buffer[counted:start].count(b"\n")
+        counted = start
+        position = end + 1
+        found += 1
+        if found > skip:
+            text = buffer[start : min(end, start + MAX_MATCH_LINE)]
+            matches.append((line, text.decode("utf-8", "replace").rstrip("\r")))
+    return matches
+
+
+def search_file(
+    path: str, regex: "re.Pattern[bytes]", skip: int, limit: int
+) -> Optional[list[Match]]:
+    """Lineas que coinciden en un archivo, None si es binario.
+
+    Los archivos pequeños se leen de una vez, mapearlos en memoria cuesta
+    mas que leerlos.
+    """
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(descriptor).st_size
+        if size < MMAP_THRESHOLD:
+            return scan(os.read(descriptor, size), regex, skip, limit)
+        with mmap.mmap(descriptor, 0, access=mmap.ACCESS_READ) as buffer:
+            return scan(buffer, regex, skip, limit)
+    finally:
+        os.close(descriptor)
+
+
+def search_files(
+    root: str, paths: Sequence[str], pattern: bytes, flags: int, skip: int, limit: int
+) -> BatchResult:
+    """Busca en varios archivos hasta `limit` coincidencias en total.
+
+    Se ejecuta en otro proceso, `skip` se aplica solo al primer archivo.
+    """
+    regex = re.compile(pattern, flags)
+    results: list[tuple[str, list[Match]]] = []
+    binary = 0
+    for index, path in enumerate(paths):
+        try:
+            matches = search_file(
+                os.path.join(root, path), regex, skip if index == 0 else 0, limit
+            )
+        except (OSError, ValueError):
+            continue
+        if matches is None:
+            binary += 1
+        elif matches:
+            results.append((path, matches))
+            limit -= len(matches)
+            if limit <= 0:
+                break
+    return results, binary
+
+
+def list_files(
+    root: str,
+    glob: Optional[str] = None,
+    exclude: Optional[Sequence[str]] = None,
+    hidden: bool = False,
+    start: Optional[str] = None,
+) -> list[str]:
+    """Rutas relativas de los archivos a revisar, filtradas por `glob`"""
+    rule = parse_rule(glob) if glob else None
+    return [
+        path
+        for path, _ in walk_files(root, exclude=exclude, hidden=hidden, start=start)
+        if rule is None or rule.regex.fullmatch(path)
+    ]
+
+
+async def grep(
+    root: str,
+    pattern: str,
+    glob: Optional[str] = None,
+    ignore_case: bool = False,
+    fixed: bool = False,
+    hidden: bool = False,
+    exclude: Optional[Sequence[str]] = None,
+    max_results: int = DEFAULT_SEARCH_RESULTS,
+    cursor: Optional[str] = None,
+) -> dict[str, Any]:
+    """Busca una expresion regular en los archivos de un arbol.
+
+    Los archivos se reparten en lotes que se revisan en paralelo en los
+    procesos de `cpu_executor` y se recogen en orden, al llegar a
+    `max_results` se cancela el resto y se devuelve un cursor para seguir.
+    """
+    source, flags = compile_pattern(pattern, ignore_case=ignore_case, fixed=fixed)
+    start, skip = parse_cursor(cursor)
+    paths = await io_executor.run(list_files, root, glob, exclude, hidden, start)
+    return await search_paths(root, paths, source, flags, max_results, start, skip)
+
+
+async def search_paths(
+    root: str,
+    paths: list[str],
+    source: bytes,
+    flags: int,
+    max_results: int = DEFAULT_SEARCH_RESULTS,
+    start: Optional[str] = None,
+    skip: int = 0,
+) -> dict[str, Any]:
+    """Busca el patron en los archivos indicados, en el orden de `paths`.
+
+    `skip` son las coincidencias de `start` ya devueltas por una busqueda
+    anterior, solo se aplica si `start` es el primer archivo.
+    """
+    if start is not None and (not paths or paths[0] != start):
+        skip = 0
+    batches = [
+        paths[index : index + SEARCH_BATCH_FILES]
+        for index in range(0, len(paths), SEARCH_BATCH_FILES)
+    ]
+    # Un solo lote no compensa enviarlo a otro proceso
+    run = cpu_executor.run if len(batches) > 1 else io_executor.run
+    window = max(2, cpu_executor.max_workers * 2)
+    pending: deque[Task[BatchResult]] = deque()
+    matches: list[dict[str, Any]] = []
+    binary = 0
+    next_cursor: Optional[str] = None
+    try:
+        for index in range(len(batches)):
+            while len(pending) < window and index + len(pending) < len(batches):
+                position = index + len(pending)
+                pending.append(
+                    create_task(
+                        run(
+                            search_files,
+                            root,
+                            batches[position],
+                            source,
+                            flags,
+                            skip if position == 0 else 0,
+                            max_results,
+                        )
+                    )
+                )
+            results, skipped = await pending.popleft()
+            binary += skipped
+            for path, file_matches in results:
+                remaining = max_results - len(matches)
+                taken = file_matches[:remaining]
+                matches.extend(
+                    {"path": path, "line_number": number, "line": line}
+                    for number, line in taken
+                )
+                if len(matches) >= max_results:
+                    done = len(taken) + (skip if path == start else 0)
+                    next_cursor = f"{path}:{done}"
+                    break
+            if next_cursor is not None:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await gather(*pending, return_exceptions=True)
+    result: dict[str, Any] = {
+        "path": root,
+        "matches": matches,
+        "files": len(paths),
+        "binary_skipped": binary,
+    }
+    if next_cursor is not None:
+        result["next_cursor"] = next_cursor
+    return result
@@ -0,0 +1,348 @@
+import marshal
+import os
+from array import array
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from typing import Any, Optional, Union
+
+from ...const import (
+    BINARY_SNIFF_BYTES,
+    DEFAULT_SEARCH_RESULTS,
+    MAX_INDEXED_FILE,
+    TRIGRAM_INDEX_DIR,
+    TRIGRAM_INDEX_ENTRIES,
+)
+from ...offload import checkpoint, io_executor
+from .ignore import parse_rule
+from .search import compile_pattern, parse_cursor, search_paths
+from .walk import walk_files, walk_key
+
+try:
+    from re import _constants as sre
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    sre = sre_parse = None  # type: ignore
+
+INDEX_VERSION = 1
+MAX_ALTERNATIVES = 16
+"""Alternativas de una consulta a partir de las cuales se deja de detallar"""
+
+Query = list[list[bytes]]
+"""Alternativas de textos que tiene que contener un archivo para coincidir"""
+
+
+def trigrams(data: bytes) -> set[bytes]:
+    """Secuencias de tres bytes de las palabras de un texto, en minusculas.
+
+    Las que cruzan espacios no se tienen en cuenta: las palabras se repiten
+    mucho en un archivo y basta con recorrer cada una una vez.
+    """
+    result: set[bytes] = set()
+    for word in set(data.lower().split()):
+        result.update(word[i : i + 3] for i in range(len(word) - 2))
+    return result
+
+
+def literals(pattern: bytes, flags: int = 0) -> Query:
+    """Textos que contiene cualquier coincidencia de una expresion regular.
+
+    Una coincidencia contiene todos los textos de alguna de las alternativas,
+    una alternativa vacia significa que no se sabe nada del texto.
+    """
+    if sre_parse is None:
+        return [[]]
+    try:
+        return _sequence(sre_parse.parse(pattern, flags))
+    except Exception:
+        return [[]]
+
+
+def _sequence(items: Any) -> Query:
+    query: Query = [[]]
+    run = bytearray()
+    for operation, value in items:
+        if operation is sre.LITERAL:
+            run.append(value)
+            continue
+        query = _flush(query, run)
+        if operation is sre.SUBPATTERN:
+            query = _and(query, _sequence(value[-1]))
+        elif operation is sre.BRANCH:
+            query = _and(query, _or([_sequence(branch) for branch in value[1]]))
+        elif operation in (sre.MAX_REPEAT, sre.MIN_REPEAT) and value[0] >= 1:
+            query = _and(query, _sequence(value[2]))
+    return _flush(query, run)
+
+
+def _flush(query: Query, run: bytearray) -> Query:
+    if len(run) >= 3:
+        literal = bytes(run).lower()
+        query = [alternative + [literal] for alternative in query]
+    run.clear()
+    return query
+
+
+def _and(left: Query, right: Query) -> Query:
+    combined = [a + b for a in left for b in right]
+    # Descartar condiciones solo amplia los candidatos
+    return combined if len(combined) <= MAX_ALTERNATIVES else left
+
+
+def _or(queries: list[Query]) -> Query:
+    alternatives = [alternative for query in queries for alternative in query]
+    if any(not alternative for alternative in alternatives):
+        return [[]]
+    return alternatives if len(alternatives) <= MAX_ALTERNATIVES else [[]]
+
+
+def index_path(root: str) -> str:
+    name = sha1(os.path.abspath(root).encode()).hexdigest()
+    return os.path.join(TRIGRAM_INDEX_DIR, f"{name}.idx")
+
+
+class TrigramIndex:
+    """Indice en disco de los trigramas de los archivos de un arbol.
+
+    Para cada trigrama (en minusculas) guarda los archivos que lo contienen.
+    Al actualizarse solo se leen los archivos nuevos o cuya fecha de
+    modificacion, tamaño o inodo cambiaron; las entradas anteriores quedan
+    como lapidas hasta que son mas que las vigentes y se compacta. Los
+    archivos binarios no se indexan y los muy grandes se revisan siempre.
+    """
+
+    def __init__(self, root: str, path: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.path = path if path is not None else index_path(self.root)
+        self.files: list[Optional[tuple[str, int, int, int]]] = []
+        """Ruta, fecha de modificacion, tamaño e inodo por id, None si se borro"""
+        self.ids: dict[str, int] = {}
+        self.postings: dict[bytes, Union[bytes, "array[int]"]] = {}
+        """Ids de los archivos con cada trigrama, en bytes hasta que se usan"""
+        self.unindexed: set[int] = set()
+        self.dead = 0
+        self.dirty = False
+        self.loaded = False
+        self.lock = Lock()
+
+    def load(self) -> None:
+        self.loaded = True
+        try:
+            with open(self.path, "rb") as file:
+                data = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != INDEX_VERSION
+            or data.get("root") != self.root
+        ):
+            return
+        self.files = data["files"]
+        self.postings = data["postings"]
+        self.unindexed = set(data["unindexed"])
+        self.ids = {f[0]: i for i, f in enumerate(self.files) if f is not None}
+        self.dead = len(self.files) - len(self.ids)
+
+    def save(self) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "files": self.files,
+            "postings": {
+                trigram: p if isinstance(p, bytes) else p.tobytes()
+                for trigram, p in self.postings.items()
+            },
+            "unindexed": list(self.unindexed),
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            marshal.dump(data, file)
+        os.replace(temporary, self.path)
+        self.dirty = False
+
+    def update(self) -> list[str]:
+        """Aplica los cambios del arbol y devuelve sus archivos en orden"""
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            paths: list[str] = []
+            for relative, entry in walk_files(self.root):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                paths.append(relative)
+                signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+                index = self.ids.get(relative)
+                if index is not None:
+                    if self.files[index][1:] == signature:  # type: ignore
+                        continue
+                    self._remove(relative)
+                self._add(relative, signature)
+            for relative in self.ids.keys() - set(paths):
+                self._remove(relative)
+            if self.dead > len(self.ids):
+                self._compact()
+            if self.dirty:
+                self.save()
+            return paths
+
+    def candidates(self, query: Query) -> Optional[set[str]]:
+        """Archivos que pueden coincidir, None si no se puede descartar ninguno"""
+        if any(not alternative for alternative in query):
+            return None
+        with self.lock:
+            found = set(self.unindexed)
+            for alternative in query:
+                needed = set().union(*(trigrams(literal) for literal in alternative))
+                if not needed:
+                    return None
+                postings = sorted(
+                    (self._posting(trigram) or () for trigram in needed), key=len
+                )
+                matching = set(postings[0])
+                for posting in postings[1:]:
+                    if not matching:
+                        break
+                    matching.intersection_update(posting)
+                found |= matching
+            return {
+                file[0] for index in found if (file := self.files[index]) is not None
+            }
+
+    def query(
+        self,
+        query: Query,
+        glob: Optional[str] = None,
+        start: Optional[str] = None,
+    ) -> tuple[list[str], int]:
+        """Actualiza el indice y devuelve los archivos candidatos en orden y
+        el total de archivos del arbol"""
+        paths = self.update()
+        total = len(paths)
+        candidates = self.candidates(query)
+        rule = parse_rule(glob) if glob else None
+        start_key = walk_key(start) if start else None
+        paths = [
+            path
+            for path in paths
+            if (candidates is None or path in candidates)
+            and (rule is None or rule.regex.fullmatch(path))
+            and (start_key is None or walk_key(path) >= start_key)
+        ]
+        return paths, total
+
+    def _posting(self, trigram: bytes, create: bool = False) -> "Optional[array[int]]":
+        posting = self.postings.get(trigram)
+        if isinstance(posting, bytes):
+            values = array("I")
+            values.frombytes(posting)
+            self.postings[trigram] = posting = values
+        elif posting is None and create:
+            self.postings[trigram] = posting = array("I")
+        return posting
+
+    def _add(self, relative: str, signature: tuple[int, int, int]) -> None:
+        index = len(self.files)
+        self.files.append((relative, *signature))
+        self.ids[relative] = index
+        self.dirty = True
+        if signature[1] > MAX_INDEXED_FILE:
+            self.unindexed.add(index)
+            return
+        try:
+            with open(os.path.join(self.root, relative), "rb") as file:
+                data = file.read()
+        except OSError:
+            self.unindexed.add(index)
+            return
+        if b"\0" in data[:BINARY_SNIFF_BYTES]:
+            return
+        for trigram in trigrams(data):
+            self._posting(trigram, create=True).append(index)  # type: ignore
+
+    def _remove(self, relative: str) -> None:
+        index = self.ids.pop(relative)
+        self.files[index] = None
+        self.unindexed.discard(index)
+        self.dead += 1
+        self.dirty = True
+
+    def _compact(self) -> None:
+        """Renumera los archivos vigentes y quita las lapidas de los trigramas"""
+        mapping = array("i", [-1]) * len(self.files)
+        files: list[Optional[tuple[str, int, int, int]]] = []
+        for index, file in enumerate(self.files):
+            if file is not None:
+                mapping[index] = len(files)
+                files.append(file)
+        postings: dict[bytes, Union[bytes, "array[int]"]] = {}
+        for count, trigram in enumerate(list(self.postings)):
+            if count % 4096 == 0:
+                checkpoint()
+            values = array(
+                "I", (mapping[i] for i in self._posting(trigram) if mapping[i] >= 0)  # type: ignore
+            )
+            if values:
+                postings[trigram] = values
+        self.files = files
+        self.postings = postings
+        self.unindexed = {mapping[i] for i in self.unindexed}
+        self.ids = {file[0]: i for i, file in enumerate(files)}  # type: ignore
+        self.dead = 0
+        self.dirty = True
+
+
+class TrigramIndexes:
+    """Indices de trigramas cargados, por directorio"""
+
+    def __init__(self, max_entries: int = TRIGRAM_INDEX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, TrigramIndex] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, root: str) -> TrigramIndex:
+        key = os.path.realpath(root)
+        with self.lock:
+            index = self.entries.get(key)
+            if index is None:
+                index = self.entries[key] = TrigramIndex(key)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return index
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+trigram_indexes = TrigramIndexes()
+
+
+async def indexed_grep(
+    root: str,
+    pattern: str,
+    glob: Optional[str] = None,
+    ignore_case: bool = False,
+    fixed: bool = False,
+    max_results: int = DEFAULT_SEARCH_RESULTS,
+    cursor: Optional[str] = None,
+) -> dict[str, Any]:
+    """Como `grep`, pero solo revisa los archivos que el indice de trigramas
+    no descarta"""
+    source, flags = compile_pattern(pattern, ignore_case=ignore_case, fixed=fixed)
+    start, skip = parse_cursor(cursor)
+    if not os.path.exists(root):
+        raise FileNotFoundError(f"Does not exist: {root}")
+    if not os.path.isdir(root):
+        raise NotADirectoryError(f"Not a directory: {root}")
+    index = trigram_indexes.get(root)
+    paths, total = await io_executor.run(
+        index.query, literals(source, flags), glob, start
+    )
+    result = await search_paths(root, paths, source, flags, max_results, start, skip)
+    result["indexed"] = total
+    return result
@@ -1,26 +1,187 @@
 import os
-from typing import Any
+from typing import Any, Iterator, Optional, Sequence
 
+from ...const import DEFAULT_SCAN_DEPTH, DEFAULT_SCAN_ENTRIES
+from ...offload import checkpoint
+from .ignore import IgnoreRules, parse_rules
 
-def scan_dir(path: str) -> dict[str, Any]:
-    elements: list[dict[str, Any]] = []
-    for element in os.scandir(path):
-        if element.is_dir():
-            try:
-                elements.append(scan_dir(element.path))
-            except Exception as exc:
-                elements.append(
-                    {"path": element.path, "type": "dir", "error": str(exc)}
+SORTS = ("name", "size", "mtime")
+GROUPS = ("extension", "size")
+SIZE_GROUPS = (
+    (1, "empty"),
+    (1024, "<1KB"),
+    (1024**2, "<1MB"),
+    (100 * 1024**2, "<100MB"),
+    (1024**3, "<1GB"),
+)
+
+
+def entry_type(entry: os.DirEntry[str]) -> str:
+    """Tipo de una entrada segun `d_type`, sin llamar a stat"""
+    if entry.is_symlink():
+        return "symlink"
+    if entry.is_dir(follow_symlinks=False):
+        return "dir"
+    if entry.is_file(follow_symlinks=False):
+        return "file"
+    return "other"
+
+
+def entry_stat(entry: os.DirEntry[str]) -> Optional[os.stat_result]:
+    """stat de la entrada (sin seguir enlaces), que `DirEntry` guarda"""
+    try:
+        return entry.stat(follow_symlinks=False)
+    except OSError:
+        return None
+
+
+def sort_key(sort: str):
+    if sort == "name":
+        return lambda entry: entry.name
+    if sort not in SORTS:
+        raise ValueError(f"Orden no valido: {sort}, debe ser uno de {SORTS}")
+    field = "st_size" if sort == "size" else "st_mtime_ns"
+
+    def key(entry: os.DirEntry[str]) -> tuple[int, str]:
+        stat = entry_stat(entry)
+        return -(getattr(stat, field) if stat else 0), entry.name
+
+    return key
+
+
+def size_group(size: int) -> str:
+    for limit, name in SIZE_GROUPS:
+        if size < limit:
+            return name
+    return ">=1GB"
+
+
+def walk_entries(
+    root: str,
+    max_depth: int = DEFAULT_SCAN_DEPTH,
+    sort: str = "name",
+    hidden: bool = False,
+    exclude: Optional[Sequence[str]] = None,
+    cursor: Optional[str] = None,
+) -> Iterator[tuple[str, os.DirEntry[str]]]:
+    """Recorre un arbol sin recursion, cada directorio seguido de su contenido.
+
+    Devuelve la ruta relativa a `root` (separada por `/`) y la entrada, con
+    los hermanos ordenados por `sort` (tamaño y fecha de mayor a menor). No
+    baja de `max_depth` niveles ni sigue los enlaces a directorios. Con
+    `cursor` empieza despues de esa ruta; ordenando por nombre se saltan los
+    directorios anteriores sin leerlos, con otro orden la ruta tiene que
+    seguir existiendo.
+    """
+    key = sort_key(sort)
+    rules = IgnoreRules().child("", parse_rules(exclude)) if exclude else None
+    start = tuple(cursor.split("/")) if cursor else None
+    found = start is None
+
+    def listing(relative: str) -> Iterator[tuple[str, os.DirEntry[str]]]:
+        checkpoint()
+        directory = os.path.join(root, relative) if relative else root
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(
+                    (
+                        entry
+                        for entry in iterator
+                        if hidden or not entry.name.startswith(".")
+                    ),
+                    key=key,
                 )
+        except OSError:
+            return iter(())
+        return (
+            (f"{relative}/{entry.name}" if relative else entry.name, entry)
+            for entry in entries
+        )
+
+    stack = [listing("")]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+        path, entry = item
+        is_dir = entry.is_dir(follow_symlinks=False)
+        if rules is not None and rules.ignored(path, is_dir):
+            continue
+        if not found:
+            parts = tuple(path.split("/"))
+            if sort == "name" and parts < start[: len(parts)]:  # type: ignore
+                continue
+            if parts == start:
+                found = True
+            elif sort == "name" and parts > start:  # type: ignore
+                found = True
+                yield path, entry
         else:
-            elements.append(
-                {
-                    path: "str",
-                    "type": (
-                        "file"
-                        if element.is_file()
-                        else ("symlink" if element.is_symlink() else "none")
-                    ),
-                }
-            )
-    return {"path": path, "type": "dir", "elements": elements}
+            yield path, entry
+        if is_dir and path.count("/") + 1 < max_depth:
+            stack.append(listing(path))
+
+
+def describe(path: str, entry: os.DirEntry[str], details: bool) -> dict[str, Any]:
+    element: dict[str, Any] = {"path": path, "type": entry_type(entry)}
+    if details and (stat := entry_stat(entry)) is not None:
+        element["size"] = stat.st_size
+        element["modification_time"] = stat.st_mtime
+    return element
+
+
+def scan_dir(
+    path: str,
+    max_depth: int = DEFAULT_SCAN_DEPTH,
+    max_entries: int = DEFAULT_SCAN_ENTRIES,
+    sort: str = "name",
+    hidden: bool = False,
+    exclude: Optional[Sequence[str]] = None,
+    details: bool = False,
+    group_by: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> dict[str, Any]:
+    """Lista plana y acotada de las entradas de un arbol, o los totales de sus
+    archivos agrupados por extension o por tamaño"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Does not exist: {path}")
+    if not os.path.isdir(path):
+        raise NotADirectoryError(f"Not a directory: {path}")
+    if group_by is not None and group_by not in GROUPS:
+        raise ValueError(f"Agrupacion no valida: {group_by}, debe ser una de {GROUPS}")
+    result: dict[str, Any] = {"path": path, "type": "dir"}
+    elements: list[dict[str, Any]] = []
+    groups: dict[str, dict[str, int]] = {}
+    count = 0
+    last: Optional[str] = None
+    for relative, entry in walk_entries(
+        path, max_depth, sort=sort, hidden=hidden, exclude=exclude, cursor=cursor
+    ):
+        if count >= max_entries:
+            result["next_cursor"] = last
+            break
+        count += 1
+        last = relative
+        if group_by is None:
+            elements.append(describe(relative, entry, details))
+            continue
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        stat = entry_stat(entry)
+        size = stat.st_size if stat else 0
+        if group_by == "extension":
+            name = os.path.splitext(entry.name)[1].lower() or "(none)"
+        else:
+            name = size_group(size)
+        group = groups.setdefault(name, {"files": 0, "size": 0})
+        group["files"] += 1
+        group["size"] += size
+    if group_by is None:
+        result["elements"] = elements
+    else:
+        result["scanned"] = count
+        result["groups"] = dict(
+            sorted(groups.items(), key=lambda item: -item[1]["size"])
+        )
+    return result
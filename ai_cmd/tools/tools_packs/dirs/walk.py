@@ -0,0 +1,96 @@
+import os
+from typing import Iterator, Optional, Sequence
+
+from ...offload import checkpoint
+from .ignore import IgnoreRules, parse_rules
+
+
+def read_gitignore(directory: str) -> list[str]:
+    try:
+        with open(
+            os.path.join(directory, ".gitignore"), encoding="utf-8", errors="replace"
+        ) as file:
+            return file.readlines()
+    except OSError:
+        return []
+
+
+def parent_rules(root: str) -> IgnoreRules:
+    """Reglas de los .gitignore de los directorios superiores a `root` dentro
+    de su repositorio, vacias si no esta en uno"""
+    found: list[tuple[str, list[str]]] = []
+    directory = os.path.abspath(root)
+    prefix = ""
+    while not os.path.exists(os.path.join(directory, ".git")):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return IgnoreRules()
+        prefix = f"{os.path.basename(directory)}/{prefix}"
+        directory = parent
+        found.append((prefix, read_gitignore(directory)))
+    rules = IgnoreRules()
+    for prefix, lines in reversed(found):
+        rules = rules.child("", parse_rules(lines), prefix=prefix)
+    return rules
+
+
+Key = tuple[tuple[int, str], ...]
+
+
+def walk_key(path: str, is_dir: bool = False) -> Key:
+    """Clave que ordena las rutas relativas como las recorre `walk_files`"""
+    parts = path.split("/")
+    return tuple((1, part) for part in parts[:-1]) + ((int(is_dir), parts[-1]),)
+
+
+def walk_files(
+    root: str,
+    exclude: Optional[Sequence[str]] = None,
+    hidden: bool = False,
+    gitignore: bool = True,
+    start: Optional[str] = None,
+) -> Iterator[tuple[str, os.DirEntry[str]]]:
+    """Recorre los archivos de un arbol sin recursion.
+
+    Devuelve la ruta relativa a `root` (separada por `/`) y la entrada de cada
+    archivo, siempre en el mismo orden: los archivos de un directorio por
+    nombre y despues sus subdirectorios. Omite lo que excluyen los .gitignore
+    y `exclude` (con la misma sintaxis), los ocultos salvo con `hidden` y no
+    sigue los enlaces a directorios. Con `start` empieza en esa ruta (o en la
+    siguiente si ya no existe) sin entrar en los directorios anteriores.
+    """
+    start_key = walk_key(start) if start else None
+    rules = parent_rules(root) if gitignore else IgnoreRules()
+    rules = rules.child("", parse_rules(exclude or []))
+    stack: list[tuple[str, IgnoreRules]] = [("", rules)]
+    while stack:
+        relative, rules = stack.pop()
+        checkpoint()
+        directory = os.path.join(root, relative) if relative else root
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        if gitignore and any(entry.name == ".gitignore" for entry in entries):
+            rules = rules.child(relative, parse_rules(read_gitignore(directory)))
+        directories: list[str] = []
+        for entry in entries:
+            if not hidden and entry.name.startswith("."):
+                continue
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if start_key is not None:
+                    key = walk_key(path, is_dir)
+                    if key < start_key[: len(key)]:
+                        continue
+                if rules.ignored(path, is_dir):
+                    continue
+                if is_dir:
+                    directories.append(path)
+                elif entry.is_file():
+                    yield path, entry
+            except OSError:
+                continue
+        stack.extend((path, rules) for path in reversed(directories))
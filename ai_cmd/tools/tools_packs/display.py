@@ -6,6 +6,7 @@ from ..tool_pack import ToolPack
 
 class DisplayPack(ToolPack):
     name = "display"
+    concurrent = False
 
     async def tool_capture_screen(
         self, filename: str = "screenshot.png"
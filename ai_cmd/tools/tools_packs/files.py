@@ -6,38 +6,85 @@ import re
 import shutil
 import tarfile
 import zipfile
-from typing import Any, Dict, List, Optional, Union
+from codecs import lookup
+from stat import S_ISDIR, S_ISLNK, S_ISREG
+from typing import IO, Any, Dict, List, Optional, Union
 
+from ..const import DEFAULT_READ_BYTES, IO_CHUNK_SIZE
+from ..offload import checkpoint, cpu_bound, io_bound
 from ..tool_pack import ToolPack
+from .lines import CHECKPOINT_LINES, line_indexes, mapped, utf8_range
+from .stats import invalidates, stat_cache
 
 DEFAULT_ENCODING = "utf-8"
 
 
+def copy_stream(source: IO[bytes], destination: IO[bytes]) -> None:
+    """Como shutil.copyfileobj, pero se puede cancelar entre bloques"""
+    while chunk := source.read(IO_CHUNK_SIZE):
+        destination.write(chunk)
+        checkpoint()
+
+
+def copy_file(source_path: str, destination_path: str) -> None:
+    """Como shutil.copy, pero se puede cancelar entre bloques"""
+    if os.path.isdir(destination_path):
+        destination_path = os.path.join(
+            destination_path, os.path.basename(source_path)
+        )
+    with open(source_path, "rb") as source, open(
+        destination_path, "wb"
+    ) as destination:
+        copy_stream(source, destination)
+    shutil.copymode(source_path, destination_path)
+
+
 class FilesPack(ToolPack):
     name = "files"
+    concurrent = False
 
-    async def tool_read(self, path: str, encoding: Optional[str] = None):
+    @io_bound
+    def tool_read(
+        self,
+        path: str,
+        encoding: Optional[str] = None,
+        offset: int = 0,
+        length: int = DEFAULT_READ_BYTES,
+    ) -> Dict[str, Any]:
         """
-        Lee el contenido de un archivo en la ruta especificada.
+        Lee el contenido de un archivo en la ruta especificada, por partes si es grande.
 
         Args:
             path: La ruta del archivo a leer.
             encoding: La codificación del archivo (por defecto: utf-8).
+            offset: Byte desde el que se empieza a leer (por defecto: 0).
+            length: Cantidad máxima de bytes a leer.
 
         Returns:
-            Un diccionario con el contenido del archivo en la clave 'content'
-            o un mensaje de error en la clave 'error'.
+            Un diccionario con el contenido leído en la clave 'content', el tamaño
+            del archivo en 'size' y, si queda contenido por leer, el byte desde
+            el que continuar en 'next_offset'. O un mensaje de error en la clave 'error'.
         """
         try:
-            with open(
-                path, "r", encoding=encoding if encoding else DEFAULT_ENCODING
-            ) as f:
-                content = f.read()
-            return {"content": content}
+            encoding = encoding if encoding else DEFAULT_ENCODING
+            with mapped(path) as (buffer, stat):
+                start = max(0, offset)
+                end = min(stat.st_size, start + max(0, length))
+                if lookup(encoding).name == "utf-8":
+                    start, end = utf8_range(buffer, start, end)
+                content = buffer[start:end].decode(encoding)
+            result: Dict[str, Any] = {"content": content, "size": stat.st_size}
+            if end < stat.st_size:
+                result["next_offset"] = end
+            return result
         except OSError as e:
             return {"error": str(e)}
+        except LookupError as e:
+            return {"error": f"Invalid encoding specified: {e}"}
 
-    async def tool_write(
+    @invalidates("path")
+    @io_bound
+    def tool_write(
         self, path: str, content: str, encoding: Optional[str] = None
     ) -> Dict[str, str]:
         """
@@ -61,7 +108,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_delete(self, path: str) -> Dict[str, str]:
+    @invalidates("path")
+    @io_bound
+    def tool_delete(self, path: str) -> Dict[str, str]:
         """
         Elimina el archivo en la ruta especificada.
 
@@ -78,7 +127,8 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_count_lines(self, path: str) -> Dict[str, Union[int, str]]:
+    @io_bound
+    def tool_count_lines(self, path: str) -> Dict[str, Union[int, str]]:
         """
         Cuenta el número de líneas en un archivo de texto.
 
@@ -90,13 +140,14 @@ class FilesPack(ToolPack):
             o un mensaje de error en la clave 'error'.
         """
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                line_count = sum(1 for _ in f)
+            with mapped(path) as (buffer, stat):
+                line_count = line_indexes.get(path, stat).count(buffer)
             return {"line_count": line_count}
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_size(
+    @io_bound
+    def tool_size(
         self, path: str, unit: Optional[str] = None
     ) -> Dict[str, Union[int, float, str]]:
         """
@@ -126,7 +177,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_copy(
+    @invalidates("destination_path")
+    @io_bound
+    def tool_copy(
         self, source_path: str, destination_path: str
     ) -> Dict[str, str]:
         """
@@ -141,14 +194,16 @@ class FilesPack(ToolPack):
             o un mensaje de error en la clave 'error'.
         """
         try:
-            shutil.copy(source_path, destination_path)
+            copy_file(source_path, destination_path)
             return {
                 "message": f"File {source_path} copied to {destination_path} successfully"
             }
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_move(
+    @invalidates("source_path", "destination_path")
+    @io_bound
+    def tool_move(
         self, source_path: str, destination_path: str
     ) -> Dict[str, str]:
         """
@@ -170,7 +225,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_create(self, path: str) -> Dict[str, str]:
+    @invalidates("path")
+    @io_bound
+    def tool_create(self, path: str) -> Dict[str, str]:
         """
         Crea un nuevo archivo vacío.
 
@@ -189,7 +246,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_append(
+    @invalidates("path")
+    @io_bound
+    def tool_append(
         self, path: str, content: str, encoding: Optional[str] = "utf-8"
     ) -> Dict[str, str]:
         """
@@ -213,7 +272,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_replace(
+    @invalidates("path")
+    @io_bound
+    def tool_replace(
         self,
         path: str,
         old_string: str,
@@ -245,7 +306,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_replace_regex(
+    @invalidates("path")
+    @cpu_bound
+    def tool_replace_regex(
         self,
         path: str,
         pattern: str,
@@ -277,7 +340,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_insert_line(
+    @invalidates("path")
+    @io_bound
+    def tool_insert_line(
         self,
         path: str,
         line_number: int,
@@ -316,7 +381,8 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_get_line(
+    @io_bound
+    def tool_get_line(
         self, path: str, line_number: int, encoding: Optional[str] = "utf-8"
     ) -> Dict[str, str]:
         """
@@ -331,20 +397,80 @@ class FilesPack(ToolPack):
             Un diccionario con la línea en la clave 'line' o un mensaje de error en la clave 'error'.
         """
         try:
-            with open(path, "r", encoding=encoding) as f:
-                lines = f.readlines()
-            if 1 <= line_number <= len(lines):
-                return {
-                    "line": lines[line_number - 1].rstrip("\n")
-                }  # Eliminar el salto de línea
-            else:
-                return {
-                    "error": f"Line number {line_number} is out of range (1-{len(lines)})"
-                }
+            with mapped(path) as (buffer, stat):
+                index = line_indexes.get(path, stat)
+                start = (
+                    index.locate(buffer, line_number - 1) if line_number >= 1 else None
+                )
+                if start is None:
+                    return {
+                        "error": f"Line number {line_number} is out of range (1-{index.count(buffer)})"
+                    }
+                end = buffer.find(b"\n", start)
+                line = buffer[start : end if end != -1 else stat.st_size]
+            return {
+                "line": line.decode(encoding or DEFAULT_ENCODING).rstrip("\r")
+            }  # Sin el salto de línea
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_search(
+    @io_bound
+    def tool_read_lines(
+        self,
+        path: str,
+        start_line: int,
+        end_line: int,
+        encoding: Optional[str] = "utf-8",
+    ) -> Dict[str, Any]:
+        """
+        Lee un rango de líneas de un archivo sin cargarlo entero.
+
+        Args:
+            path: La ruta del archivo.
+            start_line: La primera línea a leer (la primera línea es 1).
+            end_line: La última línea a leer, incluida.
+            encoding: La codificación del archivo (por defecto: "utf-8").
+
+        Returns:
+            Un diccionario con el texto de las líneas en la clave 'content' y la
+            última línea leída en 'end_line'. Si el rango supera el límite de
+            lectura se corta y 'next_line' indica desde dónde continuar.
+            O un mensaje de error en la clave 'error'.
+        """
+        try:
+            with mapped(path) as (buffer, stat):
+                index = line_indexes.get(path, stat)
+                start = (
+                    index.locate(buffer, start_line - 1) if start_line >= 1 else None
+                )
+                if start is None or end_line < start_line:
+                    return {
+                        "error": f"Line range {start_line}-{end_line} is out of range (1-{index.count(buffer)})"
+                    }
+                end = index.locate(buffer, end_line)
+                if end is None:
+                    end = stat.st_size
+                    end_line = index.count(buffer)
+                result: Dict[str, Any] = {}
+                cut = -1
+                if end - start > DEFAULT_READ_BYTES:
+                    # Se corta en el último salto de línea dentro del límite
+                    cut = buffer.rfind(b"\n", start, start + DEFAULT_READ_BYTES)
+                content = buffer[start : end if cut == -1 else cut + 1].decode(
+                    encoding or DEFAULT_ENCODING
+                )
+            if cut != -1:
+                end_line = start_line + content.count("\n") - 1
+                result["next_line"] = end_line + 1
+            result.update(
+                {"content": content, "start_line": start_line, "end_line": end_line}
+            )
+            return result
+        except OSError as e:
+            return {"error": str(e)}
+
+    @io_bound
+    def tool_search(
         self, path: str, query: str, encoding: Optional[str] = "utf-8"
     ) -> Dict[str, Any]:
         """
@@ -360,11 +486,13 @@ class FilesPack(ToolPack):
             o un mensaje de error en la clave 'error'.
         """
         try:
-            with open(path, "r", encoding=encoding) as f:
-                lines = f.readlines()
             matching_lines: list[dict[str, Any]] = []
-            for i, line in enumerate(lines):
-                if query in line:
+            with open(path, "r", encoding=encoding) as f:
+                for i, line in enumerate(f):
+                    if i % CHECKPOINT_LINES == 0:
+                        checkpoint()
+                    if query not in line:
+                        continue
                     matching_lines.append(
                         {"line_number": i + 1, "line": line.rstrip("\n")}
                     )
@@ -372,7 +500,8 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_diff(
+    @cpu_bound
+    def tool_diff(
         self, path1: str, path2: str
     ) -> Dict[str, Union[List[str], str]]:
         """
@@ -400,7 +529,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_compress(
+    @invalidates()
+    @cpu_bound
+    def tool_compress(
         self, path: str, archive_format: str = "zip"
     ) -> Dict[str, str]:
         """
@@ -441,7 +572,7 @@ class FilesPack(ToolPack):
                 if os.path.isfile(path):
                     with open(path, "rb") as f_in:
                         with gzip.open(path + ".gz", "wb") as f_out:
-                            shutil.copyfileobj(f_in, f_out)
+                            copy_stream(f_in, f_out)
                     return {
                         "message": f"File '{path}' compressed to '{path}.gz' successfully"
                     }
@@ -454,7 +585,9 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_decompress(
+    @invalidates()
+    @io_bound
+    def tool_decompress(
         self, path: str, destination_path: Optional[str] = None
     ) -> Dict[str, str]:
         """
@@ -491,7 +624,7 @@ class FilesPack(ToolPack):
                 )  # Remove .gz
                 with gzip.open(path, "rb") as f_in:
                     with open(output_file, "wb") as f_out:
-                        shutil.copyfileobj(f_in, f_out)
+                        copy_stream(f_in, f_out)
                 return {
                     "message": f"File '{path}' decompressed to '{destination_path}' successfully"
                 }
@@ -502,7 +635,8 @@ class FilesPack(ToolPack):
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_get_metadata(self, path: str) -> Dict[str, Union[str, int, float]]:
+    @io_bound
+    def tool_get_metadata(self, path: str) -> Dict[str, Union[str, int, float]]:
         """
         Obtiene metadatos de un archivo.
 
@@ -514,20 +648,22 @@ class FilesPack(ToolPack):
             o un mensaje de error en la clave 'error'.
         """
         try:
+            lstat, stat = stat_cache.stats(path)
             return {
                 "name": os.path.basename(path),
-                "size": os.path.getsize(path),
-                "creation_time": os.path.getctime(path),
-                "modification_time": os.path.getmtime(path),
-                "access_time": os.path.getatime(path),
-                "is_directory": os.path.isdir(path),
-                "is_file": os.path.isfile(path),
-                "is_link": os.path.islink(path),
+                "size": stat.st_size,
+                "creation_time": stat.st_ctime,
+                "modification_time": stat.st_mtime,
+                "access_time": stat.st_atime,
+                "is_directory": S_ISDIR(stat.st_mode),
+                "is_file": S_ISREG(stat.st_mode),
+                "is_link": S_ISLNK(lstat.st_mode),
             }
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_hash(self, path: str, algorithm: str = "sha256") -> Dict[str, str]:
+    @cpu_bound
+    def tool_hash(self, path: str, algorithm: str = "sha256") -> Dict[str, str]:
         """
         Calcula el hash de un archivo.
 
@@ -545,13 +681,16 @@ class FilesPack(ToolPack):
 
             hasher = hashlib.new(algorithm)
             with open(path, "rb") as file:
-                while chunk := file.read(4096):
+                while chunk := file.read(IO_CHUNK_SIZE):
                     hasher.update(chunk)
+                    checkpoint()
             return {"hash": hasher.hexdigest()}
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_convert_encoding(
+    @invalidates("path")
+    @cpu_bound
+    def tool_convert_encoding(
         self, path: str, from_encoding: str = "auto", to_encoding: str = "utf-8"  # type: ignore
     ) -> Dict[str, str]:
         """
@@ -578,7 +717,6 @@ class FilesPack(ToolPack):
                 from_encoding: str | None = result["encoding"]  # type: ignore
                 if from_encoding is None:
                     return {"error": "Failed to detect the encoding of the file."}
-                print(f"Detected encoding: {from_encoding}")
 
             with open(path, "r", encoding=from_encoding, errors="ignore") as f:  # type: ignore
                 content = f.read()
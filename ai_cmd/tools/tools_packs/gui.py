@@ -7,6 +7,7 @@ from ..tool_pack import ToolPack
 
 class GuiPack(ToolPack):
     name = "gui"
+    concurrent = False
 
     async def tool_capture_screen(
         self, filename: str = "screenshot.png"
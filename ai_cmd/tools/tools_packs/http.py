@@ -1,8 +1,7 @@
 ### en dessarrollo ###
 from typing import Any, Dict, Optional
 
-import requests
-
+from ..http.client import http_client
 from ..tool_pack import ToolPack
 
 
@@ -26,35 +25,31 @@ class HttpPack(ToolPack):
             dict: Un diccionario con el código de estado HTTP en la clave 'status_code' y el contenido de la respuesta en la clave 'content'.
                   Si ocurre un error, devuelve un diccionario con un mensaje de error en la clave 'error'.
         """
+        try:
+            import httpx
+        except ImportError:
+            return {"error": "El módulo httpx no está instalado."}
         try:
             method = method.lower()
-            headers = {"User-Agent": "Mozilla/5.0"}
-
-            if method == "get":
-                response = requests.get(url, headers=headers, timeout=timeout)
-            elif method == "post":
-                response = requests.post(
-                    url, headers=headers, data=data, timeout=timeout
-                )
-            elif method == "put":
-                response = requests.put(
-                    url, headers=headers, data=data, timeout=timeout
-                )
-            elif method == "delete":
-                response = requests.delete(url, headers=headers, timeout=timeout)
-            else:
+            if method not in ("get", "post", "put", "delete"):
                 return {"error": f"Unsupported method: {method}"}
-
-            response.raise_for_status()
-
-            return {
+            response = await http_client.request(
+                method,
+                url,
+                data=data if method in ("post", "put") else None,
+                timeout=timeout,
+            )
+            result: Dict[str, Any] = {
                 "status_code": response.status_code,
                 "content": response.text,
-                "headers": {k: v for (k, v) in response.headers.items()},
+                "headers": response.headers,
             }
+            if response.truncated:
+                result["truncated"] = True
+            return result
 
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            return {"error": str(e) or type(e).__name__}
 
     async def tool_status(self, url: str):
         """Comprueba el estado de un sitio web.
@@ -66,11 +61,13 @@ class HttpPack(ToolPack):
             dict: Un diccionario con el código de estado HTTP en la clave 'status_code' o un mensaje de error en la clave 'error'.
         """
         try:
-            response = requests.get(
-                url, headers={"User-Agent": "Mozilla/5.0"}, timeout=5
-            )
-            response.raise_for_status()
-            status_code = response.status_code
+            import httpx
+        except ImportError:
+            return {"error": "El módulo httpx no está instalado."}
+        try:
+            async with http_client.stream("get", url, timeout=5) as response:
+                response.raise_for_status()
+                status_code = response.status_code
             return {"status_code": status_code}
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            return {"error": str(e) or type(e).__name__}
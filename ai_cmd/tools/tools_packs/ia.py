@@ -20,6 +20,8 @@ class WithDocstring(Protocol):
 class IAPack(ToolPack):
     """Paquete de herramientas para integración con IA"""
 
+    concurrent = False
+
     def __init__(
         self,
         core: "Core",
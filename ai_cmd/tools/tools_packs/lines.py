@@ -0,0 +1,127 @@
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator, Optional, Union
+
+from ..const import LINE_INDEX_ENTRIES, LINE_INDEX_STEP
+from ..offload import checkpoint
+
+Buffer = Union[mmap.mmap, bytes]
+
+CHECKPOINT_LINES = 64 * 1024
+"""Cada cuantas lineas se comprueba si la operacion se cancelo"""
+
+
+@contextmanager
+def mapped(path: str) -> Iterator[tuple[Buffer, os.stat_result]]:
+    """Contenido de un archivo en memoria sin leerlo y su stat.
+
+    Un archivo vacio no se puede mapear, se devuelve b"".
+    """
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        if stat.st_size == 0:
+            yield b"", stat
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer, stat
+
+
+def utf8_range(buffer: Buffer, start: int, end: int) -> tuple[int, int]:
+    """Ajusta un rango de bytes para que no corte un caracter utf-8"""
+    size = len(buffer)
+    while start < min(end, size) and buffer[start] & 0xC0 == 0x80:
+        start += 1
+    while start < end < size and buffer[end] & 0xC0 == 0x80:
+        end -= 1
+    return start, end
+
+
+class LineIndex:
+    """Posicion de inicio de una de cada `step` lineas de un archivo.
+
+    Se completa a medida que se piden lineas mas adelante, asi llegar a una
+    linea ya indexada solo recorre como mucho `step` lineas. Deja de valer si
+    cambia la fecha de modificacion o el tamaño del archivo.
+    """
+
+    def __init__(self, stat: os.stat_result, step: int = LINE_INDEX_STEP):
+        self.mtime = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.step = step
+        self.offsets = array("Q", [0])
+        self.line = 0
+        """Ultima linea recorrida (desde 0), empieza en `offset`"""
+        self.offset = 0
+        self.lines: Optional[int] = None
+        """Total de lineas, se conoce al llegar al final del archivo"""
+        self.lock = Lock()
+
+    def valid(self, stat: os.stat_result) -> bool:
+        return self.mtime == stat.st_mtime_ns and self.size == stat.st_size
+
+    def locate(self, buffer: Buffer, line: int) -> Optional[int]:
+        """Posicion de inicio de la linea (desde 0), None si no existe"""
+        with self.lock:
+            # Hasta la linea siguiente, para saber si `line` existe aunque
+            # empiece justo al final del archivo
+            self._scan(buffer, line + 1)
+            if self.lines is not None and line >= self.lines:
+                return None
+        offset = self.offsets[line // self.step]
+        for _ in range(line % self.step):
+            offset = buffer.find(b"\n", offset) + 1
+        return offset
+
+    def count(self, buffer: Buffer) -> int:
+        with self.lock:
+            while self.lines is None:
+                self._scan(buffer, self.line + CHECKPOINT_LINES)
+            return self.lines
+
+    def _scan(self, buffer: Buffer, target: int) -> None:
+        line, offset = self.line, self.offset
+        while line < target and self.lines is None:
+            end = buffer.find(b"\n", offset)
+            if end == -1:
+                # La ultima linea cuenta si no termina en salto de linea
+                self.lines = line + (1 if offset < self.size else 0)
+                break
+            line += 1
+            offset = end + 1
+            if line % self.step == 0:
+                self.offsets.append(offset)
+            if line % CHECKPOINT_LINES == 0:
+                self.line, self.offset = line, offset
+                checkpoint()
+        self.line, self.offset = line, offset
+
+
+class LineIndexes:
+    """Indices de lineas de los ultimos archivos leidos"""
+
+    def __init__(self, max_entries: int = LINE_INDEX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, LineIndex] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, path: str, stat: os.stat_result) -> LineIndex:
+        key = os.path.realpath(path)
+        with self.lock:
+            index = self.entries.get(key)
+            if index is None or not index.valid(stat):
+                index = self.entries[key] = LineIndex(stat)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return index
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+line_indexes = LineIndexes()
@@ -1,41 +1,166 @@
-from subprocess import PIPE, run
-from typing import Any
+from typing import TYPE_CHECKING, Any, Coroutine
 
+from ..const import DEFAULT_SHELL_TIMEOUT
+from ..events import (
+    ToolPackProcessEndEvent,
+    ToolPackProcessOutputEvent,
+    ToolPackProcessStartEvent,
+)
 from ..tool_pack import ToolPack
+from .process import ProcessResult, run_process
+from .shell import ShellSession
+
+if TYPE_CHECKING:
+    from ...controller.base import Controller
+    from ...window.base import Window
 
 
 class OSPack(ToolPack):
     """Herramientas para manejo del sistema operativo"""
 
     name = "os"
+    concurrent = False
+
+    def __init__(self, controller: "Controller", window: "Window"):
+        super().__init__(controller=controller, window=window)
+        self.sessions: dict[str, ShellSession] = {}
 
-    async def tool_shell(self, command: str) -> Any:
+    async def tool_shell(
+        self, command: str, timeout: float = DEFAULT_SHELL_TIMEOUT
+    ) -> Any:
         """
         Ejecuta un comando en la terminal del sistema operativo, permitiendo la interacción directa con el sistema.
 
         Esta función toma una cadena de texto que representa un comando y la ejecuta directamente en el sistema operativo subyacente.
         Esto permite acceder a funcionalidades del sistema y ejecutar programas externos.
+        Si la salida es muy larga se devuelve solo su principio y su final.
 
         Args:
             command: El comando a ejecutar como una cadena de texto.
+            timeout: Segundos que puede durar el comando antes de terminarlo. Por defecto es 300
 
         Returns:
             Un diccionario que contiene:
                 stdout: La salida estándar del comando resultante de la ejecución.
                 stderr: La salida de error estándar resultante de la ejecución.
                 returncode: El código de retorno del comando.
+                timeout: Verdadero si el comando se terminó por superar el tiempo.
         """
-        output = run(
+        result = await self._run(
             command,
-            shell=True,
-            text=True,
-            stdin=PIPE,
-            stdout=PIPE,
-            stderr=PIPE,
-            check=False,
+            run_process(command, timeout=timeout, on_output=self._on_output(command)),
         )
+        return self._result(result)
+
+    async def tool_session_open(self, cwd: str = "") -> dict[str, Any]:
+        """
+        Abre una terminal que se mantiene entre comandos, conservando el directorio actual, las variables exportadas y los entornos activados.
+
+        Args:
+            cwd: Directorio en el que se abre la terminal, por defecto el actual.
+
+        Returns:
+            Un diccionario con la id de la terminal en la clave 'session'.
+        """
+        session = ShellSession(cwd=cwd or None)
+        try:
+            await session.start()
+        except OSError as e:
+            return {"error": str(e)}
+        self.sessions[session.id] = session
+        return {"session": session.id}
+
+    async def tool_session_run(
+        self, session: str, command: str, timeout: float = DEFAULT_SHELL_TIMEOUT
+    ) -> dict[str, Any]:
+        """
+        Ejecuta un comando en una terminal abierta con os_session_open.
+
+        Args:
+            session: La id de la terminal.
+            command: El comando a ejecutar como una cadena de texto.
+            timeout: Segundos que puede durar el comando antes de terminarlo. Si se supera se cierra la terminal. Por defecto es 300
+
+        Returns:
+            Un diccionario con stdout, stderr y returncode del comando. Si la terminal se cerró incluye 'closed'.
+        """
+        shell = self.sessions.get(session)
+        if shell is None or not shell.alive:
+            self.sessions.pop(session, None)
+            return {"error": f'Terminal "{session}" no encontrada'}
+        try:
+            result = await self._run(
+                command,
+                shell.run(command, timeout=timeout, on_output=self._on_output(command)),
+            )
+        finally:
+            if not shell.alive:
+                self.sessions.pop(session, None)
+        output = self._result(result)
+        if not shell.alive:
+            output["closed"] = True
+        return output
+
+    async def tool_session_close(self, session: str) -> dict[str, Any]:
+        """
+        Cierra una terminal abierta con os_session_open.
+
+        Args:
+            session: La id de la terminal.
+        """
+        shell = self.sessions.pop(session, None)
+        if shell is None:
+            return {"error": f'Terminal "{session}" no encontrada'}
+        await shell.close()
+        return {"success": True}
+
+    async def tool_session_list(self) -> dict[str, Any]:
+        """Muestra las terminales abiertas"""
         return {
-            "stdout": output.stdout,
-            "stderr": output.stderr,
-            "returncode": output.returncode,
+            "sessions": [
+                {"session": id, "cwd": shell.cwd, "commands": shell.commands}
+                for id, shell in self.sessions.items()
+                if shell.alive
+            ]
+        }
+
+    async def reset(self) -> None:
+        sessions, self.sessions = self.sessions, {}
+        for shell in sessions.values():
+            await shell.close()
+
+    def _on_output(self, command: str):
+        async def on_output(stream: str, content: str):
+            event = ToolPackProcessOutputEvent(
+                tool_pack=self, command=command, stream=stream, content=content
+            )
+            await self.controller.trigger(event=event)
+
+        return on_output
+
+    async def _run(
+        self, command: str, execution: Coroutine[Any, Any, ProcessResult]
+    ) -> ProcessResult:
+        """Ejecuta un proceso avisando de su inicio y su final"""
+        event = ToolPackProcessStartEvent(tool_pack=self, command=command)
+        await self.controller.trigger(event=event)
+        returncode = None
+        try:
+            result = await execution
+            returncode = result.returncode
+        finally:
+            event = ToolPackProcessEndEvent(
+                tool_pack=self, command=command, returncode=returncode
+            )
+            await self.controller.trigger(event=event)
+        return result
+
+    def _result(self, result: ProcessResult) -> dict[str, Any]:
+        output: dict[str, Any] = {
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "returncode": result.returncode,
         }
+        if result.timed_out:
+            output["timeout"] = True
+        return output
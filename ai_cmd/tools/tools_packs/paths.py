@@ -1,12 +1,14 @@
-import os
-
+from ..offload import io_bound
 from ..tool_pack import ToolPack
+from .stats import stat_cache
 
 
 class PathsPack(ToolPack):
     name = "paths"
+    concurrent = False
 
-    async def tool_exists(self, path: str):
+    @io_bound
+    def tool_exists(self, path: str):
         """Comprueba si un directorio o archivo existe.
 
         Args:
@@ -16,11 +18,12 @@ class PathsPack(ToolPack):
             dict: Un diccionario con un valor booleano en la clave 'are_identical' (True si son idénticos, False si no) o un mensaje de error en la clave 'error'.
         """
         try:
-            return {"exists": os.path.exists(path)}
+            return {"exists": stat_cache.exists(path)}
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_creation_date(self, path: str):
+    @io_bound
+    def tool_creation_date(self, path: str):
         """Obtiene la fecha de creación de un archivo (timestamp).
 
         Args:
@@ -30,12 +33,13 @@ class PathsPack(ToolPack):
             dict: Un diccionario con la fecha de creación del archivo en formato timestamp en la clave 'creation_time' o un mensaje de error en la clave 'error'.
         """
         try:
-            creation_time = os.path.getctime(path)
+            creation_time = stat_cache.stat(path).st_ctime
             return {"creation_time": creation_time}
         except OSError as e:
             return {"error": str(e)}
 
-    async def tool_modification_date(self, path: str):
+    @io_bound
+    def tool_modification_date(self, path: str):
         """Obtiene la fecha de la última modificación de un archivo (timestamp).
 
         Args:
@@ -45,7 +49,7 @@ class PathsPack(ToolPack):
             dict: Un diccionario con la fecha de modificación del archivo en formato timestamp en la clave 'modification_time' o un mensaje de error en la clave 'error'.
         """
         try:
-            modification_time = os.path.getmtime(path)
+            modification_time = stat_cache.stat(path).st_mtime
             return {"modification_time": modification_time}
         except OSError as e:
             return {"error": str(e)}
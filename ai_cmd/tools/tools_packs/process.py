@@ -0,0 +1,136 @@
+import os
+import signal
+from asyncio import (
+    CancelledError,
+    StreamReader,
+    create_subprocess_shell,
+    gather,
+    shield,
+    wait_for,
+)
+from asyncio.subprocess import DEVNULL, PIPE, Process
+from codecs import getincrementaldecoder
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from ..const import DEFAULT_MAX_OUTPUT, PROCESS_CHUNK_SIZE
+
+OutputCallback = Callable[[str, str], Awaitable[None]]
+"""Recibe el nombre del flujo (stdout o stderr) y el texto leido"""
+
+
+class OutputBuffer:
+    """Salida de un proceso limitada a `max_chars` caracteres.
+
+    Conserva la primera y la ultima mitad de la salida y cuenta los
+    caracteres omitidos en el medio.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_OUTPUT):
+        self.head_chars = max_chars // 2
+        self.tail_chars = max_chars - self.head_chars
+        self.head = ""
+        self.tail = ""
+        self.omitted = 0
+
+    def write(self, text: str) -> None:
+        if len(self.head) < self.head_chars:
+            size = self.head_chars - len(self.head)
+            self.head += text[:size]
+            text = text[size:]
+        if not text:
+            return
+        self.tail += text
+        if len(self.tail) > self.tail_chars:
+            self.omitted += len(self.tail) - self.tail_chars
+            self.tail = self.tail[-self.tail_chars :]
+
+    def getvalue(self) -> str:
+        if not self.omitted:
+            return self.head + self.tail
+        return f"{self.head}\n... [{self.omitted} caracteres omitidos] ...\n{self.tail}"
+
+
+@dataclass
+class ProcessResult:
+    stdout: str
+    stderr: str
+    returncode: Optional[int]
+    timed_out: bool = field(default=False)
+
+
+def kill(process: Process) -> None:
+    """Mata el proceso y los procesos que haya creado"""
+    if process.returncode is not None:
+        return
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def read_stream(
+    stream: StreamReader,
+    name: str,
+    buffer: OutputBuffer,
+    on_output: Optional[OutputCallback],
+) -> None:
+    decoder = getincrementaldecoder("utf-8")(errors="replace")
+    while chunk := await stream.read(PROCESS_CHUNK_SIZE):
+        text = decoder.decode(chunk)
+        if not text:
+            continue
+        buffer.write(text)
+        if on_output is not None:
+            await on_output(name, text)
+    if text := decoder.decode(b"", final=True):
+        buffer.write(text)
+
+
+async def run_process(
+    command: str,
+    timeout: Optional[float] = None,
+    on_output: Optional[OutputCallback] = None,
+    max_chars: int = DEFAULT_MAX_OUTPUT,
+) -> ProcessResult:
+    """Ejecuta un comando de la terminal sin bloquear el bucle de eventos.
+
+    La salida se lee mientras el proceso corre y se pasa a `on_output`. Si
+    pasan `timeout` segundos o se cancela la tarea se mata el proceso junto
+    con sus hijos.
+    """
+    process = await create_subprocess_shell(
+        command,
+        stdin=DEVNULL,
+        stdout=PIPE,
+        stderr=PIPE,
+        start_new_session=os.name == "posix",
+    )
+    stdout = OutputBuffer(max_chars=max_chars)
+    stderr = OutputBuffer(max_chars=max_chars)
+    assert process.stdout is not None and process.stderr is not None
+    execution = gather(
+        read_stream(process.stdout, "stdout", stdout, on_output),
+        read_stream(process.stderr, "stderr", stderr, on_output),
+        process.wait(),
+    )
+    timed_out = False
+    try:
+        await wait_for(execution, timeout=timeout)
+    except TimeoutError:
+        timed_out = True
+        kill(process)
+        await process.wait()
+    except CancelledError:
+        kill(process)
+        await shield(process.wait())
+        raise
+    return ProcessResult(
+        stdout=stdout.getvalue(),
+        stderr=stderr.getvalue(),
+        returncode=process.returncode,
+        timed_out=timed_out,
+    )
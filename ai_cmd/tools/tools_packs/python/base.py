@@ -1,19 +1,131 @@
 from typing import TYPE_CHECKING, Any
 
 from ...tool_pack import ToolPack
+from .const import (
+    DEFAULT_KERNEL_MEMORY,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_PRELOAD,
+    DEFAULT_RUN_TIMEOUT,
+)
+from .executors import PythonProgram
+from .kernel import PythonKernel
+from .pool import PythonPool
 
 if TYPE_CHECKING:
     from ....controller.base import Controller
     from ....window.base import Window
-    from .executors import PythonProgram
 
 
 class PythonPack(ToolPack):
     name = "python"
+    concurrent = False
+    pool_size: int = DEFAULT_POOL_SIZE
+    preload: tuple[str, ...] = DEFAULT_PRELOAD
+    """Modulos que se importan al iniciar los procesos de python_run y los kernels"""
+    kernel_memory: int = DEFAULT_KERNEL_MEMORY
 
     def __init__(self, controller: "Controller", window: "Window"):
         super().__init__(controller=controller, window=window)
         self.programs: dict[str, tuple[str, PythonProgram]] = {}
+        self.pool = PythonPool(size=self.pool_size, preload=self.preload)
+        self.kernels: dict[str, PythonKernel] = {}
+
+    async def tool_run(self, code: str, timeout: float = DEFAULT_RUN_TIMEOUT):
+        """
+        Ejecuta codigo python no interactivo hasta que termina y devuelve su salida.
+        Es mas rapido que python_execute porque usa un interprete ya iniciado. El codigo no puede leer de stdin.
+
+        Args:
+            code: Codigo python a ejecutar
+            timeout: Segundos que puede durar la ejecucion. Por defecto es 60
+
+        Returns:
+            Un diccionario con stdout, stderr y, si el codigo lanzo una excepcion, la traza en 'error'.
+        """
+        try:
+            result = await self.pool.run(code, timeout=timeout)
+        except TimeoutError:
+            return {"error": f"La ejecucion supero los {timeout} segundos"}
+        except (OSError, RuntimeError) as exc:
+            return {"error": str(exc)}
+        return {key: value for key, value in result.items() if value is not None}
+
+    async def tool_kernel_open(self):
+        """
+        Inicia un kernel de python que conserva las variables entre ejecuciones, como una libreta de Jupyter.
+        Util para cargar datos una vez y analizarlos en varios pasos.
+
+        Returns:
+            Un diccionario con la id del kernel en la clave 'kernel'.
+        """
+        kernel = PythonKernel(preload=self.preload, memory=self.kernel_memory)
+        try:
+            await kernel.start()
+        except (OSError, RuntimeError) as exc:
+            return {"error": str(exc)}
+        self.kernels[kernel.id] = kernel
+        return {"kernel": kernel.id}
+
+    async def tool_kernel_run(
+        self, kernel: str, code: str, timeout: float = DEFAULT_RUN_TIMEOUT
+    ):
+        """
+        Ejecuta codigo en un kernel abierto con python_kernel_open usando sus variables.
+
+        Args:
+            kernel: La id del kernel
+            code: Codigo python a ejecutar, si termina en una expresion se devuelve su valor
+            timeout: Segundos que puede durar la ejecucion antes de interrumpirla. Por defecto es 60
+
+        Returns:
+            Un diccionario con stdout, stderr, el repr de la ultima expresion en 'result' y, si el codigo lanzo una excepcion, la traza en 'error'.
+        """
+        python_kernel = self.kernels.get(kernel)
+        if python_kernel is None:
+            return {"error": f'Kernel "{kernel}" no encontrado'}
+        try:
+            result = await python_kernel.execute(code, timeout=timeout)
+        except (OSError, RuntimeError) as exc:
+            return {"error": str(exc)}
+        return {key: value for key, value in result.items() if value is not None}
+
+    async def tool_kernel_reset(self, kernel: str):
+        """
+        Reinicia un kernel borrando todas sus variables y liberando su memoria.
+
+        Args:
+            kernel: La id del kernel
+        """
+        python_kernel = self.kernels.get(kernel)
+        if python_kernel is None:
+            return {"error": f'Kernel "{kernel}" no encontrado'}
+        try:
+            await python_kernel.reset()
+        except (OSError, RuntimeError) as exc:
+            return {"error": str(exc)}
+        return {"success": True}
+
+    async def tool_kernel_close(self, kernel: str):
+        """
+        Cierra un kernel abierto con python_kernel_open.
+
+        Args:
+            kernel: La id del kernel
+        """
+        python_kernel = self.kernels.pop(kernel, None)
+        if python_kernel is None:
+            return {"error": f'Kernel "{kernel}" no encontrado'}
+        await python_kernel.close()
+        return {"success": True}
+
+    async def reset(self) -> None:
+        await self.pool.close()
+        kernels, self.kernels = self.kernels, {}
+        for kernel in kernels.values():
+            await kernel.close()
+        programs, self.programs = self.programs, {}
+        for _, program in programs.values():
+            await program.kill()
 
     async def tool_execute(self, code: str, description: str):
         """
@@ -22,13 +134,9 @@ class PythonPack(ToolPack):
             code: Codigo python a ejecutar
             description: Descripcion breve del codigo
         """
-        try:
-            from .executors import PythonProgram
-        except ImportError:
-            return {"error": "El módulo pexpect no está instalado."}
         try:
             program = PythonProgram(code=code)
-            program.start()
+            await program.start()
             self.programs[program.id] = (description, program)
             return {"id": program.id}
         except Exception as exc:
@@ -48,36 +156,35 @@ class PythonPack(ToolPack):
     async def tool_comunicate(self, id: str, input: str = "", timeout: float = 0):
         """
         Interactua con un codigo python en ejecucion, enviando datos al stdin,
-        espera a que el proceso termine y lee datos del stdout y stderr.
+        espera a que el proceso termine y lee la salida nueva del stdout y stderr desde la ultima lectura.
 
         Args:
             id: La id del codigo en ejecucion
             input: El texto que se enviara al stdin, es opcional.
-            timeout: El tiempo maximo de espera para que el proceso termine, utiliza 0 para indicar tiempo indefinido
+            timeout: El tiempo maximo de espera para que el proceso termine, utiliza 0 para solo leer la salida disponible
         """
-        data = self.programs.pop(id)
+        data = self.programs.get(id)
         if data:
             _, program = data
             try:
-                stdin, stdout = program.comunicate(
+                return await program.comunicate(
                     input=input if input != "" else None,
                     timeout=timeout if timeout != 0 else None,
                 )
             except Exception as exc:
                 return {"error": str(exc)}
-            else:
-                return {"stdin": stdin, "stdout": stdout}
         else:
             return {"error": f'ID "{id}" no encontrada'}
 
     async def tool_kill(self, id: str):
         """Fuerza el cierre de un programa python en ejecucion"""
-        data = self.programs.pop(id)
+        data = self.programs.pop(id, None)
         if data:
             _, program = data
             try:
-                program.kill()
+                await program.kill()
             except Exception as exc:
                 return {"error": str(exc)}
+            return {"return_code": program.return_code}
         else:
             return {"error": f'ID "{id}" no encontrada'}
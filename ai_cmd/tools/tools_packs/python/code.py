@@ -1,3 +1,5 @@
+from asyncio import run
+
 from executors import PythonProgram
 
 code = """
@@ -30,11 +32,16 @@ if __name__ == '__main__':
     game(3)
 """
 
-program = PythonProgram(code)
-program.start()
-while True:
-    data = input(">").strip()
-    stdout, stderr = program.comunicate(None if not data else data)
-    print(f"stdout> {stdout}")
-    print(f"stderr> {stderr}")
-    print(f"return_code> {program.return_code}")
+
+async def main():
+    program = PythonProgram(code)
+    await program.start()
+    while True:
+        data = input(">").strip()
+        result = await program.comunicate(None if not data else data)
+        print(f"stdout> {result['stdout']}")
+        print(f"stderr> {result['stderr']}")
+        print(f"return_code> {result['return_code']}")
+
+
+run(main())
@@ -0,0 +1,20 @@
+from os import path
+
+WORKER_PATH = path.join(path.dirname(__file__), "worker.py")
+DEFAULT_POOL_SIZE = 2
+DEFAULT_PRELOAD = ("collections", "datetime", "itertools", "json", "math", "re")
+"""Modulos que los procesos del pool importan al iniciar"""
+DEFAULT_MAX_RUNS = 50
+"""Ejecuciones tras las que se reemplaza un proceso del pool"""
+DEFAULT_MAX_RSS_GROWTH = 256 * 1024 * 1024
+"""Crecimiento de memoria (bytes) tras el que se reemplaza un proceso del pool"""
+DEFAULT_RUN_TIMEOUT = 60.0
+WORKER_STREAM_LIMIT = 16 * 1024 * 1024
+DEFAULT_KERNEL_MEMORY = 4 * 1024 * 1024 * 1024
+"""Memoria de datos (bytes) de un kernel, al superarla el codigo recibe MemoryError"""
+KERNEL_INTERRUPT_GRACE = 2.0
+"""Segundos que se espera a un kernel interrumpido antes de reiniciarlo"""
+DEFAULT_PROGRAM_BUFFER = 256_000
+"""Caracteres de stdout y de stderr que se guardan de un programa de python_execute"""
+COMUNICATE_SETTLE = 0.1
+"""Segundos que python_comunicate espera la salida si no se indica un tiempo"""
@@ -1,99 +1,194 @@
 import os
+import sys
+from asyncio import (
+    CancelledError,
+    Future,
+    StreamReader,
+    create_subprocess_exec,
+    gather,
+    shield,
+    wait_for,
+)
+from asyncio.subprocess import PIPE, Process
 from atexit import register
-from os import remove
-from typing import Any, Final, Literal, Self
+from codecs import getincrementaldecoder
+from tempfile import mkstemp
+from typing import Any, Final, Literal, Optional
 from uuid import uuid4
 
-import pexpect
+from ...const import PROCESS_CHUNK_SIZE
+from ..process import kill
+from .const import COMUNICATE_SETTLE, DEFAULT_PROGRAM_BUFFER
 
-Status = Literal["init", "pending", "complete", "error"]
+Stream = Literal["stdout", "stderr"]
+
+scripts: set[str] = set()
+"""Archivos temporales de los programas que todavia no se borraron"""
+
+
+@register
+def remove_scripts() -> None:
+    for path in list(scripts):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    scripts.clear()
+
+
+class RingBuffer:
+    """Ultimos `size` caracteres de un flujo.
+
+    Las posiciones son absolutas desde el inicio del flujo, asi un lector
+    puede pedir lo nuevo desde su cursor y saber cuanto se perdio.
+    """
+
+    def __init__(self, size: int = DEFAULT_PROGRAM_BUFFER):
+        self.size = size
+        self.text = ""
+        self.start = 0
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+    def write(self, text: str) -> None:
+        self.text += text
+        overflow = len(self.text) - self.size
+        if overflow > 0:
+            self.text = self.text[overflow:]
+            self.start += overflow
+
+    def read(self, cursor: int) -> tuple[str, int, int]:
+        """Texto desde `cursor`, el nuevo cursor y los caracteres perdidos"""
+        lost = max(0, self.start - cursor)
+        begin = max(cursor, self.start) - self.start
+        return self.text[begin:], self.end, lost
 
 
 class PythonProgram:
+    """Programa de python en un subproceso con el que se puede interactuar.
+
+    La salida estandar y la de error se leen en segundo plano a dos buffers
+    circulares separados de `buffer_size` caracteres; `read` devuelve lo
+    nuevo desde la ultima lectura.
+    """
 
-    def __init__(self, code: str):
+    def __init__(self, code: str, buffer_size: int = DEFAULT_PROGRAM_BUFFER):
         self.id: Final[str] = str(uuid4())
         self.path: Final[str] = self._serialize(code)
-        self.child: pexpect.spawn[str] | None = None
+        self.process: Optional[Process] = None
+        self.buffers: dict[Stream, RingBuffer] = {
+            "stdout": RingBuffer(buffer_size),
+            "stderr": RingBuffer(buffer_size),
+        }
+        self.cursors: dict[Stream, int] = {"stdout": 0, "stderr": 0}
+        self.readers: Optional[Future[Any]] = None
 
     @property
     def return_code(self) -> int | None:
-        return self.child.exitstatus if self.child else None
+        return self.process.returncode if self.process else None
 
-    def comunicate(self, input: str | None = None, timeout: float | None = None):
-        if self.child:
-            try:
-                if input:
-                    self.child.sendline(input)
-
-                if timeout is None:
-                    timeout = 0.1  # Timeout pequeño por defecto para no bloquear indefinidamente
-
-                self.child.expect([pexpect.TIMEOUT, pexpect.EOF], timeout=timeout)
-                stdout = self.child.before.strip() if self.child.before else ""
-                stderr = (
-                    self.child.read_nonblocking(size=10000, timeout=timeout).strip()
-                    if hasattr(self.child, "read_nonblocking")
-                    else ""
-                )
-
-                return {"stdout": stdout, "stderr": stderr}
-            except pexpect.EOF:
-                return {
-                    "stdout": self.child.before.strip() if self.child.before else "",
-                    "stderr": "",
-                }
-            except pexpect.TIMEOUT:
-                return {
-                    "stdout": self.child.before.strip() if self.child.before else "",
-                    "stderr": "",
-                }
-            except Exception as e:
-                return {"error": str(e)}
-        else:
-            raise RuntimeError("Proceso no iniciado")
-
-    def start(self) -> None:
+    async def start(self) -> None:
         try:
-            self.child = pexpect.spawn(f"python {self.path}", encoding="utf-8")
-        except Exception as e:
+            self.process = await create_subprocess_exec(
+                sys.executable,
+                "-u",
+                self.path,
+                stdin=PIPE,
+                stdout=PIPE,
+                stderr=PIPE,
+                start_new_session=os.name == "posix",
+            )
+        except OSError as e:
+            self._clear()
             raise RuntimeError(f"Error al iniciar el proceso: {e}")
+        assert self.process.stdout is not None and self.process.stderr is not None
+        self.readers = gather(
+            self._pump(self.process.stdout, "stdout"),
+            self._pump(self.process.stderr, "stderr"),
+        )
+
+    async def write(self, input: str) -> None:
+        """Envia una linea al stdin del programa"""
+        if self.process is None or self.process.stdin is None:
+            raise RuntimeError("Proceso no iniciado")
+        self.process.stdin.write(f"{input}\n".encode())
+        await self.process.stdin.drain()
+
+    def read(self, stream: Stream) -> tuple[str, int]:
+        """Salida nueva desde la ultima lectura y los caracteres perdidos"""
+        text, self.cursors[stream], lost = self.buffers[stream].read(
+            self.cursors[stream]
+        )
+        return text, lost
+
+    async def wait(self, timeout: Optional[float] = None) -> int | None:
+        """Espera a que el programa termine, devuelve None si pasa `timeout`"""
+        if self.process is None:
+            raise RuntimeError("Proceso no iniciado")
+        try:
+            await wait_for(shield(self._exit()), timeout)
+        except TimeoutError:
+            return None
+        return self.process.returncode
+
+    async def comunicate(
+        self, input: str | None = None, timeout: float | None = None
+    ) -> dict[str, Any]:
+        """Envia `input`, espera hasta `timeout` a que termine y devuelve la
+        salida nueva. Sin `timeout` solo espera un momento a que llegue la
+        salida."""
+        if self.process is None:
+            raise RuntimeError("Proceso no iniciado")
+        if input is not None and self.return_code is None:
+            await self.write(input)
+        await self.wait(timeout if timeout is not None else COMUNICATE_SETTLE)
+        result: dict[str, Any] = {}
+        for stream in self.buffers:
+            text, lost = self.read(stream)  # type: ignore
+            result[stream] = text
+            if lost:
+                result[f"{stream}_lost"] = lost
+        result["return_code"] = self.return_code
+        return result
+
+    async def kill(self) -> None:
+        if self.process is not None:
+            kill(self.process)
+            await self._exit()
+        else:
+            self._clear()
 
-    def wait(self) -> None:
-        if self.child:
-            self.child.wait()
-
-    def kill(self) -> None:
-        if self.child:
+    async def _exit(self) -> None:
+        assert self.process is not None
+        await self.process.wait()
+        if self.readers is not None:
             try:
-                self.child.close(force=True)
-            except Exception as e:
-                print(f"Error al cerrar el proceso: {e}")
-
+                await self.readers
+            except CancelledError:
+                raise
+            except Exception:
+                pass
         self._clear()
 
-    def __enter__(self) -> Self:
-        self.start()
-        return self
-
-    def __exit__(self, *args: Any) -> None:
-        self.kill()
+    async def _pump(self, stream: StreamReader, name: Stream) -> None:
+        decoder = getincrementaldecoder("utf-8")(errors="replace")
+        buffer = self.buffers[name]
+        while chunk := await stream.read(PROCESS_CHUNK_SIZE):
+            buffer.write(decoder.decode(chunk))
+        buffer.write(decoder.decode(b"", final=True))
 
     def _clear(self):
+        scripts.discard(self.path)
         try:
-            remove(self.path)
+            os.remove(self.path)
         except OSError:
             pass
 
     def _serialize(self, code: str) -> str:
-        file_path = os.path.join(os.path.dirname(__file__), f"{self.id}.py")
-        with open(file_path, mode="w", encoding="utf-8") as f:
+        descriptor, file_path = mkstemp(prefix="ai_cmd_", suffix=".py")
+        with open(descriptor, mode="w", encoding="utf-8") as f:
             f.write(code)
-        register(self._clear)
+        scripts.add(file_path)
         return file_path
-
-    def __del__(self):
-        try:
-            self.kill()
-        except:
-            pass
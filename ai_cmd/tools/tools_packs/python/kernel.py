@@ -0,0 +1,90 @@
+import signal
+from asyncio import CancelledError, Lock, Task, create_task, shield, wait_for
+from typing import Any, Optional, Sequence
+from uuid import uuid4
+
+from ...const import DEFAULT_MAX_OUTPUT
+from .const import DEFAULT_KERNEL_MEMORY, DEFAULT_PRELOAD, KERNEL_INTERRUPT_GRACE
+from .pool import PythonWorker
+
+
+class PythonKernel(PythonWorker):
+    """Interprete de python que conserva sus variables entre ejecuciones.
+
+    Devuelve el repr de la ultima expresion y limita la memoria del proceso a
+    `memory` bytes. Una ejecucion que supera el tiempo se interrumpe con
+    SIGINT, conservando las variables; si no responde el kernel se reinicia.
+    """
+
+    def __init__(
+        self,
+        preload: Sequence[str] = DEFAULT_PRELOAD,
+        memory: int = DEFAULT_KERNEL_MEMORY,
+    ):
+        arguments = ["--kernel"]
+        if memory:
+            arguments += ["--memory", str(memory)]
+        super().__init__(preload=preload, arguments=arguments)
+        self.id = uuid4().hex[:8]
+        self.lock = Lock()
+        self.pending: Optional[Task[dict[str, Any]]] = None
+
+    async def execute(
+        self,
+        code: str,
+        timeout: Optional[float] = None,
+        max_chars: int = DEFAULT_MAX_OUTPUT,
+    ) -> dict[str, Any]:
+        async with self.lock:
+            await self._settle()
+            if not self.alive:
+                await self.reset()
+            task = create_task(self.run(code, max_chars=max_chars))
+            self.pending = task
+            try:
+                return await wait_for(shield(task), timeout)
+            except TimeoutError:
+                self.interrupt()
+                try:
+                    response = await wait_for(shield(task), KERNEL_INTERRUPT_GRACE)
+                except TimeoutError:
+                    await self.reset()
+                    return {"error": "El kernel no respondio y se reinicio"}
+                response["timeout"] = True
+                return response
+            except CancelledError:
+                # La respuesta se descarta en la siguiente ejecucion
+                self.interrupt()
+                raise
+
+    def interrupt(self) -> None:
+        if self.alive:
+            assert self.process is not None
+            self.process.send_signal(signal.SIGINT)
+
+    async def reset(self) -> None:
+        """Reinicia el kernel, se pierden las variables"""
+        await self.close()
+        self.runs = 0
+        await self.start()
+
+    async def close(self) -> None:
+        await super().close()
+        await self._settle()
+
+    async def _settle(self) -> None:
+        """Espera la respuesta de una ejecucion interrumpida"""
+        task, self.pending = self.pending, None
+        if task is None:
+            return
+        if not task.done():
+            try:
+                await wait_for(shield(task), KERNEL_INTERRUPT_GRACE)
+            except TimeoutError:
+                await super().close()
+            except Exception:
+                pass
+        try:
+            await task
+        except (CancelledError, Exception):
+            pass
@@ -0,0 +1,221 @@
+import json
+import sys
+from asyncio import (
+    CancelledError,
+    Condition,
+    Task,
+    create_subprocess_exec,
+    create_task,
+    current_task,
+    gather,
+    shield,
+    wait_for,
+)
+from asyncio.subprocess import DEVNULL, PIPE, Process
+from typing import Any, Optional, Sequence
+
+from ...const import DEFAULT_MAX_OUTPUT
+from ..process import kill
+from .const import (
+    DEFAULT_MAX_RSS_GROWTH,
+    DEFAULT_MAX_RUNS,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_PRELOAD,
+    WORKER_PATH,
+    WORKER_STREAM_LIMIT,
+)
+
+
+class PythonWorker:
+    """Interprete de python que ejecuta codigo recibido por un pipe"""
+
+    def __init__(self, preload: Sequence[str], arguments: Sequence[str] = ()):
+        self.preload = preload
+        self.arguments = arguments
+        self.process: Optional[Process] = None
+        self.runs = 0
+        self.rss = 0
+        self.baseline_rss = 0
+        self.failed: dict[str, str] = {}
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        self.process = await create_subprocess_exec(
+            sys.executable,
+            WORKER_PATH,
+            *self.arguments,
+            *self.preload,
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=DEVNULL,
+            limit=WORKER_STREAM_LIMIT,
+            start_new_session=True,
+        )
+        ready = await self._receive()
+        self.baseline_rss = self.rss = ready["rss"]
+        self.failed = ready["failed"]
+
+    async def run(
+        self, code: str, max_chars: int = DEFAULT_MAX_OUTPUT
+    ) -> dict[str, Any]:
+        process = self.process
+        if process is None or process.stdin is None:
+            raise RuntimeError("Proceso no iniciado")
+        self.runs += 1
+        request = {"code": code, "max_chars": max_chars}
+        process.stdin.write(json.dumps(request).encode() + b"\n")
+        await process.stdin.drain()
+        response = await self._receive()
+        self.rss = response.pop("rss")
+        return response
+
+    async def _receive(self) -> dict[str, Any]:
+        assert self.process is not None and self.process.stdout is not None
+        line = await self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("El proceso de python termino inesperadamente")
+        return json.loads(line)
+
+    async def close(self) -> None:
+        process = self.process
+        if process is None:
+            return
+        self.process = None
+        if process.returncode is None:
+            kill(process)
+            await process.wait()
+
+
+class PythonPool:
+    """Procesos de python ya iniciados para ejecutar codigo sin esperar el
+    arranque del interprete.
+
+    Cada proceso importa al iniciar los modulos de `preload` y se reemplaza
+    tras `max_runs` ejecuciones o si su memoria crece mas de `max_rss_growth`
+    bytes. Los procesos se inician con la primera ejecucion y los reemplazos
+    se preparan en segundo plano.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        preload: Sequence[str] = DEFAULT_PRELOAD,
+        max_runs: int = DEFAULT_MAX_RUNS,
+        max_rss_growth: int = DEFAULT_MAX_RSS_GROWTH,
+    ):
+        self.size = size
+        self.preload = tuple(preload)
+        self.max_runs = max_runs
+        self.max_rss_growth = max_rss_growth
+        self.idle: list[PythonWorker] = []
+        self.busy: set[PythonWorker] = set()
+        self.starting: set[Task[None]] = set()
+        self.available: Optional[Condition] = None
+        self.error: Optional[Exception] = None
+        """Error al iniciar un proceso, se lanza en la siguiente ejecucion"""
+
+    @property
+    def workers(self) -> int:
+        return len(self.idle) + len(self.busy) + len(self.starting)
+
+    def start(self) -> None:
+        """Inicia los procesos que falten hasta llegar a `size`"""
+        if self.available is None:
+            self.available = Condition()
+        while self.workers < self.size:
+            self.error = None
+            task = create_task(self._spawn())
+            self.starting.add(task)
+            task.add_done_callback(self.starting.discard)
+
+    async def run(
+        self,
+        code: str,
+        timeout: Optional[float] = None,
+        max_chars: int = DEFAULT_MAX_OUTPUT,
+    ) -> dict[str, Any]:
+        """Ejecuta el codigo en un proceso libre.
+
+        Si se supera `timeout` o se cancela la tarea el proceso se mata y se
+        reemplaza por uno nuevo. Lanza TimeoutError si se supera `timeout`.
+        """
+        worker = await self._acquire()
+        try:
+            result = await wait_for(worker.run(code, max_chars=max_chars), timeout)
+        except BaseException:
+            await shield(worker.close())
+            raise
+        finally:
+            await self._release(worker)
+        return result
+
+    async def close(self) -> None:
+        starting = list(self.starting)
+        for task in starting:
+            task.cancel()
+        await gather(*starting, return_exceptions=True)
+        workers = self.idle + list(self.busy)
+        self.idle, self.busy = [], set()
+        for worker in workers:
+            await worker.close()
+        self.available = None
+
+    async def _spawn(self) -> None:
+        worker = PythonWorker(preload=self.preload)
+        error: Optional[Exception] = None
+        try:
+            await worker.start()
+        except CancelledError:
+            await shield(worker.close())
+            raise
+        except Exception as exc:
+            await worker.close()
+            error = exc
+        if self.available is None:
+            # El pool se cerro mientras el proceso iniciaba
+            await worker.close()
+            return
+        async with self.available:
+            self.starting.discard(current_task())  # type: ignore
+            if error is None:
+                self.idle.append(worker)
+            else:
+                self.error = error
+            self.available.notify_all()
+
+    async def _acquire(self) -> PythonWorker:
+        self.start()
+        assert self.available is not None
+        async with self.available:
+            while not self.idle:
+                if not self.starting:
+                    error, self.error = self.error, None
+                    if error is not None:
+                        raise error
+                    self.start()
+                await self.available.wait()
+            worker = self.idle.pop()
+        self.busy.add(worker)
+        return worker
+
+    async def _release(self, worker: PythonWorker) -> None:
+        self.busy.discard(worker)
+        if self.available is None:
+            await worker.close()
+            return
+        if not worker.alive or self._exhausted(worker):
+            await worker.close()
+            self.start()
+            return
+        async with self.available:
+            self.idle.append(worker)
+            self.available.notify()
+
+    def _exhausted(self, worker: PythonWorker) -> bool:
+        return (
+            worker.runs >= self.max_runs
+            or worker.rss - worker.baseline_rss > self.max_rss_growth
+        )
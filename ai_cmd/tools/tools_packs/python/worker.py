@@ -0,0 +1,199 @@
+"""Proceso de trabajo de PythonPool
+
+Importa los modulos recibidos como argumentos y ejecuta el codigo que llega
+por stdin, una peticion JSON por linea, respondiendo por stdout con la salida
+capturada. Solo usa la libreria estandar para poder ejecutarse sin el paquete.
+
+Con --kernel el espacio de nombres se conserva entre ejecuciones y se
+devuelve el valor de la ultima expresion. Con --memory se limita la memoria
+del proceso en bytes.
+
+Uso: python worker.py [--kernel] [--memory BYTES] [modulo ...]
+"""
+
+import ast
+import builtins
+import io
+import json
+import linecache
+import os
+import signal
+import sys
+import traceback
+from argparse import ArgumentParser
+from importlib import import_module
+from typing import Any, Optional
+
+FILENAME = "<python_run>"
+
+
+class CappedWriter(io.TextIOBase):
+    """Salida limitada a `max_chars`, conserva el principio y el final"""
+
+    def __init__(self, max_chars: int):
+        self.head_chars = max_chars // 2
+        self.tail_chars = max_chars - self.head_chars
+        self.head = ""
+        self.tail = ""
+        self.omitted = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        size = len(text)
+        if len(self.head) < self.head_chars:
+            free = self.head_chars - len(self.head)
+            self.head += text[:free]
+            text = text[free:]
+        if text:
+            self.tail += text
+            if len(self.tail) > self.tail_chars:
+                self.omitted += len(self.tail) - self.tail_chars
+                self.tail = self.tail[-self.tail_chars :]
+        return size
+
+    def getvalue(self) -> str:
+        if not self.omitted:
+            return self.head + self.tail
+        return f"{self.head}\n... [{self.omitted} caracteres omitidos] ...\n{self.tail}"
+
+
+def rss() -> int:
+    """Memoria residente del proceso en bytes"""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+def execute(
+    code: str,
+    max_chars: int,
+    namespace: Optional[dict[str, Any]] = None,
+    interactive: bool = False,
+) -> dict[str, Any]:
+    """Ejecuta el codigo capturando su salida.
+
+    Sin `namespace` se usa uno nuevo y se restaura el directorio actual. Con
+    `interactive`, si la ultima sentencia es una expresion se devuelve su
+    repr en `result` y se guarda en `_`, como en una consola.
+    """
+    stdout = CappedWriter(max_chars)
+    stderr = CappedWriter(max_chars)
+    result: Optional[CappedWriter] = None
+    fresh = namespace is None
+    if namespace is None:
+        namespace = {"__name__": "__main__", "__builtins__": builtins}
+    cwd = os.getcwd()
+    error: Optional[str] = None
+    exit_code: Any = None
+    # Para que las trazas de error muestren las lineas del codigo
+    linecache.cache[FILENAME] = (len(code), None, code.splitlines(True), FILENAME)
+    sys.stdout, sys.stderr, sys.stdin = stdout, stderr, io.StringIO()
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        tree = ast.parse(code, FILENAME)
+        last: Optional[ast.Expression] = None
+        if interactive and tree.body and isinstance(tree.body[-1], ast.Expr):
+            last = ast.Expression(tree.body.pop().value)
+        exec(compile(tree, FILENAME, "exec"), namespace)
+        if last is not None:
+            value = eval(compile(last, FILENAME, "eval"), namespace)
+            if value is not None:
+                namespace["_"] = value
+                result = CappedWriter(max_chars)
+                result.write(repr(value))
+    except SystemExit as exc:
+        exit_code = exc.code
+    except SyntaxError as exc:
+        error = "".join(traceback.format_exception_only(type(exc), exc))
+    except BaseException as exc:
+        # Se omite el marco de esta funcion
+        error = "".join(
+            traceback.format_exception(type(exc), exc, exc.__traceback__.tb_next)
+        )
+    finally:
+        # Una interrupcion fuera de una ejecucion se ignora
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        sys.stdout, sys.stderr, sys.stdin = (
+            sys.__stdout__,
+            sys.__stderr__,
+            sys.__stdin__,
+        )
+        if fresh:
+            os.chdir(cwd)
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "result": result.getvalue() if result is not None else None,
+        "error": error,
+        "exit_code": exit_code if isinstance(exit_code, (int, str)) else None,
+    }
+
+
+def limit_memory(max_bytes: int) -> None:
+    """Limita la memoria de datos del proceso, al superarla se lanza MemoryError"""
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = getattr(resource, "RLIMIT_DATA", resource.RLIMIT_AS)
+    resource.setrlimit(limit, (max_bytes, max_bytes))
+
+
+def send(responses: io.TextIOWrapper, data: dict[str, Any]) -> None:
+    responses.write(json.dumps(data) + "\n")
+    responses.flush()
+
+
+def main() -> None:
+    # Como `python -c`, los imports parten del directorio actual y no del
+    # directorio de este archivo
+    sys.path[0] = ""
+    # El protocolo usa copias de stdin y stdout, los descriptores originales
+    # apuntan a /dev/null para que el codigo ejecutado no pueda corromperlo
+    requests = os.fdopen(os.dup(0), "rb")
+    responses = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    parser = ArgumentParser()
+    parser.add_argument("modules", nargs="*")
+    parser.add_argument("--kernel", action="store_true")
+    parser.add_argument("--memory", type=int, default=0)
+    arguments = parser.parse_args()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    failed: dict[str, str] = {}
+    for name in arguments.modules:
+        try:
+            import_module(name)
+        except Exception as exc:
+            failed[name] = str(exc)
+    if arguments.memory:
+        limit_memory(arguments.memory)
+    namespace: Optional[dict[str, Any]] = None
+    if arguments.kernel:
+        namespace = {"__name__": "__main__", "__builtins__": builtins}
+    send(responses, {"ready": True, "rss": rss(), "failed": failed})
+    for line in requests:
+        request = json.loads(line)
+        response = execute(
+            request["code"],
+            request["max_chars"],
+            namespace=namespace,
+            interactive=arguments.kernel,
+        )
+        response["rss"] = rss()
+        send(responses, response)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import os
+from asyncio import (
+    CancelledError,
+    Lock,
+    StreamReader,
+    create_subprocess_exec,
+    gather,
+    shield,
+    wait,
+    wait_for,
+)
+from asyncio.subprocess import PIPE, Process
+from codecs import getincrementaldecoder
+from shlex import quote
+from shutil import which
+from typing import Optional
+from uuid import uuid4
+
+from ..const import DEFAULT_MAX_OUTPUT, PROCESS_CHUNK_SIZE, SHELL_DRAIN_TIMEOUT
+from .process import OutputBuffer, OutputCallback, ProcessResult, kill
+
+
+class ShellSession:
+    """Terminal que se mantiene abierta entre comandos.
+
+    Los comandos se escriben en el stdin de la terminal seguidos de un
+    marcador unico que se imprime en stdout (con el codigo de retorno) y en
+    stderr al terminar, asi se sabe donde acaba la salida de cada comando.
+    El directorio, las variables y los entornos activados se conservan.
+    """
+
+    def __init__(self, cwd: Optional[str] = None, shell: Optional[str] = None):
+        self.id = uuid4().hex[:8]
+        self.cwd = cwd
+        self.shell = shell or which("bash") or "/bin/sh"
+        self.marker = f"__ai_cmd_{uuid4().hex}__"
+        self.process: Optional[Process] = None
+        self.lock = Lock()
+        self.commands = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        self.process = await create_subprocess_exec(
+            self.shell,
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=PIPE,
+            cwd=self.cwd,
+            start_new_session=os.name == "posix",
+        )
+
+    async def run(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        on_output: Optional[OutputCallback] = None,
+        max_chars: int = DEFAULT_MAX_OUTPUT,
+    ) -> ProcessResult:
+        """Ejecuta un comando en la terminal.
+
+        La terminal se cierra si se supera `timeout`, si se cancela la tarea o
+        si ya habia terminado, ya que no se puede saber en que estado quedo.
+        """
+        async with self.lock:
+            process = self.process
+            if process is None or not self.alive:
+                raise RuntimeError("La terminal esta cerrada")
+            assert process.stdin and process.stdout and process.stderr
+            self.commands += 1
+            process.stdin.write(
+                f"eval {quote(command)} </dev/null\n"
+                f"printf '%s%s\\n' '{self.marker}' \"$?\"\n"
+                f"printf '%s\\n' '{self.marker}' >&2\n".encode()
+            )
+            stdout = OutputBuffer(max_chars=max_chars)
+            stderr = OutputBuffer(max_chars=max_chars)
+            execution = gather(
+                self._read(process.stdout, "stdout", stdout, on_output),
+                self._read(process.stderr, "stderr", stderr, on_output),
+            )
+            timed_out = False
+            try:
+                await process.stdin.drain()
+                status, _ = await wait_for(execution, timeout=timeout)
+            except TimeoutError:
+                timed_out = True
+                await self.close()
+                status = None
+            except (BrokenPipeError, ConnectionResetError):
+                # La terminal termino antes de recibir el comando: se recoge la
+                # salida que dejo y se cierra, el siguiente comando abre otra
+                status = await process.wait()
+                done, _ = await wait({execution}, timeout=SHELL_DRAIN_TIMEOUT)
+                if not done:
+                    execution.cancel()
+                await gather(execution, return_exceptions=True)
+                await self.close()
+            except CancelledError:
+                await shield(self.close())
+                raise
+            if status is None and not timed_out:
+                # La terminal termino, por ejemplo con `exit`
+                status = await process.wait()
+            return ProcessResult(
+                stdout=stdout.getvalue(),
+                stderr=stderr.getvalue(),
+                returncode=status,
+                timed_out=timed_out,
+            )
+
+    async def _read(
+        self,
+        stream: StreamReader,
+        name: str,
+        buffer: OutputBuffer,
+        on_output: Optional[OutputCallback],
+    ) -> Optional[int]:
+        """Lee la salida hasta el marcador, devuelve lo que le sigue en la linea"""
+        marker = self.marker.encode()
+        decoder = getincrementaldecoder("utf-8")(errors="replace")
+        pending = b""
+        while True:
+            chunk = await stream.read(PROCESS_CHUNK_SIZE)
+            pending += chunk
+            index = pending.find(marker)
+            if index != -1:
+                data, rest = pending[:index], pending[index + len(marker) :]
+            elif chunk:
+                # El final puede ser el principio del marcador
+                keep = len(marker) - 1
+                data, pending = pending[:-keep], pending[-keep:]
+            else:
+                data, rest = pending, None
+            text = decoder.decode(data, final=index != -1 or not chunk)
+            if text:
+                buffer.write(text)
+                if on_output is not None:
+                    await on_output(name, text)
+            if index != -1:
+                while not rest.endswith(b"\n"):
+                    if not (chunk := await stream.read(PROCESS_CHUNK_SIZE)):
+                        break
+                    rest += chunk
+                status = rest.strip()
+                return int(status) if status.isdigit() else None
+            if not chunk:
+                return None
+
+    async def close(self) -> None:
+        process = self.process
+        if process is None:
+            return
+        if process.returncode is None:
+            kill(process)
+            await process.wait()
+        self.process = None
@@ -0,0 +1,354 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from collections import OrderedDict
+from functools import wraps
+from inspect import signature
+from stat import S_ISLNK
+from threading import RLock
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
+
+from ..const import STAT_CACHE_ENTRIES, STAT_CACHE_MAX_AGE, STAT_CACHE_TTL
+
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_DONT_FOLLOW = 0x2000000
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+    | IN_DONT_FOLLOW
+)
+CHILDREN_CHANGED = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+SELF_CHANGED = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+EVENT = struct.Struct("iIII")
+
+StatResult = Union[os.stat_result, OSError]
+R = TypeVar("R")
+
+
+class Inotify:
+    """Vigila directorios con inotify, llamando a la libc con ctypes.
+
+    El descriptor no bloquea, los eventos pendientes se leen con `read`.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.poll = select.poll()
+        self.poll.register(self.fd, select.POLLIN)
+
+    def add_watch(self, path: str) -> int:
+        """Vigila un directorio (sin seguir enlaces), lanza OSError si no lo es"""
+        descriptor = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return descriptor
+
+    def rm_watch(self, descriptor: int) -> None:
+        self._rm_watch(self.fd, descriptor)
+
+    def read(self) -> list[tuple[int, int, str]]:
+        """Eventos pendientes: vigilancia, mascara y nombre del hijo afectado"""
+        events: list[tuple[int, int, str]] = []
+        # Comprobar si hay eventos es mas barato que un read que falla
+        while self.poll.poll(0):
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, length = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((descriptor, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Entry:
+    __slots__ = ("lstat", "stat", "time", "lifetime", "directories")
+
+    def __init__(self, lstat: StatResult, time: float):
+        self.lstat = lstat
+        self.stat: Optional[StatResult] = None
+        """Resultado siguiendo enlaces, se calcula al pedirlo"""
+        self.time = time
+        self.lifetime = 0.0
+        self.directories: list[str] = []
+        """Directorios vigilados por esta entrada"""
+
+
+def call_stat(function, path: str) -> StatResult:
+    try:
+        return function(path)
+    except OSError as e:
+        return e
+
+
+def raise_or_return(result: StatResult) -> os.stat_result:
+    if isinstance(result, OSError):
+        # Una copia para no acumular trazas en la excepcion guardada
+        raise OSError(result.errno, result.strerror, result.filename)
+    return result
+
+
+class StatCache:
+    """stat de las rutas consultadas, en un LRU acotado.
+
+    En Linux se vigila con inotify el directorio de cada ruta (y la ruta si
+    es un directorio), y antes de cada consulta se leen los eventos
+    pendientes para invalidar lo que cambio: una consulta repetida cuesta una
+    lectura sin bloqueo en vez de un stat. Sin inotify, o si no se puede
+    vigilar, una entrada vale `ttl` segundos. Las vigiladas valen como mucho
+    `max_age`, por los cambios que inotify no ve: enlaces duros, sistemas de
+    archivos en red, destinos de enlaces simbolicos o directorios superiores
+    renombrados.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = STAT_CACHE_ENTRIES,
+        ttl: float = STAT_CACHE_TTL,
+        max_age: float = STAT_CACHE_MAX_AGE,
+        watch: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_age = max_age
+        self.watch = watch and sys.platform.startswith("linux")
+        self.inotify: Optional[Inotify] = None
+        self.entries: OrderedDict[str, Entry] = OrderedDict()
+        self.watches: dict[str, int] = {}
+        """Vigilancia de cada directorio"""
+        self.watched: dict[int, dict[str, int]] = {}
+        """Directorios de cada vigilancia (un mismo directorio puede tener
+        varias rutas) y cuantas entradas los usan"""
+        self.lock = RLock()
+
+    def lstat(self, path: str) -> os.stat_result:
+        """Como os.lstat"""
+        return raise_or_return(self._get(path, follow=False))
+
+    def stat(self, path: str) -> os.stat_result:
+        """Como os.stat"""
+        return raise_or_return(self._get(path, follow=True))
+
+    def stats(self, path: str) -> tuple[os.stat_result, os.stat_result]:
+        """os.lstat y os.stat de una ruta en una sola consulta"""
+        with self.lock:
+            lstat = self._get(path, follow=False)
+            stat = self._get(path, follow=True)
+        return raise_or_return(lstat), raise_or_return(stat)
+
+    def exists(self, path: str) -> bool:
+        """Como os.path.exists"""
+        try:
+            return not isinstance(self._get(path, follow=True), OSError)
+        except ValueError:
+            return False
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Olvida una ruta, lo que haya debajo y su directorio, o todas"""
+        with self.lock:
+            if path is None:
+                self._clear()
+                return
+            key = os.path.abspath(path)
+            prefix = os.path.join(key, "")
+            for other in [
+                other
+                for other in self.entries
+                if other == key or other.startswith(prefix)
+            ]:
+                self._discard(other)
+            self._discard(os.path.dirname(key))
+
+    def close(self) -> None:
+        with self.lock:
+            self._clear()
+            if self.inotify is not None:
+                self.inotify.close()
+                self.inotify = None
+            self.watch = False
+
+    def _get(self, path: str, follow: bool) -> StatResult:
+        if "\0" in path:
+            raise ValueError("embedded null byte")
+        key = os.path.abspath(path)
+        with self.lock:
+            self._drain()
+            now = monotonic()
+            entry = self.entries.get(key)
+            if entry is not None and now - entry.time > entry.lifetime:
+                self._discard(key)
+                entry = None
+            if entry is None:
+                entry = self._load(key, now)
+            else:
+                self.entries.move_to_end(key)
+            if not follow:
+                return entry.lstat
+            if entry.stat is None:
+                lstat = entry.lstat
+                is_link = not isinstance(lstat, OSError) and S_ISLNK(lstat.st_mode)
+                entry.stat = call_stat(os.stat, key) if is_link else lstat
+            return entry.stat
+
+    def _load(self, key: str, now: float) -> Entry:
+        # Se vigila antes del stat para no perder un cambio entre los dos
+        directories = [
+            directory
+            for directory in (os.path.dirname(key), key)
+            if self._watch(directory)
+        ]
+        entry = Entry(call_stat(os.lstat, key), now)
+        entry.directories = directories
+        lstat = entry.lstat
+        is_link = not isinstance(lstat, OSError) and S_ISLNK(lstat.st_mode)
+        watched = os.path.dirname(key) in directories and not is_link
+        entry.lifetime = self.max_age if watched else self.ttl
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self._discard(next(iter(self.entries)))
+        return entry
+
+    def _watch(self, directory: str) -> bool:
+        if not self.watch:
+            return False
+        if self.inotify is None:
+            try:
+                self.inotify = Inotify()
+            except (OSError, AttributeError):
+                self.watch = False
+                return False
+        descriptor = self.watches.get(directory)
+        if descriptor is None:
+            try:
+                descriptor = self.inotify.add_watch(directory)
+            except OSError:
+                return False
+            self.watches[directory] = descriptor
+        references = self.watched.setdefault(descriptor, {})
+        references[directory] = references.get(directory, 0) + 1
+        return True
+
+    def _unwatch(self, directory: str) -> None:
+        descriptor = self.watches.get(directory)
+        if descriptor is None:
+            return
+        references = self.watched[descriptor]
+        references[directory] -= 1
+        if references[directory] > 0:
+            return
+        del references[directory]
+        del self.watches[directory]
+        if not references:
+            del self.watched[descriptor]
+            self.inotify.rm_watch(descriptor)  # type: ignore
+
+    def _discard(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            for directory in entry.directories:
+                self._unwatch(directory)
+
+    def _clear(self) -> None:
+        for key in list(self.entries):
+            self._discard(key)
+
+    def _drain(self) -> None:
+        if self.inotify is None:
+            return
+        for descriptor, mask, name in self.inotify.read():
+            if mask & IN_Q_OVERFLOW:
+                self._clear()
+                continue
+            for directory in list(self.watched.get(descriptor, ())):
+                if name:
+                    self._discard(os.path.join(directory, name))
+                if not name or mask & CHILDREN_CHANGED:
+                    self._discard(directory)
+                if mask & SELF_CHANGED:
+                    prefix = directory.rstrip("/") + "/"
+                    for key in [k for k in self.entries if k.startswith(prefix)]:
+                        self._discard(key)
+                if mask & IN_IGNORED and directory in self.watches:
+                    # El kernel quito la vigilancia, el directorio ya no existe
+                    del self.watches[directory]
+            if mask & IN_IGNORED:
+                self.watched.pop(descriptor, None)
+
+
+stat_cache = StatCache()
+
+
+def invalidates(
+    *arguments: str,
+) -> Callable[[Callable[..., Awaitable[R]]], Callable[..., Awaitable[R]]]:
+    """Invalida en `stat_cache` las rutas de esos argumentos cuando termina
+    la herramienta, o toda la cache si no se indica ninguno.
+
+    Va por encima de `io_bound` o `cpu_bound` para invalidar en este proceso
+    y no en el que ejecuto la herramienta.
+    """
+
+    def decorator(
+        method: Callable[..., Awaitable[R]],
+    ) -> Callable[..., Awaitable[R]]:
+        parameters = signature(method)
+
+        @wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> R:
+            try:
+                bound = parameters.bind(*args, **kwargs).arguments
+            except TypeError:
+                # La llamada fallara igual, sin haber cambiado nada
+                bound = {}
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                if not arguments:
+                    stat_cache.invalidate()
+                for argument in arguments:
+                    path = bound.get(argument)
+                    if isinstance(path, str) and path:
+                        stat_cache.invalidate(path)
+
+        return wrapper
+
+    return decorator
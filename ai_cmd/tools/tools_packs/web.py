@@ -1,11 +1,25 @@
 ### en dessarrollo ###
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from ..http.cache import ParsedCache, parsed_cache
+from ..http.client import http_client
+from ..http.const import DEFAULT_READ_LIMIT, DEFAULT_TEXT_BUDGET, TEXT_CHUNK_SIZE
+from ..http.text import TextExtractor
 from ..tool_pack import ToolPack
 
+if TYPE_CHECKING:
+    from ...controller.base import Controller
+    from ...window.base import Window
+
 
 class WebPack(ToolPack):
     name = "web"
+    max_chars: int = DEFAULT_TEXT_BUDGET
+    """Caracteres de texto que se extraen como maximo de una pagina"""
+
+    def __init__(self, controller: "Controller", window: "Window"):
+        super().__init__(controller=controller, window=window)
+        self.pages = ParsedCache()
 
     async def tool_search(self, query: str, num_results: int = 5):
         """Hace una busqueda en goolge
@@ -48,9 +62,9 @@ class WebPack(ToolPack):
             dict: Un diccionario con una lista de enlaces en la clave 'links' o un mensaje de error en la clave 'error'.
         """
         try:
-            import requests
+            import httpx
         except ImportError:
-            return {"error": "El módulo requests no está instalado."}
+            return {"error": "El módulo httpx no está instalado."}
         try:
             from bs4 import BeautifulSoup
         except ImportError:
@@ -58,41 +72,80 @@ class WebPack(ToolPack):
                 "error": "El módulo bs4 no está instalado. Por favor instalalo con 'pip install bs4'"
             }
         try:
-            response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            links: list[Any] = [
-                ancor.attrs.get("href", "") for ancor in soup.find_all("a", href=True)  # type: ignore
-            ]
+            response = await http_client.request("get", url)
+            links: list[Any] = parsed_cache.get(response.digest, "links")
+            if links is None:
+                soup = BeautifulSoup(response.text, "html.parser")
+                links = [
+                    ancor.attrs.get("href", "") for ancor in soup.find_all("a", href=True)  # type: ignore
+                ]
+                parsed_cache.put(response.digest, "links", links)
             return {"links": links}
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            return {"error": str(e) or type(e).__name__}
 
-    async def tool_read(self, url: str):
+    async def tool_read(
+        self, url: str, offset: int = 0, limit: int = DEFAULT_READ_LIMIT
+    ):
         """
-        Lee el contenido de una página web y devuelve el texto.
+        Lee el contenido de una página web y devuelve el texto por partes.
 
         Args:
             url (str): La URL de la página web.
+            offset (int): Caracter desde el que se devuelve el texto. Por defecto es 0
+            limit (int): Máximo de caracteres a devolver. Por defecto es 20000
 
         Returns:
-            dict: Un diccionario con el contenido de la página en la clave 'content' o un mensaje de error en la clave 'error'.
+            dict: Un diccionario con el texto en la clave 'content' y, si queda más texto, la posición siguiente en 'next_offset', o un mensaje de error en la clave 'error'.
         """
         try:
-            import requests
-        except ImportError:
-            return {"error": "El módulo requests no está instalado."}
-        try:
-            from bs4 import BeautifulSoup
+            import httpx
         except ImportError:
-            return {"error": "El módulo beautifulsoup4 no está instalado."}
+            return {"error": "El módulo httpx no está instalado."}
         try:
-            response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            text = soup.get_text()
-            return {"content": text}
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+            page = self.pages.get(url, "text") if offset > 0 else None
+            if page is None:
+                page = await self._read_page(url)
+                self.pages.put(url, "text", page)
+            text, complete = page
+            if offset >= len(text) and not complete:
+                return {
+                    "error": f"La página supera el límite de {self.max_chars} caracteres."
+                }
+            result: dict[str, Any] = {
+                "content": text[offset : offset + limit],
+                "offset": offset,
+                "length": len(text),
+            }
+            if offset + limit < len(text):
+                result["next_offset"] = offset + limit
+            if not complete:
+                result["truncated"] = True
+            return result
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            return {"error": str(e) or type(e).__name__}
         except Exception as e:
             return {"error": str(e)}
+
+    async def reset(self) -> None:
+        self.pages = ParsedCache()
+
+    async def _read_page(self, url: str) -> tuple[str, bool]:
+        """Descarga la página extrayendo el texto mientras llega, hasta `max_chars`"""
+        extractor = TextExtractor(max_chars=self.max_chars)
+        response = await http_client.request(
+            "get", url, on_chunk=extractor.feed_bytes
+        )
+        if response.from_cache:
+            page = parsed_cache.get(response.digest, "text")
+            if page is not None:
+                return page
+            content = response.content
+            for start in range(0, len(content), TEXT_CHUNK_SIZE):
+                chunk = content[start : start + TEXT_CHUNK_SIZE]
+                if not extractor.feed_bytes(chunk, response.encoding):
+                    break
+        page = (extractor.text(), not extractor.done and not response.truncated)
+        if page[1]:
+            parsed_cache.put(response.digest, "text", page)
+        return page
@@ -0,0 +1,82 @@
+"""Mide los eventos por segundo que despacha Controller.trigger
+
+Uso: python -m benchmarks.controller
+"""
+
+from asyncio import gather, run
+from time import perf_counter
+from typing import Any
+
+from ai_cmd.ai.types import ContentToken
+from ai_cmd.controller.base import Controller
+from ai_cmd.core.events import (
+    CoreEvent,
+    CoreGenerationEndEvent,
+    CoreGenerationErrorEvent,
+    CoreGenerationRecvContentTokenEvent,
+    CoreGenerationStartEvent,
+)
+from ai_cmd.core.history.events import HistoryMessageAddEvent, HistoryResetEvent
+from ai_cmd.core.history.types import AssistantMessage
+from ai_cmd.tools.events import ToolsExecuteEndEvent, ToolsExecuteStartEvent
+from ai_cmd.utils import wrapped_sync
+
+EVENTS = 20_000
+
+
+class LegacyController(Controller):
+    """Controller con el despacho anterior, recorre todo el registro"""
+
+    async def trigger(self, event: Any):
+        type_event = type(event)
+        if not type_event in self.registry:
+            return
+
+        def fathers():
+            for type, listeners in self.registry.items():
+                if isinstance(event, type):
+                    for _, listener, *_ in listeners:
+                        yield listener
+
+        await gather(*(wrapped_sync(listener, event) for listener in fathers()))
+
+
+async def listener(event: Any) -> None:
+    pass
+
+
+def subscribe(controller: Controller) -> None:
+    for event_type in (
+        CoreEvent,
+        CoreGenerationStartEvent,
+        CoreGenerationRecvContentTokenEvent,
+        CoreGenerationErrorEvent,
+        CoreGenerationEndEvent,
+        ToolsExecuteStartEvent,
+        ToolsExecuteEndEvent,
+        HistoryMessageAddEvent,
+        HistoryResetEvent,
+    ):
+        controller.subscribe(event_type, listener)
+
+
+async def measure(controller: Controller) -> float:
+    subscribe(controller)
+    event = CoreGenerationRecvContentTokenEvent(
+        core=None, token=ContentToken(content="token"), message=AssistantMessage()  # type: ignore
+    )
+    start = perf_counter()
+    for _ in range(EVENTS):
+        await controller.trigger(event)
+    return EVENTS / (perf_counter() - start)
+
+
+async def main() -> None:
+    before = await measure(LegacyController())
+    after = await measure(Controller())
+    print(f"antes:   {before:>12,.0f} eventos/s")
+    print(f"despues: {after:>12,.0f} eventos/s")
+
+
+if __name__ == "__main__":
+    run(main())
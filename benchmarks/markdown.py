@@ -0,0 +1,94 @@
+"""Reproduce una respuesta larga de MockAI y mide el renderizado en Live
+
+Compara el renderizado anterior (Markdown de todo el buffer en cada token)
+con StreamingMarkdown limitado a RENDER_FPS.
+
+Uso: python -m benchmarks.markdown [parrafos]
+"""
+
+import sys
+from asyncio import run
+from io import StringIO
+from time import monotonic, perf_counter
+
+from rich.console import Console
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.panel import Panel
+
+from ai_cmd.ai.services.mock import MockAI
+from ai_cmd.ai.types import ContentToken
+from ai_cmd.app.const import RENDER_FPS
+from ai_cmd.app.renders.markdown import StreamingMarkdown
+
+PARAGRAPH = (
+    "Este es un parrafo de **prueba** con `codigo` y un [enlace](https://example.com) "
+    "que ocupa varias palabras para simular una respuesta larga del asistente."
+)
+CODE = "```python\ndef suma(a, b):\n    return a + b\n```"
+LIST = "- primer elemento\n- segundo elemento\n- tercer elemento"
+
+
+def create_answer(paragraphs: int) -> str:
+    blocks: list[str] = []
+    for index in range(paragraphs):
+        blocks.append(f"## Seccion {index}")
+        blocks.append(PARAGRAPH)
+        blocks.append(CODE if index % 2 else LIST)
+    return "\n\n".join(blocks)
+
+
+async def tokens(answer: str) -> list[str]:
+    ai = MockAI(delay=0, answer=answer)
+    return [
+        token.content
+        async for token in ai.chat(messages=[], tools=[])
+        if isinstance(token, ContentToken)
+    ]
+
+
+def create_live() -> Live:
+    console = Console(file=StringIO(), force_terminal=True, width=100, height=50)
+    return Live(console=console, auto_refresh=False)
+
+
+def render_full(contents: list[str]) -> float:
+    live = create_live()
+    live.start()
+    start = perf_counter()
+    buffer = ""
+    for content in contents:
+        buffer += content
+        live.update(Panel(Markdown(buffer), title="Asistente"), refresh=True)
+    live.stop()
+    return perf_counter() - start
+
+
+def render_incremental(contents: list[str]) -> float:
+    live = create_live()
+    markdown = StreamingMarkdown()
+    live.start()
+    live.update(Panel(markdown, title="Asistente"))
+    start = perf_counter()
+    last_refresh = 0.0
+    for content in contents:
+        markdown.feed(content)
+        now = monotonic()
+        if now - last_refresh >= 1 / RENDER_FPS:
+            last_refresh = now
+            live.refresh()
+    markdown.finish()
+    live.stop()
+    return perf_counter() - start
+
+
+async def main() -> None:
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    contents = await tokens(create_answer(paragraphs))
+    print(f"{len(contents)} tokens")
+    print(f"antes:   {render_full(contents):.3f}s")
+    print(f"despues: {render_incremental(contents):.3f}s")
+
+
+if __name__ == "__main__":
+    run(main())
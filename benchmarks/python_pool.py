@@ -0,0 +1,50 @@
+"""Mide la latencia de ejecutar fragmentos de codigo python
+
+Compara el arranque de un interprete nuevo por fragmento (PythonProgram, el
+camino de python_execute) con los procesos ya iniciados de PythonPool.
+
+Uso: python -m benchmarks.python_pool [fragmentos] [modulo ...]
+"""
+
+import sys
+from asyncio import run
+from statistics import median
+from time import perf_counter
+
+from ai_cmd.tools.tools_packs.python.executors import PythonProgram
+from ai_cmd.tools.tools_packs.python.pool import PythonPool
+
+CODE = "import {modules}\nprint(sum(range(1000)))"
+
+
+async def cold(code: str) -> float:
+    start = perf_counter()
+    program = PythonProgram(code=code)
+    await program.start()
+    await program.wait()
+    return perf_counter() - start
+
+
+async def main() -> None:
+    snippets = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules = sys.argv[2:] or ["json", "decimal"]
+    code = CODE.format(modules=", ".join(modules))
+
+    before = [await cold(code) for _ in range(snippets)]
+
+    pool = PythonPool(size=1, preload=modules)
+    await pool.run("pass")
+    after: list[float] = []
+    for _ in range(snippets):
+        start = perf_counter()
+        await pool.run(code)
+        after.append(perf_counter() - start)
+    await pool.close()
+
+    print(f"{snippets} fragmentos, modulos: {', '.join(modules)}")
+    print(f"antes:   {median(before) * 1000:8.2f} ms por fragmento")
+    print(f"despues: {median(after) * 1000:8.2f} ms por fragmento")
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,92 @@
+"""Mide una busqueda de texto en un arbol grande de archivos
+
+Compara recorrer el arbol con os.walk leyendo cada archivo linea a linea (lo
+que hacia falta con files_search archivo por archivo) con dirs_grep, y con
+`rg` o `grep -r` si estan instalados. El arbol se genera en un directorio
+temporal con un .gitignore que excluye una parte.
+
+Uso: python -m benchmarks.search [archivos]
+"""
+
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from asyncio import run
+from time import perf_counter
+from unittest.mock import MagicMock
+
+from ai_cmd.tools.tools_packs.dirs.base import DirsPack
+
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda".split()
+
+
+def generate(root: str, files: int) -> None:
+    rng = random.Random(0)
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("node_modules/\n*.min.js\n")
+    for index in range(files):
+        folder = "node_modules" if index % 10 == 0 else f"pkg{index % 50}"
+        directory = os.path.join(root, folder, f"mod{index % 37}")
+        os.makedirs(directory, exist_ok=True)
+        lines = [
+            " ".join(rng.choice(WORDS) for _ in range(8))
+            for _ in range(rng.randint(20, 200))
+        ]
+        if index % 97 == 0:
+            lines.insert(rng.randrange(len(lines)), "raise NeedleError(42)")
+        with open(os.path.join(directory, f"file{index}.py"), "w") as f:
+            f.write("\n".join(lines))
+
+
+def naive(root: str, pattern: str) -> int:
+    regex = re.compile(pattern)
+    found = 0
+    for directory, folders, names in os.walk(root):
+        folders[:] = [name for name in folders if name != "node_modules"]
+        for name in names:
+            with open(os.path.join(directory, name), errors="replace") as f:
+                found += sum(1 for line in f if regex.search(line))
+    return found
+
+
+async def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    pattern = r"Needle\w+\(\d+\)"
+    root = tempfile.mkdtemp(prefix="ai_cmd_search_")
+    try:
+        generate(root, files)
+        pack = DirsPack(controller=MagicMock(), window=MagicMock())
+
+        start = perf_counter()
+        found = naive(root, pattern)
+        before = perf_counter() - start
+
+        await pack.tool_grep(path=root, pattern="warm-up", max_results=1)
+        start = perf_counter()
+        result = await pack.tool_grep(path=root, pattern=pattern, max_results=10**6)
+        after = perf_counter() - start
+
+        print(f"{files} archivos, {found} coincidencias")
+        print(f"antes:   {before * 1000:8.1f} ms (os.walk y lectura por lineas)")
+        print(
+            f"despues: {after * 1000:8.1f} ms "
+            f"(dirs_grep, {len(result['matches'])} coincidencias)"
+        )
+        for command in (["rg", "-c", pattern, root], ["grep", "-rcE", "Needle", root]):
+            if shutil.which(command[0]):
+                start = perf_counter()
+                subprocess.run(command, stdout=subprocess.DEVNULL)
+                print(
+                    f"{command[0]}:{' ' * (8 - len(command[0]))}"
+                    f"{(perf_counter() - start) * 1000:8.1f} ms"
+                )
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    run(main())
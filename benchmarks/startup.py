@@ -0,0 +1,55 @@
+"""Mide el arranque del asistente en un interprete nuevo
+
+Importa y crea el core del asistente (create_assistant_core) importando los
+paquetes de herramientas al arrancar y de forma diferida, con la cache de
+esquemas vacia y con la cache ya guardada.
+
+Uso: python -m benchmarks.startup
+"""
+
+import sys
+from os import environ
+from subprocess import run
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+SCRIPT = """
+from unittest.mock import MagicMock
+from ai_cmd.ajents.assistant import base, tools
+from ai_cmd.controller.base import Controller
+from ai_cmd.settings.base import Settings
+
+lazy = {lazy}
+create_tools = tools.create_assistant_tools
+base.create_assistant_tools = lambda *args, **kwargs: create_tools(
+    *args, **kwargs, lazy=lazy
+)
+settings = Settings(api_key="key", api_key_reasoner="key")
+base.create_assistant_core(Controller(), settings=settings, window=MagicMock())
+"""
+
+
+def measure(lazy: bool, home: str) -> float:
+    start = perf_counter()
+    run(
+        [sys.executable, "-c", SCRIPT.format(lazy=lazy)],
+        cwd=home,
+        env={**environ, "HOME": home, "PYTHONPATH": sys.path[0] or "."},
+        check=True,
+    )
+    return perf_counter() - start
+
+
+def main() -> None:
+    for lazy in (False, True):
+        with TemporaryDirectory() as home:
+            cold = measure(lazy, home)
+            warm = min(measure(lazy, home) for _ in range(3))
+        name = "diferido" if lazy else "al arrancar"
+        print(
+            f"{name:12} sin cache: {cold * 1000:8.1f}ms  con cache: {warm * 1000:8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Mide el costo de despachar llamadas de herramientas con muchas registradas
+
+Compara el despacho anterior (recorrer los paquetes con `exists` y buscar la
+herramienta de forma lineal) con el indice por nombre de Tools.
+
+Uso: python -m benchmarks.tools_dispatch [paquetes] [herramientas]
+"""
+
+import sys
+from asyncio import run
+from time import perf_counter
+from typing import Any
+from unittest.mock import MagicMock
+
+from ai_cmd.controller.base import Controller
+from ai_cmd.tools.base import Tools
+from ai_cmd.tools.tool_pack import ToolPack
+from ai_cmd.tools.types import FunctionCall, ToolCall
+
+CALLS = 20_000
+
+
+async def tool(self: ToolPack) -> dict[str, Any]:
+    """Herramienta de prueba"""
+    return {"ok": True}
+
+
+def create_pack(index: int, tools: int) -> ToolPack:
+    attributes: dict[str, Any] = {"name": f"pack{index}"}
+    for number in range(tools):
+        attributes[f"tool_t{number}"] = tool
+    pack_class = type(f"Pack{index}", (ToolPack,), attributes)
+    return pack_class(controller=Controller(), window=MagicMock())
+
+
+class LegacyTools(Tools):
+    """Tools con el despacho anterior"""
+
+    async def find(self, tool_name: str):
+        for tool_pack in self.tool_packs:
+            if await self.exists(tool_pack, tool_name):
+                return tool_pack, None
+        return None, None
+
+    async def exists(self, tool_pack: ToolPack, tool_name: str) -> bool:
+        return any(tool.function.name == tool_name for tool in tool_pack._tools)
+
+
+async def measure(tools: Tools, tool_calls: list[ToolCall]) -> float:
+    for tool_call in tool_calls[:10]:
+        await tools.execute(tool_call=tool_call)
+    start = perf_counter()
+    for index in range(CALLS):
+        await tools.execute(tool_call=tool_calls[index % len(tool_calls)])
+    return CALLS / (perf_counter() - start)
+
+
+async def main() -> None:
+    packs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    tools_by_pack = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    tool_packs = [create_pack(index, tools_by_pack) for index in range(packs)]
+    tool_calls = [
+        ToolCall(
+            id=str(number),
+            function=FunctionCall(name=f"pack{index}_t{number}", arguments="{}"),
+        )
+        for index in range(packs)
+        for number in range(tools_by_pack)
+    ]
+    print(f"{len(tool_calls)} herramientas")
+    legacy = LegacyTools(controller=Controller(), tool_packs=list(tool_packs))
+    indexed = Tools(controller=Controller(), tool_packs=list(tool_packs))
+    print(f"antes:   {await measure(legacy, tool_calls):>10,.0f} llamadas/s")
+    print(f"despues: {await measure(indexed, tool_calls):>10,.0f} llamadas/s")
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,77 @@
+"""Mide el indice de trigramas de dirs_search en un arbol grande de archivos
+
+Genera un arbol sintetico en un directorio temporal y mide la creacion del
+indice, una actualizacion sin cambios, una actualizacion tras modificar una
+parte de los archivos y una consulta, comparada con dirs_grep (que vuelve a
+leer todo el arbol en cada busqueda). El indice se guarda tambien en un
+directorio temporal.
+
+Uso: python -m benchmarks.trigram_index [archivos]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from asyncio import run
+from time import perf_counter
+from unittest.mock import MagicMock, patch
+
+from ai_cmd.tools.tools_packs.dirs import trigrams
+from ai_cmd.tools.tools_packs.dirs.base import DirsPack
+from ai_cmd.tools.tools_packs.dirs.trigrams import TrigramIndex
+
+from .search import generate
+
+
+def measure(label: str, function, *args):
+    start = perf_counter()
+    result = function(*args)
+    print(f"{label:<24}{(perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+async def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    pattern = r"Needle\w+\(\d+\)"
+    root = tempfile.mkdtemp(prefix="ai_cmd_trigrams_")
+    cache = tempfile.mkdtemp(prefix="ai_cmd_trigrams_cache_")
+    try:
+        generate(root, files)
+        index = TrigramIndex(root, path=os.path.join(cache, "index.idx"))
+        paths = measure("creacion:", index.update)
+        size = os.path.getsize(index.path)
+        print(f"{len(paths)} archivos indexados, indice de {size / 2**20:.1f} MB")
+        measure("carga y actualizacion:", TrigramIndex(root, index.path).update)
+        measure("sin cambios:", index.update)
+        for path in paths[:: max(1, len(paths) // 100)]:
+            with open(os.path.join(root, path), "a") as f:
+                f.write("\nraise NeedleError(7)\n")
+        measure("100 archivos cambiados:", index.update)
+
+        pack = DirsPack(controller=MagicMock(), window=MagicMock())
+        with patch.object(trigrams, "TRIGRAM_INDEX_DIR", cache):
+            await pack.tool_grep(path=root, pattern="warm-up", max_results=1)
+            await pack.tool_search(path=root, pattern="warm-up", max_results=1)
+            start = perf_counter()
+            before = await pack.tool_grep(path=root, pattern=pattern, max_results=10**6)
+            before_time = perf_counter() - start
+            start = perf_counter()
+            after = await pack.tool_search(
+                path=root, pattern=pattern, max_results=10**6
+            )
+            after_time = perf_counter() - start
+        assert before["matches"] == after["matches"]
+        print(f"consulta, {len(after['matches'])} coincidencias:")
+        print(f"antes:   {before_time * 1000:8.1f} ms (dirs_grep)")
+        print(
+            f"despues: {after_time * 1000:8.1f} ms "
+            f"(dirs_search, {after['files']} de {after['indexed']} archivos revisados)"
+        )
+    finally:
+        shutil.rmtree(root)
+        shutil.rmtree(cache)
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,51 @@
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from ai_cmd.ai.services.openai.base import OpenAI
+from ai_cmd.core.history.types import AssistantMessage, SystemMessage, UserMessage
+from ai_cmd.tools.schemas.types import FunctionSchema
+from ai_cmd.tools.types import FunctionCall, Tool, ToolCall
+
+
+def create_openai() -> OpenAI:
+    return OpenAI(
+        api_key="key", base_url="http://localhost", model="model", temperature=0
+    )
+
+
+class TestOpenAI(IsolatedAsyncioTestCase):
+    async def test_map_messages_reuses_params(self):
+        openai = create_openai()
+        system = SystemMessage(content="sistema")
+        assistant = AssistantMessage(content="hola")
+        messages = [system, UserMessage(content="hola"), assistant]
+        first = openai._map_messages(messages)
+        second = openai._map_messages(messages)
+        self.assertEqual(first, second)
+        for before, after in zip(first, second):
+            self.assertIs(before, after)
+        assistant.content += " que tal"
+        assistant.tool_calls = [
+            ToolCall(id="1", function=FunctionCall(name="a", arguments="{}"))
+        ]
+        third = openai._map_messages(messages)
+        self.assertIs(third[0], first[0])
+        self.assertEqual(third[2]["content"], "hola que tal")
+        self.assertEqual(third[2]["tool_calls"][0]["id"], "1")  # type: ignore
+
+    async def test_map_tools_by_identity(self):
+        openai = create_openai()
+        tools = [
+            Tool(
+                function=FunctionSchema(
+                    name="a", description="", parameters={}, callable=print
+                )
+            )
+        ]
+        payload = openai._map_tools(tools)
+        self.assertIs(openai._map_tools(tools), payload)
+        self.assertIsNot(openai._map_tools(list(tools)), payload)
+
+
+if __name__ == "__main__":
+    main()
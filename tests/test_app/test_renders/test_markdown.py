@@ -0,0 +1,59 @@
+from io import StringIO
+from unittest import TestCase, main
+
+from rich.console import Console
+from rich.markdown import Markdown
+
+from ai_cmd.app.renders.markdown import StreamingMarkdown
+
+DOCUMENT = """# Titulo
+
+Primer parrafo con **negrita** y
+una segunda linea.
+
+- item 1
+- item 2
+
+  continuacion del item
+
+```python
+def f():
+
+    return 1
+```
+
+> cita
+
+Final sin salto"""
+
+
+def render(renderable: object) -> str:
+    console = Console(file=StringIO(), width=60)
+    console.print(renderable)
+    return console.file.getvalue()  # type: ignore
+
+
+class TestStreamingMarkdown(TestCase):
+    def test_render_equals_full_markdown(self):
+        markdown = StreamingMarkdown()
+        for index in range(0, len(DOCUMENT), 3):
+            markdown.feed(DOCUMENT[index : index + 3])
+        self.assertEqual(render(markdown), render(Markdown(DOCUMENT)))
+        markdown.finish()
+        self.assertEqual(render(markdown), render(Markdown(DOCUMENT)))
+
+    def test_blocks_are_cached(self):
+        markdown = StreamingMarkdown()
+        markdown.feed("Primero\n\nSegundo\n\nTercero")
+        self.assertEqual(len(markdown.blocks), 2)
+        self.assertEqual(markdown.tail, "Tercero")
+
+    def test_code_fence_is_one_block(self):
+        markdown = StreamingMarkdown()
+        markdown.feed("```\na\n\nb\n```\n\nfin")
+        self.assertEqual(len(markdown.blocks), 1)
+        self.assertEqual(markdown.tail, "fin")
+
+
+if __name__ == "__main__":
+    main()
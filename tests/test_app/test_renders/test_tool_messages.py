@@ -0,0 +1,58 @@
+from json import dumps
+from unittest import IsolatedAsyncioTestCase, main
+from unittest.mock import patch
+
+from prompt_toolkit.formatted_text import to_plain_text
+from prompt_toolkit.layout import Layout
+
+from ai_cmd.app.renders.tool_messages import render_dirs_list_tool_message
+from ai_cmd.core.history.types import ToolMessage
+from ai_cmd.tools.types import FunctionCall, ToolCall
+
+
+async def render_dirs_list(response: dict) -> list[str]:
+    tool_call = ToolCall(
+        id="1", function=FunctionCall(name="dirs_list", arguments="{}")
+    )
+    tool_message = ToolMessage(
+        name="dirs_list", content=dumps(response), tool_call_id="1"
+    )
+    with patch("ai_cmd.app.renders.utils.print_container") as print_container:
+        await render_dirs_list_tool_message(tool_call, tool_message)
+    frame = print_container.call_args.args[0]
+    return [
+        to_plain_text(window.content.text)
+        for window in Layout(frame).find_all_windows()
+        if hasattr(window.content, "text") and not callable(window.content.text)
+    ]
+
+
+class TestRenderDirsList(IsolatedAsyncioTestCase):
+    async def test_names(self):
+        lines = await render_dirs_list({"path": "/tmp", "elements": ["a.py", "b"]})
+        self.assertEqual(lines, ["Directorio /tmp", " 0:a.py", " 1:b"])
+
+    async def test_details_and_more_entries(self):
+        lines = await render_dirs_list(
+            {
+                "path": "/tmp",
+                "elements": [
+                    {"path": "<a>.py", "type": "file", "size": 12},
+                    {"path": "src", "type": "dir", "size": 4096},
+                ],
+                "next_cursor": "src",
+            }
+        )
+        self.assertEqual(
+            lines,
+            [
+                "Directorio /tmp",
+                " 0:<a>.py (file, 12 bytes)",
+                " 1:src (dir, 4096 bytes)",
+                "... hay más elementos",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
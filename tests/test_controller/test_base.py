@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from ai_cmd.controller.base import Controller
+from ai_cmd.controller.types import Event
+
+
+@dataclass(kw_only=True)
+class ParentEvent(Event):
+    type: str = field(default="parent")
+
+
+@dataclass(kw_only=True)
+class ChildEvent(ParentEvent):
+    type: str = field(default="child")
+
+
+class TestController(IsolatedAsyncioTestCase):
+    async def test_trigger(self):
+        controller = Controller()
+        received: list[Event] = []
+        controller.subscribe(ChildEvent, received.append)
+        event = ChildEvent()
+        await controller.trigger(event)
+        self.assertEqual(received, [event])
+
+    async def test_trigger_parent_listeners(self):
+        controller = Controller()
+        received: list[str] = []
+        controller.subscribe(ParentEvent, lambda event: received.append("parent"))
+        controller.subscribe(Event, lambda event: received.append("event"))
+        await controller.trigger(ChildEvent())
+        self.assertEqual(received, ["parent", "event"])
+
+    async def test_trigger_without_listeners(self):
+        controller = Controller()
+        received: list[Event] = []
+        controller.subscribe(ChildEvent, received.append)
+        await controller.trigger(ParentEvent())
+        self.assertEqual(received, [])
+
+    async def test_subscribe_invalidates_dispatch(self):
+        controller = Controller()
+        received: list[str] = []
+        await controller.trigger(ChildEvent())
+        controller.subscribe(ParentEvent, lambda event: received.append("parent"))
+        await controller.trigger(ChildEvent())
+        self.assertEqual(received, ["parent"])
+
+    async def test_clear_invalidates_dispatch(self):
+        controller = Controller()
+        received: list[str] = []
+        id = controller.subscribe(ParentEvent, lambda event: received.append("a"))
+        await controller.trigger(ChildEvent())
+        self.assertTrue(controller.clear(id))
+        await controller.trigger(ChildEvent())
+        self.assertEqual(received, ["a"])
+
+    async def test_trigger_sync_and_async_listeners(self):
+        controller = Controller()
+        received: list[str] = []
+
+        async def async_listener(event: Event):
+            received.append("async")
+
+        controller.subscribe(ChildEvent, async_listener)
+        controller.subscribe(ChildEvent, lambda event: received.append("sync"))
+        controller.subscribe(ParentEvent, async_listener)
+        await controller.trigger(ChildEvent())
+        self.assertEqual(sorted(received), ["async", "async", "sync"])
+
+    async def test_trigger_sync_listener_returning_coroutine(self):
+        controller = Controller()
+        received: list[str] = []
+
+        async def listener(event: Event):
+            received.append("async")
+
+        controller.subscribe(ChildEvent, lambda event: listener(event))
+        await controller.trigger(ChildEvent())
+        self.assertEqual(received, ["async"])
+
+
+if __name__ == "__main__":
+    main()
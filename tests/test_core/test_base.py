@@ -0,0 +1,70 @@
+import sqlite3
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+
+from ai_cmd.ai.services.mock import MockAI
+from ai_cmd.controller.base import Controller
+from ai_cmd.core.base import Core
+from ai_cmd.core.coalescer import TokenCoalescer
+from ai_cmd.core.events import CoreGenerationRecvContentTokenEvent
+from ai_cmd.core.history.base import History
+from ai_cmd.core.history.storage.sqlite import SQLiteHistoryStorage
+from ai_cmd.core.history.types import AssistantMessage, UserMessage
+from ai_cmd.tools.base import Tools
+
+
+class TestCore(IsolatedAsyncioTestCase):
+    async def test_start_generation(self):
+        controller = Controller()
+        history = History(controller=controller, messages=[])
+        ai = MockAI(delay=0, answer="uno dos tres")
+        core = Core(controller=controller, ai=ai, history=history)
+        await core.start_generation(content="hola")
+        message = history.messages[-1]
+        self.assertIsInstance(message, AssistantMessage)
+        self.assertEqual(message.content, "uno dos tres ")
+
+    async def test_start_generation_with_coalescer(self):
+        controller = Controller()
+        received: list[str] = []
+        controller.subscribe(
+            CoreGenerationRecvContentTokenEvent,
+            lambda event: received.append(event.token.content),
+        )
+        history = History(controller=controller, messages=[])
+        ai = MockAI(delay=0, answer="uno dos tres")
+        coalescer = TokenCoalescer(max_chars=100, max_delay=10)
+        core = Core(controller=controller, ai=ai, history=history, coalescer=coalescer)
+        await core.start_generation(content="hola")
+        self.assertEqual(received, ["uno dos tres "])
+        self.assertEqual(history.messages[-1].content, "uno dos tres ")
+
+    async def test_close(self):
+        controller = Controller()
+        storage = SQLiteHistoryStorage(path=":memory:")
+        history = History(controller=controller, messages=[], storage=storage)
+        await history.add_user_message(UserMessage(content="hola"))
+        tool_pack = AsyncMock()
+        tools = Tools(controller=controller, tool_packs=[tool_pack])
+        core = Core(controller=controller, ai=MockAI(), history=history, tools=tools)
+        saved = AsyncMock(wraps=storage.save)
+        storage.save = saved  # type: ignore
+        with (
+            patch("ai_cmd.core.base.http_client") as http_client,
+            patch("ai_cmd.core.base.cpu_executor") as cpu_executor,
+            patch("ai_cmd.core.base.io_executor") as io_executor,
+        ):
+            http_client.close = AsyncMock()
+            await core.close()
+        http_client.close.assert_awaited_once()
+        cpu_executor.shutdown.assert_called_once()
+        io_executor.shutdown.assert_called_once()
+        tool_pack.reset.assert_awaited_once()
+        saved.assert_awaited_once()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            storage.connection.execute("SELECT 1")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from ai_cmd.core.budget import ContextBudgeter, estimate_tokens
+from ai_cmd.core.history.types import (
+    AssistantMessage,
+    SystemMessage,
+    ToolMessage,
+    UserMessage,
+)
+from ai_cmd.tools.types import FunctionCall, ToolCall
+
+
+def tool_turn(id: str, content: str) -> list:
+    return [
+        AssistantMessage(
+            tool_calls=[
+                ToolCall(id=id, function=FunctionCall(name="read", arguments="{}"))
+            ]
+        ),
+        ToolMessage(name="read", content=content, tool_call_id=id),
+    ]
+
+
+class TestContextBudgeter(IsolatedAsyncioTestCase):
+    async def test_estimate_is_cached(self):
+        message = UserMessage(content="a" * 40)
+        tokens = estimate_tokens(message)
+        self.assertEqual(message.token_estimate, (40, tokens))
+        message.content += "b" * 40
+        self.assertGreater(estimate_tokens(message), tokens)
+
+    async def test_rolling_total(self):
+        budgeter = ContextBudgeter()
+        messages = [SystemMessage(content="s" * 40), UserMessage(content="u" * 40)]
+        total = budgeter.count(messages)
+        messages.append(AssistantMessage())
+        budgeter.count(messages)
+        messages[-1].content = "a" * 400
+        self.assertEqual(budgeter.count(messages), sum(map(estimate_tokens, messages)))
+        self.assertGreater(budgeter.total, total)
+        messages.pop(0)
+        self.assertEqual(budgeter.count(messages), sum(map(estimate_tokens, messages)))
+
+    async def test_window_under_budget(self):
+        budgeter = ContextBudgeter(max_tokens=1000)
+        messages = [SystemMessage(content="s"), UserMessage(content="u")]
+        self.assertIs(budgeter.window(messages), messages)
+
+    async def test_window_truncates_old_tool_messages(self):
+        messages = [
+            SystemMessage(content="sistema"),
+            UserMessage(content="hola"),
+            *tool_turn("1", "x" * 4000),
+            UserMessage(content="sigue"),
+            *tool_turn("2", "y" * 4000),
+            AssistantMessage(),
+        ]
+        budgeter = ContextBudgeter(max_tokens=1500, truncate_chars=100)
+        window = budgeter.window(messages)
+        self.assertEqual(len(window), len(messages))
+        self.assertLess(len(window[3].content), 200)
+        self.assertEqual(window[6], messages[6])
+        self.assertEqual(len(messages[3].content), 4000)
+
+    async def test_window_drops_tool_units(self):
+        messages = [
+            SystemMessage(content="sistema"),
+            UserMessage(content="hola"),
+            *tool_turn("1", "x" * 400),
+            *tool_turn("2", "x" * 400),
+            UserMessage(content="sigue"),
+            AssistantMessage(),
+        ]
+        budgeter = ContextBudgeter(max_tokens=80, truncate_chars=100)
+        window = budgeter.window(messages)
+        self.assertIs(window[0], messages[0])
+        self.assertEqual(window[-2:], messages[-2:])
+        for index, message in enumerate(window):
+            if message.role == "tool":
+                self.assertEqual(window[index - 1].role, "assistant")
+
+
+if __name__ == "__main__":
+    main()
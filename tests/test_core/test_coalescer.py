@@ -0,0 +1,49 @@
+from asyncio import sleep
+from typing import Any, AsyncGenerator
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from ai_cmd.ai.types import ContentToken, Token, ToolsCallsToken
+from ai_cmd.core.coalescer import TokenCoalescer
+
+
+async def generate(*tokens: Token, delay: float = 0) -> AsyncGenerator[Token, Any]:
+    for token in tokens:
+        yield token
+        await sleep(delay)
+
+
+async def collect(generator: AsyncGenerator[Token, Any]) -> list[Token]:
+    return [token async for token in generator]
+
+
+class TestTokenCoalescer(IsolatedAsyncioTestCase):
+    async def test_coalesce_by_size(self):
+        coalescer = TokenCoalescer(max_chars=4, max_delay=10)
+        tokens = [ContentToken(content=c) for c in "abcdefghij"]
+        result = await collect(coalescer.coalesce(generate(*tokens)))
+        self.assertEqual(
+            result,
+            [
+                ContentToken(content="abcd"),
+                ContentToken(content="efgh"),
+                ContentToken(content="ij"),
+            ],
+        )
+
+    async def test_coalesce_flush_on_tools_calls(self):
+        coalescer = TokenCoalescer(max_chars=100, max_delay=10)
+        tools_calls = ToolsCallsToken(tools_calls=[])
+        tokens = [ContentToken(content="a"), ContentToken(content="b"), tools_calls]
+        result = await collect(coalescer.coalesce(generate(*tokens)))
+        self.assertEqual(result, [ContentToken(content="ab"), tools_calls])
+
+    async def test_coalesce_by_time(self):
+        coalescer = TokenCoalescer(max_chars=100, max_delay=0.01)
+        tokens = [ContentToken(content="a"), ContentToken(content="b")]
+        result = await collect(coalescer.coalesce(generate(*tokens, delay=0.05)))
+        self.assertEqual(result, [ContentToken(content="a"), ContentToken(content="b")])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from ai_cmd.controller.base import Controller
+from ai_cmd.core.history.base import History
+from ai_cmd.core.history.storage.sqlite import SQLiteHistoryStorage
+from ai_cmd.core.history.types import (
+    AssistantMessage,
+    SystemMessage,
+    ToolMessage,
+    UserMessage,
+)
+from ai_cmd.tools.types import FunctionCall, ToolCall
+
+
+class TestHistory(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.storage = SQLiteHistoryStorage(
+            path=path.join(self.directory.name, "history.db")
+        )
+
+    def tearDown(self):
+        self.storage.connection.close()
+        self.directory.cleanup()
+
+    def create_history(self, **kwargs) -> History:
+        return History(
+            controller=Controller(),
+            messages=[SystemMessage(content="sistema")],
+            storage=self.storage,
+            **kwargs,
+        )
+
+    async def test_flush_and_resume(self):
+        history = self.create_history()
+        await history.add_user_message(UserMessage(content="hola", name="user"))
+        message = AssistantMessage(
+            tool_calls=[
+                ToolCall(id="1", function=FunctionCall(name="time_now", arguments="{}"))
+            ]
+        )
+        await history.add_assistant_message(message)
+        await history.add_tool_message(
+            ToolMessage(name="time_now", content="12:00", tool_call_id="1")
+        )
+        message.content = "listo"
+        await history.flush(message=message)
+
+        resumed = self.create_history()
+        await resumed.resume(history.session)
+        self.assertEqual(resumed.messages, history.messages)
+
+    async def test_batch_size(self):
+        history = self.create_history(batch_size=2)
+        self.assertEqual(await self.storage.load(history.session), [])
+        await history.add_user_message(UserMessage(content="hola"))
+        self.assertEqual(len(await self.storage.load(history.session)), 2)
+
+    async def test_queries(self):
+        history = self.create_history()
+        await history.add_user_message(UserMessage(content="hola"))
+        await history.add_assistant_message(AssistantMessage(content="que tal"))
+        await history.add_user_message(UserMessage(content="bien"))
+        self.assertEqual(
+            await history.count(), {"system": 1, "user": 2, "assistant": 1}
+        )
+        schema = await history.schema(offset=2)
+        self.assertEqual([item.index for item in schema], [2, 3])
+        self.assertEqual([item.length for item in schema], [7, 4])
+        tail = await history.tail(2)
+        self.assertEqual([message.content for message in tail], ["que tal", "bien"])
+
+    async def test_delete(self):
+        history = self.create_history()
+        await history.add_user_message(UserMessage(content="hola"))
+        await history.add_user_message(UserMessage(content="adios"))
+        await history.flush()
+        await history.delete(1)
+        await history.add_user_message(UserMessage(content="otra"))
+        await history.flush()
+        loaded = await self.storage.load(history.session)
+        self.assertEqual(loaded, history.messages)
+        with self.assertRaises(IndexError):
+            await history.delete(10)
+
+    async def test_reset_starts_session(self):
+        history = self.create_history()
+        session = history.session
+        await history.reset()
+        self.assertNotEqual(history.session, session)
+        self.assertEqual(history.messages, [])
+        self.assertEqual([item[0] for item in await history.sessions()], [session])
+
+    async def test_without_storage(self):
+        history = History(controller=Controller(), messages=[])
+        await history.add_user_message(UserMessage(content="hola"))
+        self.assertEqual(await history.count(), {"user": 1})
+        self.assertEqual((await history.schema())[0].length, 4)
+        self.assertEqual(await history.tail(1), history.messages)
+
+
+if __name__ == "__main__":
+    main()
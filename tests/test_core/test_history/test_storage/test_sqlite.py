@@ -0,0 +1,56 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from ai_cmd.core.history.const import HISTORY_FILE
+from ai_cmd.core.history.storage.sqlite import SQLiteHistoryStorage
+from ai_cmd.core.history.types import UserMessage
+from ai_cmd.tools.offload import io_executor
+
+
+class TestSQLiteHistoryStorage(IsolatedAsyncioTestCase):
+    async def test_save_replaces_position(self):
+        storage = SQLiteHistoryStorage(path=":memory:")
+        await storage.save("a", [(0, UserMessage(content="uno"))])
+        await storage.save("a", [(0, UserMessage(content="dos"))])
+        self.assertEqual(await storage.load("a"), [UserMessage(content="dos")])
+
+    async def test_delete_shifts_positions(self):
+        storage = SQLiteHistoryStorage(path=":memory:")
+        messages = [UserMessage(content=str(index)) for index in range(4)]
+        await storage.save("a", list(enumerate(messages)))
+        await storage.delete("a", 1)
+        schema = await storage.schema("a")
+        self.assertEqual([item.index for item in schema], [0, 1, 2])
+        self.assertEqual(await storage.load("a"), messages[:1] + messages[2:])
+
+    async def test_sessions_are_isolated(self):
+        storage = SQLiteHistoryStorage(path=":memory:")
+        await storage.save("a", [(0, UserMessage(content="uno"))])
+        await storage.save("b", [(0, UserMessage(content="dos"))])
+        await storage.clear("a")
+        self.assertEqual(await storage.load("a"), [])
+        self.assertEqual(await storage.count("b"), {"user": 1})
+        self.assertEqual([item[0] for item in await storage.sessions()], ["b"])
+
+    async def test_file_in_data_dir(self):
+        self.assertTrue(path.isabs(HISTORY_FILE))
+        with TemporaryDirectory() as directory:
+            file = path.join(directory, "datos", "ai_cmd", "history.db")
+            storage = SQLiteHistoryStorage(path=file)
+            await storage.save("a", [(0, UserMessage(content="uno"))])
+            await storage.close()
+            self.assertTrue(path.exists(file))
+
+    async def test_queries_run_in_io_executor(self):
+        storage = SQLiteHistoryStorage(path=":memory:")
+        with patch.object(io_executor, "run", wraps=io_executor.run) as run:
+            await storage.save("a", [(0, UserMessage(content="uno"))])
+            self.assertEqual(await storage.count("a"), {"user": 1})
+        self.assertEqual(run.call_count, 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,69 @@
+import sys
+from os import environ, path
+from subprocess import run
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from pexpect import spawn
 
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+STARTUP_BUDGET = 1.5
+"""Segundos de imports permitidos hasta el primer prompt."""
+LAZY_MODULES = (
+    "openai",
+    "requests",
+    "rich.markdown",
+    "pygments.lexers.python",
+    "ai_cmd.app.renders.tool_calls",
+    "ai_cmd.tools.tools_packs.files",
+    "ai_cmd.tools.tools_packs.http",
+    "ai_cmd.tools.tools_packs.dirs.base",
+    "ai_cmd.tools.tools_packs.python.base",
+)
+STARTUP_SCRIPT = """
+from ai_cmd.main import create_assistant_core
+from ai_cmd.app.window import WindowApp
+from ai_cmd.controller.base import Controller
+from ai_cmd.settings.base import Settings
+
+settings = Settings(api_key="key", api_key_reasoner="key")
+create_assistant_core(Controller(), settings=settings, window=WindowApp())
+"""
+
 
 class Test__main__(TestCase):
     def test_execute(self):
         unit: spawn[str] = spawn("python -m ai_cmd", cwd="../")
         self.assertEqual(unit.exitstatus, 0)
+
+
+class TestStartup(TestCase):
+    def importtime(self, home: str) -> list[tuple[int, int, str]]:
+        result = run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            cwd=home,
+            env={**environ, "HOME": home, "XDG_DATA_HOME": home, "PYTHONPATH": ROOT},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            self.skipTest(result.stderr.strip().splitlines()[-1])
+        imports: list[tuple[int, int, str]] = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            imports.append((depth, int(cumulative), name.strip()))
+        return imports
+
+    def test_startup_imports(self):
+        with TemporaryDirectory() as home:
+            # La primera ejecucion guarda la cache de esquemas
+            self.importtime(home)
+            imports = self.importtime(home)
+        modules = {name for _, _, name in imports}
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules)
+        total = sum(cumulative for depth, cumulative, _ in imports if depth == 0)
+        self.assertLess(total / 1_000_000, STARTUP_BUDGET)
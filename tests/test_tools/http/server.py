@@ -0,0 +1,87 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import sleep
+from typing import Callable, Optional
+
+Route = Callable[["Handler"], tuple[int, dict[str, str], bytes]]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "LocalServer"
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.respond()
+
+    def respond(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path, dict(self.headers)))
+            server.ports.add(self.client_address[1])
+            server.running += 1
+            server.max_running = max(server.max_running, server.running)
+        try:
+            route = server.routes.get(self.path.split("?")[0])
+            if route is None:
+                status, headers, body = 404, {}, b"not found"
+            else:
+                status, headers, body = route(self)
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.running -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer(ThreadingHTTPServer):
+    """Servidor HTTP local para probar las herramientas sin red"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.routes: dict[str, Route] = {}
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        self.ports: set[int] = set()
+        self.lock = Lock()
+        self.running = 0
+        self.max_running = 0
+        self.thread: Optional[Thread] = None
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def route(
+        self,
+        path: str,
+        body: bytes,
+        status: int = 200,
+        delay: float = 0,
+        **headers: str,
+    ):
+        def handler(request: Handler):
+            if delay:
+                sleep(delay)
+            return status, {"Content-Type": "text/html; charset=utf-8", **headers}, body
+
+        self.routes[path] = handler
+
+    def __enter__(self) -> "LocalServer":
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
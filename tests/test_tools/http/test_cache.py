@@ -0,0 +1,140 @@
+from tempfile import TemporaryDirectory
+from threading import current_thread, main_thread
+from unittest import TestCase, main
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from ai_cmd.tools.http.cache import HttpCache, ParsedCache, expiration
+from ai_cmd.tools.http.client import HttpClient
+from ai_cmd.tools.http.types import HttpResponse
+
+from .server import Handler, LocalServer
+
+
+def etag_route(request: Handler):
+    if request.headers.get("If-None-Match") == '"v1"':
+        return 304, {"ETag": '"v1"'}, b""
+    return 200, {"ETag": '"v1"'}, b"contenido"
+
+
+class TestExpiration(TestCase):
+    def test_max_age(self):
+        self.assertEqual(expiration({"cache-control": "public, max-age=60"}, 100), 160)
+        self.assertEqual(
+            expiration({"cache-control": "max-age=60", "age": "20"}, 100), 140
+        )
+
+    def test_not_storable(self):
+        self.assertIsNone(expiration({"cache-control": "no-store", "etag": "a"}, 0))
+        self.assertIsNone(expiration({}, 0))
+        self.assertIsNone(expiration({"cache-control": "max-age=60", "vary": "*"}, 0))
+
+    def test_validators_only(self):
+        self.assertEqual(expiration({"etag": '"a"'}, 100), 100)
+        self.assertEqual(
+            expiration({"cache-control": "no-cache, max-age=60", "etag": "a"}, 100),
+            100,
+        )
+
+
+class TestHttpCache(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = TemporaryDirectory()
+        self.server = LocalServer().__enter__()
+        self.client = HttpClient(cache=HttpCache(directory=self.directory.name))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.server.__exit__()
+        self.directory.cleanup()
+
+    async def test_fresh_response_is_cached(self):
+        self.server.route("/", b"hola", **{"Cache-Control": "max-age=60"})
+        first = await self.client.request("get", self.server.url("/"))
+        second = await self.client.request("get", self.server.url("/"))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.digest, first.digest)
+
+    async def test_conditional_request(self):
+        self.server.routes["/etag"] = etag_route
+        await self.client.request("get", self.server.url("/etag"))
+        second = await self.client.request("get", self.server.url("/etag"))
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[1][2].get("If-None-Match"), '"v1"')
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.text, "contenido")
+
+    async def test_not_cached(self):
+        self.server.route("/", b"hola", **{"Cache-Control": "no-store"})
+        await self.client.request("get", self.server.url("/"))
+        await self.client.request("get", self.server.url("/"))
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_persistence(self):
+        self.server.route("/", b"hola", **{"Cache-Control": "max-age=60"})
+        await self.client.request("get", self.server.url("/"))
+        client = HttpClient(cache=HttpCache(directory=self.directory.name))
+        response = await client.request("get", self.server.url("/"))
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.text, "hola")
+
+    async def test_disk_work_off_the_loop(self):
+        cache = self.client.cache
+        threads: list[tuple[str, bool]] = []
+
+        def recording(name, function):
+            def wrapper(*args, **kwargs):
+                threads.append((name, current_thread() is main_thread()))
+                return function(*args, **kwargs)
+
+            return wrapper
+
+        for name in ("get", "refresh", "store", "flush"):
+            setattr(cache, name, recording(name, getattr(cache, name)))
+        load = HttpResponse.load
+        HttpResponse.load = recording("load", load)  # type: ignore
+        try:
+            self.server.routes["/etag"] = etag_route
+            self.server.route("/", b"hola", **{"Cache-Control": "max-age=60"})
+            await self.client.request("get", self.server.url("/etag"))
+            await self.client.request("get", self.server.url("/etag"))
+            await self.client.request("get", self.server.url("/"))
+            await self.client.request("get", self.server.url("/"))
+            await self.client.close()
+        finally:
+            HttpResponse.load = load  # type: ignore
+        self.assertEqual(
+            {name for name, _ in threads},
+            {"get", "refresh", "store", "flush", "load"},
+        )
+        self.assertFalse(any(on_loop for _, on_loop in threads))
+
+    async def test_lru_eviction(self):
+        cache = HttpCache(directory=self.directory.name, max_size=25)
+        self.client.cache = cache
+        for name in ("a", "b", "c"):
+            self.server.route(f"/{name}", name.encode() * 10, **{"ETag": name})
+            await self.client.request("get", self.server.url(f"/{name}"))
+        cache.response(cache.entries[self.server.url("/b")])
+        self.server.route("/d", b"d" * 10, **{"ETag": "d"})
+        await self.client.request("get", self.server.url("/d"))
+        self.assertEqual(
+            list(cache.entries), [self.server.url("/b"), self.server.url("/d")]
+        )
+        self.assertLessEqual(cache.size, 25)
+
+
+class TestParsedCache(TestCase):
+    def test_lru(self):
+        cache = ParsedCache(max_entries=2)
+        cache.put("a", "text", "A")
+        cache.put("b", "text", "B")
+        self.assertEqual(cache.get("a", "text"), "A")
+        cache.put("c", "text", "C")
+        self.assertIsNone(cache.get("b", "text"))
+        self.assertEqual(cache.get("a", "text"), "A")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from asyncio import gather, run, sleep, to_thread
+from time import monotonic
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+
+import httpx
+
+from ai_cmd.tools.http.client import HttpClient
+
+from .server import LocalServer
+
+
+class TestHttpClient(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = LocalServer().__enter__()
+        self.client = HttpClient(max_per_host=2)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.server.__exit__()
+
+    async def test_request(self):
+        self.server.route("/", "<p>hola ñ</p>".encode())
+        response = await self.client.request("get", self.server.url("/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, "<p>hola ñ</p>")
+        self.assertFalse(response.truncated)
+
+    async def test_post(self):
+        self.server.route("/echo", b"ok")
+        await self.client.request("post", self.server.url("/echo"), data='{"a": 1}')
+        self.assertEqual(self.server.requests[-1][0], "POST")
+
+    async def test_error_status(self):
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.client.request("get", self.server.url("/missing"))
+
+    async def test_keep_alive(self):
+        self.server.route("/", b"ok")
+        for _ in range(5):
+            await self.client.request("get", self.server.url("/"))
+        self.assertEqual(len(self.server.ports), 1)
+
+    async def test_max_bytes(self):
+        self.server.route("/large", b"x" * 200_000)
+        response = await self.client.request(
+            "get", self.server.url("/large"), max_bytes=1000
+        )
+        self.assertEqual(len(response.content), 1000)
+        self.assertTrue(response.truncated)
+
+    async def test_per_host_limit(self):
+        self.server.route("/slow", b"ok", delay=0.1)
+        await gather(
+            *(self.client.request("get", self.server.url("/slow")) for _ in range(6))
+        )
+        self.assertEqual(self.server.max_running, 2)
+
+    async def test_new_loop_closes_old_client(self):
+        self.server.route("/", b"ok")
+        url = self.server.url("/")
+        await to_thread(run, self.client.request("get", url))
+        old = self.client.client
+        await self.client.request("get", url)
+        self.assertIsNot(self.client.client, old)
+        self.assertTrue(old.is_closed)  # type: ignore
+        client = self.client.client
+        await self.client.close()
+        self.assertTrue(client.is_closed)  # type: ignore
+        self.assertIsNone(self.client.client)
+
+    async def test_event_loop_is_not_blocked(self):
+        self.server.route("/slow", b"ok", delay=0.3)
+        ticks: list[float] = []
+
+        async def tick():
+            start = monotonic()
+            while monotonic() - start < 0.25:
+                ticks.append(monotonic())
+                await sleep(0.01)
+
+        await gather(self.client.request("get", self.server.url("/slow")), tick())
+        self.assertGreater(len(ticks), 10)
+
+
+if __name__ == "__main__":
+    main()
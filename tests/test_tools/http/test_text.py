@@ -0,0 +1,73 @@
+from unittest import TestCase, main
+
+from ai_cmd.tools.http.text import TextExtractor, extract_text
+
+PAGE = """<html><head><title>Titulo</title><style>p { color: red; }</style></head>
+<body><nav><a href="/">Inicio</a></nav><h1>Hola</h1>
+<p>uno   dos &amp;
+tres</p><script>var a = "<p>no</p>";</script>
+<ul><li>a</li><li>b</li></ul><svg><title>icono</title></svg><footer>pie</footer>fin</body></html>"""
+
+
+class TestTextExtractor(TestCase):
+    def test_extract_text(self):
+        self.assertEqual(
+            extract_text(PAGE),
+            "Titulo\nHola\nuno dos & tres\na\nb\nfin",
+        )
+
+    def test_head_without_end(self):
+        self.assertEqual(
+            extract_text("<html><head><title>T</title><body><p>Hello world</p>"),
+            "T\nHello world",
+        )
+        self.assertEqual(
+            extract_text("<head><meta charset=utf-8><title>T</title><p>Hola"),
+            "T\nHola",
+        )
+
+    def test_nav_dropped(self):
+        html = (
+            "<body>menu<nav><ul><li><a href='/'>Inicio</a></li>"
+            "<li><a href='/blog'>Blog</a></li></ul></nav>contenido</body>"
+        )
+        self.assertEqual(extract_text(html), "menu\ncontenido")
+
+    def test_form_body(self):
+        html = (
+            '<html><body><form method="post" action="./Default.aspx">'
+            '<input type="hidden" name="__VIEWSTATE" value="x">'
+            "<div><h1>Productos</h1><p>Lista de precios</p></div></form></body>"
+        )
+        self.assertEqual(extract_text(html), "Productos\nLista de precios")
+
+    def test_article_header(self):
+        html = (
+            "<article><header><h1>Titular</h1><p>por Ana</p></header>"
+            "<p>Cuerpo del articulo</p></article>"
+        )
+        self.assertEqual(extract_text(html), "Titular\npor Ana\nCuerpo del articulo")
+
+    def test_feed_bytes_chunks(self):
+        data = "<p>canción ñandú</p>".encode("utf-8")
+        extractor = TextExtractor()
+        for index in range(len(data)):
+            self.assertTrue(extractor.feed_bytes(data[index : index + 1]))
+        self.assertEqual(extractor.text(), "canción ñandú")
+
+    def test_feed_bytes_encoding(self):
+        extractor = TextExtractor()
+        extractor.feed_bytes("<p>año</p>".encode("latin-1"), "latin-1")
+        self.assertEqual(extractor.text(), "año")
+
+    def test_budget(self):
+        extractor = TextExtractor(max_chars=10)
+        self.assertFalse(extractor.feed_bytes(b"<div>" + b"x" * 20 + b"</div>"))
+        self.assertTrue(extractor.done)
+        self.assertEqual(extractor.size, 10)
+        self.assertFalse(extractor.feed_bytes(b"<p>mas</p>"))
+        self.assertEqual(extractor.text(), "x" * 9)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import unittest
+from json import load
+from os import path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from ai_cmd.tools.schemas.cache import SchemaCache
+from ai_cmd.tools.schemas.generators import FunctionSchemaGenerator
+
+
+def my_tool(a: int, b: str = "") -> dict:
+    """My tool
+
+    Args:
+        a: First
+        b: Second
+    """
+    return {}
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = path.join(self.directory.name, "cache", "schemas.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_cache(self):
+        cache = SchemaCache(path=None)
+        first = cache.generate(my_tool, custom_name="pack_my_tool")
+        with patch.object(FunctionSchemaGenerator, "generate") as generate:
+            second = cache.generate(my_tool, custom_name="pack_my_tool")
+            generate.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(second.parameters["required"], ["a"])
+        other = cache.generate(my_tool, custom_name="other_my_tool")
+        self.assertEqual(other.name, "other_my_tool")
+
+    def test_disk_cache(self):
+        cache = SchemaCache(path=self.path)
+        schema = cache.generate(my_tool, custom_name="pack_my_tool")
+        cache.save()
+        warm = SchemaCache(path=self.path)
+        with patch.object(FunctionSchemaGenerator, "generate") as generate:
+            self.assertEqual(warm.generate(my_tool, custom_name="pack_my_tool"), schema)
+            generate.assert_not_called()
+
+    def test_disk_cache_invalidated_by_source(self):
+        cache = SchemaCache(path=self.path)
+        cache.generate(my_tool)
+        cache.save()
+        with open(self.path, encoding="utf-8") as file:
+            data = load(file)
+        self.assertIn(__name__, data["modules"])
+        warm = SchemaCache(path=self.path)
+        warm.hashes[__name__] = "changed"
+        with patch.object(
+            FunctionSchemaGenerator, "generate", wraps=FunctionSchemaGenerator.generate
+        ) as generate:
+            warm.generate(my_tool)
+            generate.assert_called_once()
+
+    def test_local_functions_not_saved(self):
+        def local_tool(a: int):
+            """Local"""
+
+        cache = SchemaCache(path=self.path)
+        cache.generate(local_tool)
+        cache.save()
+        self.assertFalse(path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
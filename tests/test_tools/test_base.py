@@ -1,9 +1,15 @@
+import json
+import os
+import tempfile
+from asyncio import sleep
 from unittest.async_case import IsolatedAsyncioTestCase
 from unittest.mock import AsyncMock, MagicMock
 
 from ai_cmd.core.history.types import ToolMessage
 from ai_cmd.tools.base import Tools
 from ai_cmd.tools.tool_pack import ToolPack
+from ai_cmd.tools.tools_packs.files import FilesPack
+from ai_cmd.tools.tools_packs.paths import PathsPack
 from ai_cmd.tools.types import FunctionCall, ToolCall
 
 
@@ -96,3 +102,109 @@ class TestTools(IsolatedAsyncioTestCase):
         self.assertEqual(len(list), 2)
         self.assertEqual(list[0], {"name": "tool1"})
         self.assertEqual(list[1], {"name": "tool2"})
+
+    async def test_list_cache(self):
+        tools = Tools(controller=create_cotroller(), tool_packs=[])
+        tool_pack1 = MagicMock(spec=ToolPack)
+        tool_pack1.name = "tool_pack1"
+        tool_pack1.tools = AsyncMock(return_value=[{"name": "tool1"}])
+        tools.tool_packs = [tool_pack1]
+        first = await tools.list()
+        self.assertIs(await tools.list(), first)
+        tool_pack1.tools.assert_called_once()
+        await tools.disable("tool_pack1")
+        self.assertEqual(await tools.list(), [])
+        await tools.enable("tool_pack1")
+        self.assertEqual(await tools.list(), [{"name": "tool1"}])
+        tool_pack2 = MagicMock(spec=ToolPack)
+        tool_pack2.name = "tool_pack2"
+        tool_pack2.tools = AsyncMock(return_value=[{"name": "tool2"}])
+        await tools.add(tool_pack2)
+        self.assertEqual(len(await tools.list()), 2)
+        await tools.remove("tool_pack1")
+        self.assertEqual(await tools.list(), [{"name": "tool2"}])
+
+    async def test_find_uses_index(self):
+        class MyToolPack(ToolPack):
+            name = "my_tool_pack"
+
+            async def tool_my_tool(self, value: int):
+                """My Tool"""
+                return {"value": value}
+
+        tool_pack = MyToolPack(controller=create_cotroller(), window=MagicMock())
+        tool_pack.exists = AsyncMock(return_value=False)
+        tools = Tools(controller=create_cotroller(), tool_packs=[tool_pack])
+        found_pack, tool = await tools.find("my_tool_pack_my_tool")
+        self.assertIs(found_pack, tool_pack)
+        self.assertEqual(tool.function.name, "my_tool_pack_my_tool")
+        tool_pack.exists.assert_not_called()
+        self.assertEqual(await tools.find("unknown"), (None, None))
+        tool_call = ToolCall(
+            id="1",
+            function=FunctionCall(
+                name="my_tool_pack_my_tool", arguments='{"value": 2}'
+            ),
+        )
+        message = await tools.execute(tool_call)
+        self.assertEqual(message.content, '{"value": 2}')
+        await tools.remove("my_tool_pack")
+        self.assertEqual(await tools.find("my_tool_pack_my_tool"), (None, None))
+
+    async def test_execute_all_keeps_order(self):
+        for concurrent, expected_max_running in ((True, 3), (False, 1)):
+            with self.subTest(concurrent=concurrent):
+                tools = Tools(controller=create_cotroller(), tool_packs=[])
+                running: list[str] = []
+                max_running = 0
+
+                async def execute(tool_call: ToolCall):
+                    nonlocal max_running
+                    running.append(tool_call.id)
+                    max_running = max(max_running, len(running))
+                    await sleep(0.05 if tool_call.id == "0" else 0.01)
+                    running.remove(tool_call.id)
+                    return {"id": tool_call.id}
+
+                tool_pack1 = MagicMock(spec=ToolPack)
+                tool_pack1.exists = AsyncMock(return_value=True)
+                tool_pack1.execute = AsyncMock(side_effect=execute)
+                tool_pack1.concurrent = concurrent
+                tool_pack1.name = "tool_pack1"
+                tools.tool_packs = [tool_pack1]
+                tool_calls = [
+                    ToolCall(
+                        id=str(i),
+                        function=FunctionCall(name="tool_pack1_a", arguments=""),
+                    )
+                    for i in range(3)
+                ]
+                result = await tools.execute_all(tool_calls)
+                self.assertEqual([m.tool_call_id for m in result], ["0", "1", "2"])
+                self.assertEqual(max_running, expected_max_running)
+
+    async def test_execute_all_write_then_read(self):
+        controller = create_cotroller()
+        files_pack = FilesPack(controller=controller, window=MagicMock())
+        paths_pack = PathsPack(controller=controller, window=MagicMock())
+        tools = Tools(controller=controller, tool_packs=[files_pack, paths_pack])
+        content = "x" * 5_000_000 + "fin"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "file.txt")
+            calls = [
+                ("files_write", {"path": path, "content": content}),
+                ("files_read", {"path": path, "length": len(content)}),
+                ("files_delete", {"path": path}),
+                ("paths_exists", {"path": path}),
+            ]
+            tool_calls = [
+                ToolCall(
+                    id=str(i),
+                    function=FunctionCall(name=name, arguments=json.dumps(arguments)),
+                )
+                for i, (name, arguments) in enumerate(calls)
+            ]
+            result = await tools.execute_all(tool_calls)
+        self.assertEqual(json.loads(result[1].content)["content"], content)
+        self.assertNotIn("error", json.loads(result[2].content))
+        self.assertEqual(json.loads(result[3].content), {"exists": False})
@@ -0,0 +1,64 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import main
+from unittest.async_case import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, patch
+
+from ai_cmd.tools import lazy
+from ai_cmd.tools.lazy import LazyToolPack
+from ai_cmd.tools.schemas.cache import schema_cache
+from ai_cmd.tools.types import FunctionCall, ToolCall
+
+MODULE = "ai_cmd.tools.tools_packs.time"
+
+
+class TestLazyToolPack(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache_path = schema_cache.path
+        schema_cache.path = path.join(self.directory.name, "schemas.json")
+        schema_cache.clear()
+
+    def tearDown(self):
+        schema_cache.path = self.cache_path
+        schema_cache.clear()
+        self.directory.cleanup()
+
+    def create_pack(self) -> LazyToolPack:
+        return LazyToolPack(
+            module=MODULE,
+            class_name="TimePack",
+            controller=MagicMock(),
+            window=MagicMock(),
+        )
+
+    async def test_cached_pack_is_not_loaded(self):
+        cold = self.create_pack()
+        self.assertIsNotNone(cold.pack)
+        schema_cache.clear()
+        with patch.object(lazy, "import_module") as import_module:
+            warm = self.create_pack()
+            import_module.assert_not_called()
+        self.assertIsNone(warm.pack)
+        self.assertEqual(warm.name, "time")
+        self.assertEqual(
+            [tool.to_schema() for tool in await warm.tools()],
+            [tool.to_schema() for tool in await cold.tools()],
+        )
+        self.assertTrue(await warm.exists("time_info"))
+
+    async def test_execute_loads_pack(self):
+        self.create_pack()
+        warm = self.create_pack()
+        warm.pack = None
+        tool_call = ToolCall(
+            id="1",
+            function=FunctionCall(name="time_info", arguments='{"confirm": true}'),
+        )
+        result = await warm.execute(tool_call=tool_call)
+        self.assertIn("year", result)
+        self.assertIsNotNone(warm.pack)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import os
+import threading
+from asyncio import CancelledError, create_task, gather, sleep
+from time import monotonic
+from unittest import IsolatedAsyncioTestCase, main
+
+from ai_cmd.tools.offload import (
+    CPUExecutor,
+    IOExecutor,
+    OperationCancelled,
+    call_method,
+    checkpoint,
+    cpu_bound,
+    cpu_executor,
+    io_bound,
+)
+
+
+class Blocking:
+    """Herramientas bloqueantes de prueba"""
+
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.started = threading.Event()
+
+    @io_bound
+    def tool_wait(self, seconds: float) -> dict:
+        """Espera bloqueando el hilo.
+
+        Args:
+            seconds: Segundos a esperar.
+        """
+        threading.Event().wait(seconds)
+        return {"thread": threading.current_thread().name}
+
+    @io_bound
+    def tool_loop(self) -> dict:
+        self.started.set()
+        try:
+            while True:
+                checkpoint()
+                threading.Event().wait(0.01)
+        except OperationCancelled:
+            self.stopped.set()
+            raise
+
+
+class Computing:
+    """Herramientas de CPU de prueba"""
+
+    @cpu_bound
+    def tool_pid(self, delay: float = 0) -> dict:
+        """Devuelve el proceso en el que se ejecuta.
+
+        Args:
+            delay: Segundos a esperar antes de responder.
+        """
+        threading.Event().wait(delay)
+        return {"pid": os.getpid()}
+
+    @cpu_bound
+    def tool_fail(self) -> dict:
+        raise ValueError("fallo")
+
+
+class TestIOExecutor(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.executor = IOExecutor(max_workers=2)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+
+    async def test_run(self):
+        result = await self.executor.run(sum, [1, 2, 3])
+        self.assertEqual(result, 6)
+
+    async def test_run_in_thread(self):
+        name = await self.executor.run(lambda: threading.current_thread().name)
+        self.assertTrue(name.startswith("ai_cmd_io"))
+
+    async def test_max_workers(self):
+        start = monotonic()
+        await gather(
+            *(self.executor.run(threading.Event().wait, 0.2) for _ in range(4))
+        )
+        # Con dos hilos, cuatro esperas tardan dos turnos
+        self.assertGreaterEqual(monotonic() - start, 0.4)
+
+    async def test_configure(self):
+        self.executor.configure(4)
+        start = monotonic()
+        await gather(
+            *(self.executor.run(threading.Event().wait, 0.2) for _ in range(4))
+        )
+        self.assertLess(monotonic() - start, 0.4)
+        with self.assertRaises(ValueError):
+            self.executor.configure(0)
+
+    async def test_exceptions(self):
+        with self.assertRaises(ZeroDivisionError):
+            await self.executor.run(lambda: 1 / 0)
+
+    async def test_checkpoint_outside_executor(self):
+        checkpoint()
+
+
+class TestIOBound(IsolatedAsyncioTestCase):
+
+    async def test_coroutine(self):
+        blocking = Blocking()
+        result = await blocking.tool_wait(seconds=0.01)
+        self.assertTrue(result["thread"].startswith("ai_cmd_io"))
+
+    async def test_keeps_signature(self):
+        from inspect import getdoc, iscoroutinefunction, signature
+
+        blocking = Blocking()
+        self.assertTrue(iscoroutinefunction(blocking.tool_wait))
+        self.assertEqual(list(signature(blocking.tool_wait).parameters), ["seconds"])
+        self.assertIn("Espera bloqueando", getdoc(blocking.tool_wait) or "")
+
+    async def test_does_not_block_loop(self):
+        blocking = Blocking()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await sleep(0.01)
+                ticks += 1
+
+        task = create_task(ticker())
+        await blocking.tool_wait(seconds=0.3)
+        task.cancel()
+        self.assertGreater(ticks, 10)
+
+    async def test_cancel(self):
+        blocking = Blocking()
+        task = create_task(blocking.tool_loop())
+        await sleep(0)
+        self.assertTrue(blocking.started.wait(1))
+        task.cancel()
+        with self.assertRaises(CancelledError):
+            await task
+        # El hilo deja de trabajar en el siguiente checkpoint
+        self.assertTrue(blocking.stopped.wait(1))
+
+
+class TestCPUExecutor(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.executor = CPUExecutor(max_workers=2)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+
+    async def test_run_in_process(self):
+        result = await self.executor.run(
+            call_method, __name__, "Computing.tool_pid", (), {}
+        )
+        self.assertNotEqual(result["pid"], os.getpid())
+
+    async def test_parallel(self):
+        start = monotonic()
+        results = await gather(
+            *(
+                self.executor.run(
+                    call_method, __name__, "Computing.tool_pid", (0.5,), {}
+                )
+                for _ in range(2)
+            )
+        )
+        self.assertLess(monotonic() - start, 0.95)
+        self.assertEqual(len({result["pid"] for result in results}), 2)
+
+    async def test_warm_up(self):
+        self.executor.configure(warm_up=True)
+        self.executor.start()
+        self.assertIsNotNone(self.executor.executor)
+        await sleep(0.5)
+        start = monotonic()
+        await self.executor.run(call_method, __name__, "Computing.tool_pid", (), {})
+        self.assertLess(monotonic() - start, 0.2)
+
+    async def test_start_without_warm_up(self):
+        self.executor.start()
+        self.assertIsNone(self.executor.executor)
+
+    async def test_configure(self):
+        await self.executor.run(sum, [1, 2])
+        executor = self.executor.executor
+        self.executor.configure(max_workers=3)
+        self.assertEqual(self.executor.max_workers, 3)
+        self.assertIsNone(self.executor.executor)
+        self.assertEqual(await self.executor.run(sum, [1, 2]), 3)
+        self.assertIsNot(self.executor.executor, executor)
+        with self.assertRaises(ValueError):
+            self.executor.configure(max_workers=0)
+
+
+class TestCPUBound(IsolatedAsyncioTestCase):
+
+    async def test_coroutine(self):
+        computing = Computing()
+        result = await computing.tool_pid()
+        self.assertNotEqual(result["pid"], os.getpid())
+        self.assertIn(__name__, cpu_executor.modules)
+
+    async def test_keeps_signature(self):
+        from inspect import getdoc, iscoroutinefunction, signature
+
+        computing = Computing()
+        self.assertTrue(iscoroutinefunction(computing.tool_pid))
+        self.assertTrue(computing.tool_pid.cpu_bound)
+        self.assertEqual(list(signature(computing.tool_pid).parameters), ["delay"])
+        self.assertIn("Devuelve el proceso", getdoc(computing.tool_pid) or "")
+
+    async def test_exceptions(self):
+        with self.assertRaisesRegex(ValueError, "fallo"):
+            await Computing().tool_fail()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,19 @@
 import os
 import shutil
+import tempfile
 from unittest import main
 from unittest.async_case import IsolatedAsyncioTestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from ai_cmd.tools.tool_pack import ToolPack
 from ai_cmd.tools.tools_packs.dirs.base import DirsPack
+from ai_cmd.tools.tools_packs.dirs.ignore import IgnoreRules, parse_rules
+from ai_cmd.tools.tools_packs.dirs.trigrams import (
+    TrigramIndex,
+    literals,
+    trigram_indexes,
+)
+from ai_cmd.tools.tools_packs.dirs.walk import walk_files, walk_key
 
 
 class TestDirsPack(IsolatedAsyncioTestCase):
@@ -76,6 +84,451 @@ class TestDirsPack(IsolatedAsyncioTestCase):
         self.assertIn("path", result)
         self.assertIn("type", result)
         self.assertEqual(result["type"], "dir")
+        self.assertEqual(
+            result["elements"], [{"path": "test_file.txt", "type": "file"}]
+        )
+
+
+class TestDirsPackScan(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.dirs_pack = DirsPack(controller=MagicMock(), window=MagicMock())
+        self.root = tempfile.mkdtemp()
+        files = {
+            "b.txt": 10,
+            "a.py": 300,
+            ".hidden": 1,
+            "src/main.py": 2000,
+            "src/util.py": 0,
+            "src/deep/more/x.py": 5,
+            "zz/big.bin": 5000,
+        }
+        for path, size in files.items():
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"x" * size)
+        os.symlink(os.path.join(self.root, "src"), os.path.join(self.root, "link"))
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.root)
+
+    async def paths(self, **kwargs) -> list[str]:
+        result = await self.dirs_pack.tool_scan(path=self.root, **kwargs)
+        return [element["path"] for element in result["elements"]]
+
+    async def test_depth_and_order(self):
+        self.assertEqual(
+            await self.paths(),
+            [
+                "a.py",
+                "b.txt",
+                "link",
+                "src",
+                "src/deep",
+                "src/deep/more",
+                "src/main.py",
+                "src/util.py",
+                "zz",
+                "zz/big.bin",
+            ],
+        )
+        self.assertEqual(
+            await self.paths(max_depth=1), ["a.py", "b.txt", "link", "src", "zz"]
+        )
+        self.assertIn("src/deep/more/x.py", await self.paths(max_depth=4))
+        self.assertIn(".hidden", await self.paths(max_depth=1, hidden=True))
+        self.assertEqual(
+            await self.paths(exclude=["*.py", "zz/"]),
+            ["b.txt", "link", "src", "src/deep", "src/deep/more"],
+        )
+
+    async def test_types_and_details(self):
+        result = await self.dirs_pack.tool_scan(
+            path=self.root, max_depth=1, details=True
+        )
+        elements = {element["path"]: element for element in result["elements"]}
+        self.assertEqual(elements["link"]["type"], "symlink")
+        self.assertEqual(elements["src"]["type"], "dir")
+        self.assertEqual(elements["a.py"]["type"], "file")
+        self.assertEqual(elements["a.py"]["size"], 300)
+        self.assertIn("modification_time", elements["a.py"])
+
+    async def test_sort_by_size(self):
+        self.assertEqual(
+            await self.paths(max_depth=1, sort="size", exclude=["link", "*/"]),
+            ["a.py", "b.txt"],
+        )
+        paths = await self.paths(sort="size")
+        self.assertLess(paths.index("src/main.py"), paths.index("src/util.py"))
+        result = await self.dirs_pack.tool_scan(path=self.root, sort="color")
+        self.assertIn("error", result)
+
+    async def test_pagination(self):
+        for sort in ("name", "size", "mtime"):
+            expected = await self.paths(sort=sort)
+            paths: list[str] = []
+            cursor = None
+            while True:
+                result = await self.dirs_pack.tool_scan(
+                    path=self.root, sort=sort, max_entries=3, cursor=cursor
+                )
+                self.assertLessEqual(len(result["elements"]), 3)
+                paths += [element["path"] for element in result["elements"]]
+                cursor = result.get("next_cursor")
+                if cursor is None:
+                    break
+            self.assertEqual(paths, expected)
+
+    async def test_cursor_skips_directories(self):
+        self.assertEqual(
+            await self.paths(cursor="src/deep/more"),
+            ["src/main.py", "src/util.py", "zz", "zz/big.bin"],
+        )
+        self.assertEqual(
+            await self.paths(cursor="src/other.py"), ["src/util.py", "zz", "zz/big.bin"]
+        )
+
+    async def test_group_by(self):
+        result = await self.dirs_pack.tool_scan(path=self.root, group_by="extension")
+        self.assertNotIn("elements", result)
+        self.assertEqual(result["scanned"], 10)
+        self.assertEqual(
+            result["groups"],
+            {
+                ".bin": {"files": 1, "size": 5000},
+                ".py": {"files": 3, "size": 2300},
+                ".txt": {"files": 1, "size": 10},
+            },
+        )
+        result = await self.dirs_pack.tool_scan(path=self.root, group_by="size")
+        self.assertEqual(
+            result["groups"],
+            {
+                "<1MB": {"files": 2, "size": 7000},
+                "<1KB": {"files": 2, "size": 310},
+                "empty": {"files": 1, "size": 0},
+            },
+        )
+        result = await self.dirs_pack.tool_scan(path=self.root, group_by="color")
+        self.assertIn("error", result)
+
+    async def test_tool_list(self):
+        result = await self.dirs_pack.tool_list(path=self.root)
+        self.assertEqual(
+            result["elements"], [".hidden", "a.py", "b.txt", "link", "src", "zz"]
+        )
+        result = await self.dirs_pack.tool_list(
+            path=self.root, details=True, sort="size", max_entries=4
+        )
+        self.assertNotIn("entries", result)
+        sizes = [entry["size"] for entry in result["elements"]]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertEqual(result["next_cursor"], result["elements"][-1]["path"])
+        missing = os.path.join(self.root, "missing")
+        result = await self.dirs_pack.tool_list(path=missing)
+        self.assertEqual(result["error"], f"Does not exist: {missing}")
+        path = os.path.join(self.root, "a.py")
+        result = await self.dirs_pack.tool_scan(path=path)
+        self.assertEqual(result["error"], f"Not a directory: {path}")
+
+
+class TestIgnoreRules(IsolatedAsyncioTestCase):
+
+    def rules(self, *lines: str) -> IgnoreRules:
+        return IgnoreRules().child("", parse_rules(lines))
+
+    async def test_name_at_any_level(self):
+        rules = self.rules("*.log", "build")
+        self.assertTrue(rules.ignored("a.log", False))
+        self.assertTrue(rules.ignored("src/deep/a.log", False))
+        self.assertTrue(rules.ignored("src/build", True))
+        self.assertFalse(rules.ignored("src/a.py", False))
+
+    async def test_anchored(self):
+        rules = self.rules("/dist", "docs/*.html")
+        self.assertTrue(rules.ignored("dist", True))
+        self.assertFalse(rules.ignored("src/dist", True))
+        self.assertTrue(rules.ignored("docs/index.html", False))
+        self.assertFalse(rules.ignored("docs/api/index.html", False))
+
+    async def test_double_star(self):
+        rules = self.rules("**/cache/**", "src/**/gen_*.py")
+        self.assertTrue(rules.ignored("a/b/cache/x", False))
+        self.assertTrue(rules.ignored("src/gen_a.py", False))
+        self.assertTrue(rules.ignored("src/a/b/gen_a.py", False))
+        self.assertFalse(rules.ignored("lib/gen_a.py", False))
+
+    async def test_dir_only_and_negation(self):
+        rules = self.rules("# comentario", "logs/", "*.txt", "!keep.txt")
+        self.assertTrue(rules.ignored("logs", True))
+        self.assertFalse(rules.ignored("logs", False))
+        self.assertTrue(rules.ignored("a.txt", False))
+        self.assertFalse(rules.ignored("sub/keep.txt", False))
+
+    async def test_nested(self):
+        rules = self.rules("*.tmp").child("sub", parse_rules(["!a.tmp", "/b"]))
+        self.assertTrue(rules.ignored("a.tmp", False))
+        self.assertFalse(rules.ignored("sub/a.tmp", False))
+        self.assertTrue(rules.ignored("sub/b", False))
+        self.assertFalse(rules.ignored("b", False))
+
+    async def test_walk_key(self):
+        paths = ["b/a.txt", "z.txt", "a/c/d.txt", "a/b.txt", "a.txt"]
+        self.assertEqual(
+            sorted(paths, key=walk_key),
+            ["a.txt", "z.txt", "a/b.txt", "a/c/d.txt", "b/a.txt"],
+        )
+
+
+class TestDirsPackSearch(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.dirs_pack = DirsPack(controller=MagicMock(), window=MagicMock())
+        self.root = tempfile.mkdtemp()
+        self.write(".gitignore", "*.log\nbuild/\n")
+        self.write("main.py", "import os\n\ndef main():\n    return 'TODO'\n")
+        self.write("notes.log", "TODO en un log\n")
+        self.write("build/out.py", "TODO generado\n")
+        self.write(".hidden/secret.py", "TODO oculto\n")
+        self.write("src/lib.py", "# TODO uno\nx = 1\n# todo dos\n")
+        self.write("src/data.bin", "TODO\0binario")
+        self.write("src/sub/.gitignore", "!*.log\n")
+        self.write("src/sub/keep.log", "TODO incluido\n")
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, path: str, content: str):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    async def test_walk_files(self):
+        paths = [path for path, _ in walk_files(self.root)]
+        self.assertEqual(
+            paths, ["main.py", "src/data.bin", "src/lib.py", "src/sub/keep.log"]
+        )
+        paths = [path for path, _ in walk_files(self.root, hidden=True)]
+        self.assertIn(".hidden/secret.py", paths)
+        paths = [path for path, _ in walk_files(self.root, exclude=["src/"])]
+        self.assertEqual(paths, ["main.py"])
+
+    async def test_walk_files_start(self):
+        paths = [path for path, _ in walk_files(self.root, start="src/lib.py")]
+        self.assertEqual(paths, ["src/lib.py", "src/sub/keep.log"])
+        # Si la ruta ya no existe se sigue por la siguiente
+        paths = [path for path, _ in walk_files(self.root, start="src/a.py")]
+        self.assertEqual(paths, ["src/data.bin", "src/lib.py", "src/sub/keep.log"])
+
+    async def test_tool_grep(self):
+        result = await self.dirs_pack.tool_grep(path=self.root, pattern="TODO")
+        self.assertEqual(
+            [(m["path"], m["line_number"]) for m in result["matches"]],
+            [("main.py", 4), ("src/lib.py", 1), ("src/sub/keep.log", 1)],
+        )
+        self.assertEqual(result["matches"][1]["line"], "# TODO uno")
+        self.assertEqual(result["binary_skipped"], 1)
+        self.assertNotIn("next_cursor", result)
+
+    async def test_tool_grep_options(self):
+        result = await self.dirs_pack.tool_grep(
+            path=self.root, pattern="todo", ignore_case=True, glob="src/*.py"
+        )
+        self.assertEqual([m["line_number"] for m in result["matches"]], [1, 3])
+        result = await self.dirs_pack.tool_grep(
+            path=self.root, pattern="x = (", fixed=True
+        )
+        self.assertEqual(result["matches"], [])
+        result = await self.dirs_pack.tool_grep(path=self.root, pattern="x = (")
+        self.assertIn("error", result)
+
+    async def test_tool_grep_cursor(self):
+        self.write("src/many.py", "".join(f"TODO {i}\n" for i in range(5)))
+        seen = []
+        cursor = None
+        for _ in range(10):
+            result = await self.dirs_pack.tool_grep(
+                path=self.root, pattern="TODO", max_results=2, cursor=cursor
+            )
+            seen.extend((m["path"], m["line_number"]) for m in result["matches"])
+            cursor = result.get("next_cursor")
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(len(set(seen)), 8)
+        self.assertEqual(
+            seen[1:6], [("src/lib.py", 1)] + [("src/many.py", n) for n in range(1, 5)]
+        )
+
+    async def test_tool_grep_parallel(self):
+        for i in range(600):
+            self.write(
+                f"many/{i:04}.txt", "nada\n" * 10 + ("TODO\n" if i % 3 == 0 else "")
+            )
+        result = await self.dirs_pack.tool_grep(
+            path=self.root, pattern="^TODO$", glob="many/*", max_results=1000
+        )
+        self.assertEqual(len(result["matches"]), 200)
+        self.assertEqual(
+            result["matches"][0],
+            {"path": "many/0000.txt", "line_number": 11, "line": "TODO"},
+        )
+        self.assertEqual(result["matches"][-1]["path"], "many/0597.txt")
+        result = await self.dirs_pack.tool_grep(
+            path=self.root, pattern="^TODO$", glob="many/*", max_results=150
+        )
+        self.assertEqual(result["next_cursor"], "many/0447.txt:1")
+
+    async def test_tool_glob(self):
+        result = await self.dirs_pack.tool_glob(path=self.root, pattern="*.py")
+        self.assertEqual(result["files"], ["main.py", "src/lib.py"])
+        result = await self.dirs_pack.tool_glob(
+            path=self.root, pattern="*", max_results=2
+        )
+        self.assertEqual(result["files"], ["main.py", "src/data.bin"])
+        result = await self.dirs_pack.tool_glob(
+            path=self.root, pattern="*", cursor=result["next_cursor"]
+        )
+        self.assertEqual(result["files"], ["src/lib.py", "src/sub/keep.log"])
+        self.assertNotIn("next_cursor", result)
+
+
+class TestTrigramIndex(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.cache, "index.idx")
+        for i in range(20):
+            self.write(f"src/mod{i}.py", f"def function_{i}():\n    return {i}\n")
+        self.write("src/special.py", "class NeedleFinder:\n    pass\n")
+        self.write("README.md", "Needle en el pajar\n")
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.root)
+        shutil.rmtree(self.cache)
+        trigram_indexes.clear()
+
+    def write(self, path: str, content: str):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def index(self) -> TrigramIndex:
+        index = TrigramIndex(self.root, path=self.index_file)
+        index.update()
+        return index
+
+    async def test_literals(self):
+        self.assertEqual(literals(rb"def tool_\w+"), [[b"def tool_"]])
+        self.assertEqual(literals(rb"(?i)Needle.*Finder"), [[b"needle", b"finder"]])
+        self.assertEqual(
+            literals(rb"(foo|bar)baz"), [[b"foo", b"baz"], [b"bar", b"baz"]]
+        )
+        self.assertEqual(literals(rb"(abc)+"), [[b"abc"]])
+        self.assertEqual(literals(rb"(abc)?x"), [[]])
+        self.assertEqual(literals(rb"a.b|longer"), [[]])
+
+    async def test_candidates(self):
+        index = self.index()
+        self.assertEqual(
+            index.candidates([[b"needle"]]), {"src/special.py", "README.md"}
+        )
+        self.assertEqual(index.candidates([[b"needle", b"class"]]), {"src/special.py"})
+        self.assertEqual(
+            index.candidates([[b"function_1"], [b"pajar"]]),
+            {f"src/mod{i}.py" for i in (1, *range(10, 20))} | {"README.md"},
+        )
+        self.assertEqual(index.candidates([[b"nothing"]]), set())
+        self.assertIsNone(index.candidates([[]]))
+        self.assertIsNone(index.candidates([[b"a b"]]))
+
+    async def test_incremental_update(self):
+        index = self.index()
+        self.write("src/mod3.py", "Needle nueva\n")
+        os.remove(os.path.join(self.root, "README.md"))
+        self.write("src/new.py", "otra needle\n")
+        paths = index.update()
+        self.assertNotIn("README.md", paths)
+        self.assertEqual(
+            index.candidates([[b"needle"]]),
+            {"src/special.py", "src/mod3.py", "src/new.py"},
+        )
+        self.assertEqual(index.candidates([[b"function_3"]]), set())
+        self.assertEqual(index.dead, 2)
+
+    async def test_persistence(self):
+        self.index()
+        self.assertTrue(os.path.exists(self.index_file))
+        index = TrigramIndex(self.root, path=self.index_file)
+        with patch.object(TrigramIndex, "_add") as add:
+            index.update()
+        add.assert_not_called()
+        self.assertFalse(index.dirty)
+        self.assertEqual(
+            index.candidates([[b"needle"]]), {"src/special.py", "README.md"}
+        )
+
+    async def test_other_root_is_ignored(self):
+        self.index()
+        other = tempfile.mkdtemp()
+        try:
+            index = TrigramIndex(other, path=self.index_file)
+            self.assertEqual(index.update(), [])
+            self.assertEqual(index.files, [])
+        finally:
+            shutil.rmtree(other)
+
+    async def test_compaction(self):
+        index = self.index()
+        for i in range(15):
+            os.remove(os.path.join(self.root, f"src/mod{i}.py"))
+        index.update()
+        self.assertEqual(index.dead, 0)
+        self.assertEqual(len(index.files), 7)
+        self.assertEqual(
+            index.candidates([[b"function_1"]]),
+            {f"src/mod{i}.py" for i in range(15, 20)},
+        )
+        self.assertEqual(
+            index.candidates([[b"needle"]]), {"src/special.py", "README.md"}
+        )
+
+    async def test_binary_and_large_files(self):
+        self.write("data.bin", "Needle\0binario")
+        with patch("ai_cmd.tools.tools_packs.dirs.trigrams.MAX_INDEXED_FILE", 30):
+            self.write("src/big.py", "x" * 100)
+            index = self.index()
+        self.assertNotIn("data.bin", index.candidates([[b"needle"]]))
+        self.assertIn("src/big.py", index.candidates([[b"needle"]]))
+
+    async def test_tool_search(self):
+        dirs_pack = DirsPack(controller=MagicMock(), window=MagicMock())
+        with patch(
+            "ai_cmd.tools.tools_packs.dirs.trigrams.TRIGRAM_INDEX_DIR", self.cache
+        ):
+            for pattern in ("Needle", "function_1\\d", "return (3|7)$", "x.y"):
+                indexed = await dirs_pack.tool_search(path=self.root, pattern=pattern)
+                plain = await dirs_pack.tool_grep(path=self.root, pattern=pattern)
+                self.assertEqual(indexed["matches"], plain["matches"])
+            result = await dirs_pack.tool_search(
+                path=self.root, pattern="needle", ignore_case=True, max_results=1
+            )
+            self.assertEqual(result["indexed"], 22)
+            self.assertEqual(result["files"], 2)
+            self.assertEqual(result["matches"][0]["path"], "README.md")
+            result = await dirs_pack.tool_search(
+                path=self.root,
+                pattern="needle",
+                ignore_case=True,
+                cursor=result["next_cursor"],
+            )
+            self.assertEqual([m["path"] for m in result["matches"]], ["src/special.py"])
+            result = await dirs_pack.tool_search(path=self.root, pattern="(")
+            self.assertIn("error", result)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
+import hashlib
 import os
 import shutil
+import tempfile
+from asyncio import CancelledError, Event, create_task, sleep
+from time import monotonic
 from unittest import IsolatedAsyncioTestCase, main, skipIf
 from unittest.mock import MagicMock
 
 from ai_cmd.tools.tools_packs.files import FilesPack
+from ai_cmd.tools.tools_packs.lines import LineIndex, line_indexes
 
 
 class TestFilesPack(IsolatedAsyncioTestCase):
@@ -260,5 +265,303 @@ class TestFilesPack(IsolatedAsyncioTestCase):
         self.assertEqual(result_read["content"], content)
 
 
+class TestFilesPackRanges(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.files_pack = FilesPack(controller=MagicMock(), window=MagicMock())
+        self.test_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.test_dir, "lines.txt")
+        self.lines = [f"línea {i}" for i in range(1, 5001)]
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.lines) + "\n")
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.test_dir)
+        line_indexes.clear()
+
+    async def test_read_range(self):
+        result = await self.files_pack.tool_read(path=self.test_file, length=20)
+        self.assertEqual(result["content"], "línea 1\nlínea 2\nl")
+        self.assertEqual(result["next_offset"], 19)
+        self.assertEqual(result["size"], os.path.getsize(self.test_file))
+        result = await self.files_pack.tool_read(
+            path=self.test_file, offset=result["next_offset"], length=6
+        )
+        self.assertEqual(result["content"], "ínea ")
+
+    async def test_read_does_not_split_characters(self):
+        # El byte 2 esta en medio de la "í"
+        result = await self.files_pack.tool_read(path=self.test_file, length=2)
+        self.assertEqual(result["content"], "l")
+        self.assertEqual(result["next_offset"], 1)
+        result = await self.files_pack.tool_read(
+            path=self.test_file, offset=2, length=4
+        )
+        self.assertEqual(result["content"], "nea")
+
+    async def test_line_after_end(self):
+        path = os.path.join(self.test_dir, "short.txt")
+        with open(path, "w") as f:
+            f.write("a\nb\n")
+        for scanned in (False, True):
+            line_indexes.clear()
+            if scanned:
+                await self.files_pack.tool_count_lines(path=path)
+            result = await self.files_pack.tool_get_line(path=path, line_number=3)
+            self.assertEqual(result, {"error": "Line number 3 is out of range (1-2)"})
+            result = await self.files_pack.tool_read_lines(
+                path=path, start_line=3, end_line=5
+            )
+            self.assertEqual(result, {"error": "Line range 3-5 is out of range (1-2)"})
+            result = await self.files_pack.tool_get_line(path=path, line_number=2)
+            self.assertEqual(result, {"line": "b"})
+            result = await self.files_pack.tool_read_lines(
+                path=path, start_line=2, end_line=5
+            )
+            self.assertEqual(
+                result, {"content": "b\n", "start_line": 2, "end_line": 2}
+            )
+
+    async def test_read_until_end(self):
+        size = os.path.getsize(self.test_file)
+        result = await self.files_pack.tool_read(
+            path=self.test_file, offset=size - 11, length=100
+        )
+        self.assertEqual(result["content"], "ínea 5000\n")
+        self.assertNotIn("next_offset", result)
+
+    async def test_read_empty_file(self):
+        empty = os.path.join(self.test_dir, "empty.txt")
+        open(empty, "w").close()
+        result = await self.files_pack.tool_read(path=empty)
+        self.assertEqual(result, {"content": "", "size": 0})
+
+    async def test_get_line(self):
+        for number in (1, 1024, 1025, 3000, 5000):
+            result = await self.files_pack.tool_get_line(
+                path=self.test_file, line_number=number
+            )
+            self.assertEqual(result["line"], self.lines[number - 1])
+
+    async def test_get_line_out_of_range(self):
+        for number in (0, 5001):
+            result = await self.files_pack.tool_get_line(
+                path=self.test_file, line_number=number
+            )
+            self.assertEqual(
+                result["error"], f"Line number {number} is out of range (1-5000)"
+            )
+
+    async def test_get_line_without_final_newline(self):
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            f.write("uno\r\ndos")
+        result = await self.files_pack.tool_get_line(path=self.test_file, line_number=1)
+        self.assertEqual(result["line"], "uno")
+        result = await self.files_pack.tool_get_line(path=self.test_file, line_number=2)
+        self.assertEqual(result["line"], "dos")
+        result = await self.files_pack.tool_count_lines(path=self.test_file)
+        self.assertEqual(result["line_count"], 2)
+
+    async def test_index_is_reused(self):
+        await self.files_pack.tool_get_line(path=self.test_file, line_number=4000)
+        index = line_indexes.get(self.test_file, os.stat(self.test_file))
+        self.assertEqual(index.line, 4000)
+        self.assertEqual(len(index.offsets), 4)
+        await self.files_pack.tool_get_line(path=self.test_file, line_number=10)
+        self.assertIs(line_indexes.get(self.test_file, os.stat(self.test_file)), index)
+
+    async def test_index_is_invalidated(self):
+        await self.files_pack.tool_get_line(path=self.test_file, line_number=10)
+        await self.files_pack.tool_insert_line(
+            path=self.test_file, line_number=1, content="nueva"
+        )
+        result = await self.files_pack.tool_get_line(
+            path=self.test_file, line_number=10
+        )
+        self.assertEqual(result["line"], self.lines[8])
+        result = await self.files_pack.tool_count_lines(path=self.test_file)
+        self.assertEqual(result["line_count"], 5001)
+
+    async def test_read_lines(self):
+        result = await self.files_pack.tool_read_lines(
+            path=self.test_file, start_line=1023, end_line=1026
+        )
+        self.assertEqual(result["content"], "\n".join(self.lines[1022:1026]) + "\n")
+        self.assertEqual(result["start_line"], 1023)
+        self.assertEqual(result["end_line"], 1026)
+        self.assertNotIn("next_line", result)
+
+    async def test_read_lines_past_end(self):
+        result = await self.files_pack.tool_read_lines(
+            path=self.test_file, start_line=4999, end_line=6000
+        )
+        self.assertEqual(result["content"], "línea 4999\nlínea 5000\n")
+        self.assertEqual(result["end_line"], 5000)
+        result = await self.files_pack.tool_read_lines(
+            path=self.test_file, start_line=6000, end_line=6001
+        )
+        self.assertIn("error", result)
+
+    async def test_read_lines_limit(self):
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            f.write(("x" * 99 + "\n") * 5000)
+        result = await self.files_pack.tool_read_lines(
+            path=self.test_file, start_line=1, end_line=5000
+        )
+        self.assertEqual(result["next_line"], result["end_line"] + 1)
+        self.assertEqual(len(result["content"]), result["end_line"] * 100)
+
+
+class TestLineIndex(IsolatedAsyncioTestCase):
+
+    async def test_locate(self):
+        data = b"a\nbb\n\nccc\nd"
+        stat = os.stat_result((0,) * 6 + (len(data), 0, 0, 0))
+        index = LineIndex(stat, step=2)
+        self.assertEqual(index.locate(data, 3), 6)
+        self.assertEqual(index.offsets.tolist(), [0, 5, 10])
+        self.assertEqual(index.locate(data, 0), 0)
+        self.assertEqual(index.locate(data, 4), 10)
+        self.assertIsNone(index.locate(data, 5))
+        self.assertEqual(index.count(data), 5)
+
+    async def test_final_newline(self):
+        data = b"a\nb\n"
+        stat = os.stat_result((0,) * 6 + (len(data), 0, 0, 0))
+        index = LineIndex(stat)
+        self.assertEqual(index.count(data), 2)
+        self.assertIsNone(index.locate(data, 2))
+
+
+class TestFilesPackResponsiveness(IsolatedAsyncioTestCase):
+    """Las operaciones con archivos grandes no bloquean el bucle de eventos"""
+
+    SIZE_MB = 256
+    MAX_GAP = 0.25
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = tempfile.mkdtemp()
+        cls.big_file = os.path.join(cls.test_dir, "big.log")
+        block = b"".join(
+            b"%07d " % i + os.urandom(24).hex().encode() + b"\n" for i in range(16384)
+        )
+        cls.lines_per_block = 16384
+        hasher = hashlib.sha256()
+        with open(cls.big_file, "wb") as f:
+            for _ in range(cls.SIZE_MB):
+                f.write(block)
+                hasher.update(block)
+        cls.sha256 = hasher.hexdigest()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+        line_indexes.clear()
+
+    async def asyncSetUp(self):
+        self.files_pack = FilesPack(controller=MagicMock(), window=MagicMock())
+
+    async def measure(self, operation):
+        """Ejecuta la operacion y devuelve su resultado y la mayor pausa del bucle"""
+        done = Event()
+        gap = 0.0
+
+        async def ticker():
+            nonlocal gap
+            last = monotonic()
+            while not done.is_set():
+                await sleep(0.005)
+                now = monotonic()
+                gap = max(gap, now - last)
+                last = now
+
+        task = create_task(ticker())
+        try:
+            result = await operation
+        finally:
+            done.set()
+            await task
+        return result, gap
+
+    async def test_hash(self):
+        result, gap = await self.measure(
+            self.files_pack.tool_hash(path=self.big_file, algorithm="sha256")
+        )
+        self.assertEqual(result["hash"], self.sha256)
+        self.assertLess(gap, self.MAX_GAP)
+
+    async def test_copy(self):
+        destination = os.path.join(self.test_dir, "copy.log")
+        try:
+            result, gap = await self.measure(
+                self.files_pack.tool_copy(
+                    source_path=self.big_file, destination_path=destination
+                )
+            )
+            self.assertIn("message", result)
+            self.assertEqual(
+                os.path.getsize(destination), os.path.getsize(self.big_file)
+            )
+            self.assertLess(gap, self.MAX_GAP)
+        finally:
+            if os.path.exists(destination):
+                os.remove(destination)
+
+    async def test_read(self):
+        size = os.path.getsize(self.big_file)
+        with open(self.big_file, "rb") as f:
+            f.seek(size - 100)
+            expected = f.read().decode()
+        result, gap = await self.measure(
+            self.files_pack.tool_read(path=self.big_file, offset=size - 100)
+        )
+        self.assertEqual(result["content"], expected)
+        self.assertNotIn("next_offset", result)
+        self.assertLess(gap, self.MAX_GAP)
+
+    async def test_lines(self):
+        line_indexes.clear()
+        lines = self.SIZE_MB * self.lines_per_block
+        result, gap = await self.measure(
+            self.files_pack.tool_get_line(path=self.big_file, line_number=lines)
+        )
+        self.assertTrue(result["line"].startswith("%07d " % 16383))
+        self.assertLess(gap, self.MAX_GAP)
+        # Con el indice construido llegar a cualquier linea es inmediato
+        start = monotonic()
+        result = await self.files_pack.tool_get_line(
+            path=self.big_file, line_number=lines - 100_000
+        )
+        self.assertLess(monotonic() - start, 0.1)
+        self.assertEqual(result["line"][:7], "%07d" % ((lines - 100_000 - 1) % 16384))
+        result, gap = await self.measure(
+            self.files_pack.tool_count_lines(path=self.big_file)
+        )
+        self.assertEqual(result["line_count"], lines)
+
+    async def test_cancel_copy(self):
+        destination = os.path.join(self.test_dir, "cancelled.log")
+        try:
+            task = create_task(
+                self.files_pack.tool_copy(
+                    source_path=self.big_file, destination_path=destination
+                )
+            )
+            await sleep(0.05)
+            task.cancel()
+            with self.assertRaises(CancelledError):
+                await task
+            await sleep(0.1)
+            size = os.path.getsize(destination)
+            await sleep(0.2)
+            # La copia se detuvo antes de terminar
+            self.assertEqual(os.path.getsize(destination), size)
+            self.assertLess(size, os.path.getsize(self.big_file))
+        finally:
+            if os.path.exists(destination):
+                os.remove(destination)
+
+
 if __name__ == "__main__":
     main()
@@ -3,6 +3,8 @@ from unittest.mock import MagicMock
 
 from ai_cmd.tools.tools_packs.http import HttpPack
 
+from ..http.server import LocalServer
+
 
 class TestHttpPack(IsolatedAsyncioTestCase):
 
@@ -56,5 +58,36 @@ class TestHttpPack(IsolatedAsyncioTestCase):
         self.assertIn("error", result)
 
 
+class TestHttpPackLocal(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = LocalServer().__enter__()
+        self.server.route("/", b"<html>hola</html>")
+        self.http_pack = HttpPack(controller=MagicMock(), window=MagicMock())
+
+    async def asyncTearDown(self):
+        self.server.__exit__()
+
+    async def test_tool_request(self):
+        result = await self.http_pack.tool_request(url=self.server.url("/"))
+        self.assertEqual(result["status_code"], 200)
+        self.assertEqual(result["content"], "<html>hola</html>")
+
+    async def test_tool_request_post(self):
+        result = await self.http_pack.tool_request(
+            url=self.server.url("/"), method="post", data="{}"
+        )
+        self.assertEqual(result["status_code"], 200)
+        self.assertEqual(self.server.requests[-1][0], "POST")
+
+    async def test_tool_request_error(self):
+        result = await self.http_pack.tool_request(url=self.server.url("/missing"))
+        self.assertIn("error", result)
+
+    async def test_tool_status(self):
+        result = await self.http_pack.tool_status(url=self.server.url("/"))
+        self.assertEqual(result, {"status_code": 200})
+
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,15 @@
 from unittest import IsolatedAsyncioTestCase, main
-from unittest.mock import MagicMock
+import os
+from asyncio import CancelledError, create_task, sleep
+from tempfile import TemporaryDirectory
+from time import monotonic
+from unittest.mock import AsyncMock, MagicMock
 
+from ai_cmd.tools.events import (
+    ToolPackProcessEndEvent,
+    ToolPackProcessOutputEvent,
+    ToolPackProcessStartEvent,
+)
 from ai_cmd.tools.tool_pack import ToolPack
 from ai_cmd.tools.tools_packs.os import OSPack
 
@@ -8,7 +17,7 @@ from ai_cmd.tools.tools_packs.os import OSPack
 class TestOSPack(IsolatedAsyncioTestCase):
 
     async def asyncSetUp(self):
-        self.os_pack = OSPack(controller=MagicMock(), window=MagicMock())
+        self.os_pack = OSPack(controller=AsyncMock(), window=MagicMock())
 
     async def test_is_tool_pack(self):
         self.assertIsInstance(self.os_pack, ToolPack)
@@ -27,6 +36,140 @@ class TestOSPack(IsolatedAsyncioTestCase):
         result = await self.os_pack.tool_shell(command="ls /nonexistent")
         self.assertNotEqual(result["stderr"], "")
 
+    async def test_tool_shell_events(self):
+        await self.os_pack.tool_shell(command="echo hola; echo error >&2")
+        events = [
+            call.kwargs["event"]
+            for call in self.os_pack.controller.trigger.call_args_list
+        ]
+        self.assertIsInstance(events[0], ToolPackProcessStartEvent)
+        self.assertIsInstance(events[-1], ToolPackProcessEndEvent)
+        self.assertEqual(events[-1].returncode, 0)
+        output = {
+            event.stream: event.content
+            for event in events
+            if isinstance(event, ToolPackProcessOutputEvent)
+        }
+        self.assertEqual(output, {"stdout": "hola\n", "stderr": "error\n"})
+
+    async def test_tool_shell_timeout(self):
+        start = monotonic()
+        result = await self.os_pack.tool_shell(
+            command="echo antes; sleep 10", timeout=0.3
+        )
+        self.assertLess(monotonic() - start, 5)
+        self.assertTrue(result["timeout"])
+        self.assertEqual(result["stdout"], "antes\n")
+
+    async def test_tool_shell_does_not_block(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await sleep(0.01)
+                ticks += 1
+
+        task = create_task(ticker())
+        result = await self.os_pack.tool_shell(command="sleep 0.5; echo fin")
+        task.cancel()
+        self.assertEqual(result["stdout"], "fin\n")
+        self.assertGreater(ticks, 10)
+
+    async def test_tool_shell_cancel(self):
+        task = create_task(self.os_pack.tool_shell(command="sleep 10"))
+        await sleep(0.2)
+        start = monotonic()
+        task.cancel()
+        with self.assertRaises(CancelledError):
+            await task
+        self.assertLess(monotonic() - start, 5)
+        event = self.os_pack.controller.trigger.call_args.kwargs["event"]
+        self.assertIsInstance(event, ToolPackProcessEndEvent)
+
+
+class TestOSPackSessions(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.os_pack = OSPack(controller=AsyncMock(), window=MagicMock())
+        self.directory = TemporaryDirectory()
+        result = await self.os_pack.tool_session_open(cwd=self.directory.name)
+        self.session = result["session"]
+
+    async def asyncTearDown(self):
+        await self.os_pack.reset()
+        self.directory.cleanup()
+
+    async def run_command(self, command: str, **kwargs):
+        return await self.os_pack.tool_session_run(
+            session=self.session, command=command, **kwargs
+        )
+
+    async def test_state_is_kept(self):
+        await self.run_command("mkdir sub && cd sub")
+        await self.run_command("export SALUDO=hola")
+        result = await self.run_command('echo "$SALUDO" && pwd')
+        self.assertEqual(
+            result["stdout"], f"hola\n{os.path.realpath(self.directory.name)}/sub\n"
+        )
+
+    async def test_returncode_and_stderr(self):
+        result = await self.run_command("echo error >&2; false")
+        self.assertEqual(result["returncode"], 1)
+        self.assertEqual(result["stdout"], "")
+        self.assertEqual(result["stderr"], "error\n")
+        result = await self.run_command("printf sin-salto")
+        self.assertEqual(result["returncode"], 0)
+        self.assertEqual(result["stdout"], "sin-salto")
+
+    async def test_large_output(self):
+        result = await self.run_command("python -c \"print('x' * 300_000)\"")
+        self.assertEqual(result["returncode"], 0)
+        self.assertIn("caracteres omitidos", result["stdout"])
+        self.assertTrue(result["stdout"].endswith("x\n"))
+
+    async def test_syntax_error_keeps_session(self):
+        result = await self.run_command("echo 'sin cerrar")
+        self.assertNotEqual(result["returncode"], 0)
+        result = await self.run_command("echo sigue")
+        self.assertEqual(result["stdout"], "sigue\n")
+
+    async def test_exit_closes_session(self):
+        result = await self.run_command("exit 3")
+        self.assertEqual(result["returncode"], 3)
+        self.assertTrue(result["closed"])
+        result = await self.run_command("echo hola")
+        self.assertIn("error", result)
+
+    async def test_dead_shell_closes_session(self):
+        shell = self.os_pack.sessions[self.session]
+        process = shell.process
+        # La terminal muere justo cuando se le escribe el comando
+        process.kill()
+        process.stdin.drain = AsyncMock(side_effect=BrokenPipeError)
+        result = await self.run_command("echo hola")
+        self.assertTrue(result["closed"])
+        self.assertIsNone(shell.process)
+        self.assertEqual(self.os_pack.sessions, {})
+
+    async def test_timeout_closes_session(self):
+        result = await self.run_command("sleep 10", timeout=0.3)
+        self.assertTrue(result["timeout"])
+        self.assertTrue(result["closed"])
+        self.assertEqual((await self.os_pack.tool_session_list())["sessions"], [])
+
+    async def test_close_and_reset(self):
+        other = (await self.os_pack.tool_session_open())["session"]
+        result = await self.os_pack.tool_session_list()
+        self.assertEqual(len(result["sessions"]), 2)
+        self.assertEqual(
+            await self.os_pack.tool_session_close(other), {"success": True}
+        )
+        shell = self.os_pack.sessions[self.session]
+        await self.os_pack.reset()
+        self.assertFalse(shell.alive)
+        self.assertEqual(self.os_pack.sessions, {})
+
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,15 @@
 import os
-from unittest import IsolatedAsyncioTestCase, main
-from unittest.mock import MagicMock
+import shutil
+import tempfile
+import time
+from unittest import IsolatedAsyncioTestCase, main, skipUnless
+from unittest.mock import MagicMock, patch
 
 from ai_cmd.tools.tool_pack import ToolPack
+from ai_cmd.tools.tools_packs.dirs.base import DirsPack
+from ai_cmd.tools.tools_packs.files import FilesPack
 from ai_cmd.tools.tools_packs.paths import PathsPack
+from ai_cmd.tools.tools_packs.stats import StatCache
 
 
 class TestPathsPack(IsolatedAsyncioTestCase):
@@ -51,5 +57,138 @@ class TestPathsPack(IsolatedAsyncioTestCase):
         self.assertIn("error", result)
 
 
+class TestStatCache(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "file.txt")
+        self.write("abc")
+        self.cache = StatCache()
+
+    async def asyncTearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.root)
+
+    def write(self, content: str, path: str = ""):
+        with open(path or self.path, "w") as f:
+            f.write(content)
+
+    def counting(self):
+        return patch("os.lstat", wraps=os.lstat)
+
+    async def test_metadata_with_one_stat(self):
+        files_pack = FilesPack(controller=MagicMock(), window=MagicMock())
+        with self.counting() as lstat, patch("os.stat", wraps=os.stat) as stat:
+            result = await files_pack.tool_get_metadata(path=self.path)
+        calls = lstat.call_args_list + stat.call_args_list
+        self.assertEqual([call.args[0] for call in calls].count(self.path), 1)
+        self.assertEqual(result["size"], 3)
+        self.assertTrue(result["is_file"])
+        self.assertFalse(result["is_directory"])
+        self.assertFalse(result["is_link"])
+        link = os.path.join(self.root, "link")
+        os.symlink(self.root, link)
+        result = await files_pack.tool_get_metadata(path=link)
+        self.assertTrue(result["is_link"])
+        self.assertTrue(result["is_directory"])
+
+    async def test_cached(self):
+        self.assertEqual(self.cache.stat(self.path).st_size, 3)
+        with self.counting() as lstat:
+            self.assertEqual(self.cache.stat(self.path).st_size, 3)
+            self.assertTrue(self.cache.exists(self.path))
+        lstat.assert_not_called()
+
+    @skipUnless(StatCache().watch, "Sin inotify")
+    async def test_inotify_invalidation(self):
+        missing = os.path.join(self.root, "new.txt")
+        self.assertFalse(self.cache.exists(missing))
+        self.assertEqual(self.cache.stat(self.path).st_size, 3)
+        self.assertIsNotNone(self.cache.inotify)
+        self.write("abcdef")
+        self.write("x", missing)
+        self.assertEqual(self.cache.stat(self.path).st_size, 6)
+        self.assertTrue(self.cache.exists(missing))
+        mtime = self.cache.stat(self.root).st_mtime_ns
+        os.remove(missing)
+        self.assertFalse(self.cache.exists(missing))
+        self.assertGreaterEqual(self.cache.stat(self.root).st_mtime_ns, mtime)
+        with self.assertRaises(FileNotFoundError):
+            self.cache.stat(missing)
+
+    @skipUnless(StatCache().watch, "Sin inotify")
+    async def test_directory_removed(self):
+        folder = os.path.join(self.root, "folder")
+        inner = os.path.join(folder, "inner.txt")
+        os.makedirs(folder)
+        self.write("abc", inner)
+        self.assertTrue(self.cache.exists(inner))
+        shutil.rmtree(folder)
+        self.assertFalse(self.cache.exists(inner))
+        self.assertFalse(self.cache.exists(folder))
+
+    async def test_ttl_without_inotify(self):
+        cache = StatCache(ttl=0.2, watch=False)
+        self.assertEqual(cache.stat(self.path).st_size, 3)
+        self.write("abcdef")
+        self.assertEqual(cache.stat(self.path).st_size, 3)
+        time.sleep(0.25)
+        self.assertEqual(cache.stat(self.path).st_size, 6)
+        self.assertIsNone(cache.inotify)
+
+    async def test_invalidated_by_tools(self):
+        cache = StatCache(ttl=60, watch=False)
+        packs = [
+            pack(controller=MagicMock(), window=MagicMock())
+            for pack in (FilesPack, PathsPack, DirsPack)
+        ]
+        files_pack, paths_pack, dirs_pack = packs
+        moved = os.path.join(self.root, "moved.txt")
+        folder = os.path.join(self.root, "folder")
+        inner = os.path.join(folder, "inner.txt")
+        with (
+            patch("ai_cmd.tools.tools_packs.stats.stat_cache", cache),
+            patch("ai_cmd.tools.tools_packs.files.stat_cache", cache),
+            patch("ai_cmd.tools.tools_packs.paths.stat_cache", cache),
+        ):
+            result = await files_pack.tool_get_metadata(path=self.path)
+            self.assertEqual(result["size"], 3)
+            await files_pack.tool_write(path=self.path, content="abcdef")
+            result = await files_pack.tool_get_metadata(path=self.path)
+            self.assertEqual(result["size"], 6)
+            self.assertFalse((await paths_pack.tool_exists(path=moved))["exists"])
+            await files_pack.tool_move(source_path=self.path, destination_path=moved)
+            self.assertFalse((await paths_pack.tool_exists(path=self.path))["exists"])
+            self.assertTrue((await paths_pack.tool_exists(path=moved))["exists"])
+            await files_pack.tool_delete(path=moved)
+            self.assertFalse((await paths_pack.tool_exists(path=moved))["exists"])
+            await dirs_pack.tool_create(path=folder)
+            await files_pack.tool_create(path=inner)
+            self.assertTrue((await paths_pack.tool_exists(path=inner))["exists"])
+            await dirs_pack.tool_rename(path=folder, new_name=moved)
+            self.assertFalse((await paths_pack.tool_exists(path=inner))["exists"])
+            self.assertTrue((await paths_pack.tool_exists(path=moved))["exists"])
+        cache.close()
+
+    async def test_bounded(self):
+        cache = StatCache(max_entries=2)
+        paths = [os.path.join(self.root, f"{i}.txt") for i in range(5)]
+        for path in paths:
+            self.write("a", path)
+            cache.stat(path)
+        self.assertEqual(list(cache.entries), paths[-2:])
+        self.assertLessEqual(len(cache.watches), 1)
+        cache.invalidate()
+        self.assertEqual(len(cache.entries), 0)
+        self.assertEqual(cache.watches, {})
+        self.assertEqual(cache.watched, {})
+        cache.close()
+
+    async def test_errors(self):
+        self.assertFalse(self.cache.exists("a\0b"))
+        with self.assertRaises(NotADirectoryError):
+            self.cache.stat(os.path.join(self.path, "child"))
+
+
 if __name__ == "__main__":
     main()
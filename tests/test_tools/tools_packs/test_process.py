@@ -0,0 +1,44 @@
+from unittest import IsolatedAsyncioTestCase, TestCase, main
+
+from ai_cmd.tools.tools_packs.process import OutputBuffer, run_process
+
+
+class TestOutputBuffer(TestCase):
+    def test_short_output(self):
+        buffer = OutputBuffer(max_chars=10)
+        buffer.write("hola")
+        buffer.write(" mundo")
+        self.assertEqual(buffer.getvalue(), "hola mundo")
+
+    def test_head_and_tail(self):
+        buffer = OutputBuffer(max_chars=10)
+        for char in "abcdefghijklmnopqrstuvwxyz":
+            buffer.write(char)
+        self.assertEqual(buffer.omitted, 16)
+        self.assertEqual(
+            buffer.getvalue(), "abcde\n... [16 caracteres omitidos] ...\nvwxyz"
+        )
+
+
+class TestRunProcess(IsolatedAsyncioTestCase):
+    async def test_large_output(self):
+        result = await run_process(
+            "python -c \"print('x' * 1_000_000)\"", max_chars=100
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertLess(len(result.stdout), 200)
+        self.assertIn("caracteres omitidos", result.stdout)
+
+    async def test_split_utf8(self):
+        received: list[str] = []
+
+        async def on_output(stream: str, content: str):
+            received.append(content)
+
+        result = await run_process("printf 'ñandú'", on_output=on_output)
+        self.assertEqual(result.stdout, "ñandú")
+        self.assertEqual("".join(received), "ñandú")
+
+
+if __name__ == "__main__":
+    main()
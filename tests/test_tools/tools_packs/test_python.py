@@ -1,7 +1,21 @@
+import os
+from asyncio import gather
+from time import monotonic
 from unittest import IsolatedAsyncioTestCase, main
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+from ai_cmd.app.commands.commands_packs.history import HistoryPack
+from ai_cmd.controller.base import Controller
+from ai_cmd.core.base import Core
+from ai_cmd.core.history.base import History
+from ai_cmd.tools.base import Tools
 from ai_cmd.tools.tools_packs.python.base import PythonPack
+from ai_cmd.tools.tools_packs.python.executors import (
+    PythonProgram,
+    RingBuffer,
+    scripts,
+)
+from ai_cmd.tools.tools_packs.python.pool import PythonPool
 
 
 class TestPythonPack(IsolatedAsyncioTestCase):
@@ -9,13 +23,257 @@ class TestPythonPack(IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         self.python_pack = PythonPack(controller=MagicMock(), window=MagicMock())
 
-    async def test_tool_list(self): ...
+    async def test_tool_list(self):
+        result = await self.python_pack.tool_execute(code="pass", description="nada")
+        result = await self.python_pack.tool_list(confirm=True)
+        self.assertEqual(len(result["programs"]), 1)
+        self.assertEqual(result["programs"][0]["description"], "nada")
 
-    async def test_tool_execute(self): ...
+    async def test_tool_execute(self):
+        result = await self.python_pack.tool_execute(
+            code="print('hola')", description="saludo"
+        )
+        _, program = self.python_pack.programs[result["id"]]
+        self.assertEqual(await program.wait(timeout=5), 0)
+        self.assertFalse(os.path.exists(program.path))
 
-    async def test_tool_comunicate(self): ...
+    async def test_tool_comunicate(self):
+        code = "import sys\nname = input()\nprint('hola', name)\nprint('aviso', file=sys.stderr)\nprint(input())"
+        id = (await self.python_pack.tool_execute(code=code, description="eco"))["id"]
+        result = await self.python_pack.tool_comunicate(id=id, input="mundo")
+        self.assertEqual(result["stdout"], "hola mundo\n")
+        self.assertEqual(result["stderr"], "aviso\n")
+        self.assertIsNone(result["return_code"])
+        result = await self.python_pack.tool_comunicate(id=id, input="fin", timeout=5)
+        self.assertEqual(result["stdout"], "fin\n")
+        self.assertEqual(result["stderr"], "")
+        self.assertEqual(result["return_code"], 0)
 
-    async def test_tool_kill(self): ...
+    async def test_tool_kill(self):
+        id = (await self.python_pack.tool_execute(code="input()", description=""))["id"]
+        result = await self.python_pack.tool_kill(id=id)
+        self.assertIsNotNone(result["return_code"])
+        self.assertNotIn(id, self.python_pack.programs)
+        self.assertIn("error", await self.python_pack.tool_kill(id=id))
+
+    async def test_comunicate_does_not_block(self):
+        ids = [
+            (await self.python_pack.tool_execute(code="input()", description=""))["id"]
+            for _ in range(5)
+        ]
+        start = monotonic()
+        results = await gather(
+            *(self.python_pack.tool_comunicate(id=id, timeout=0.5) for id in ids)
+        )
+        self.assertLess(monotonic() - start, 2)
+        self.assertTrue(all(result["return_code"] is None for result in results))
+
+    async def test_tool_run(self):
+        result = await self.python_pack.tool_run(code="print(sum(range(10)))")
+        self.assertEqual(result, {"stdout": "45\n", "stderr": ""})
+
+    async def test_tool_run_error(self):
+        result = await self.python_pack.tool_run(code="x = 1\n1 / 0")
+        self.assertIn("ZeroDivisionError", result["error"])
+        self.assertIn("1 / 0", result["error"])
+
+    async def test_tool_run_timeout(self):
+        result = await self.python_pack.tool_run(code="while True: pass", timeout=0.5)
+        self.assertIn("error", result)
+        result = await self.python_pack.tool_run(code="print('sigue')")
+        self.assertEqual(result["stdout"], "sigue\n")
+
+    async def asyncTearDown(self):
+        await self.python_pack.reset()
+
+
+class TestPythonProgram(IsolatedAsyncioTestCase):
+
+    async def test_ring_buffer(self):
+        buffer = RingBuffer(size=5)
+        buffer.write("abc")
+        self.assertEqual(buffer.read(0), ("abc", 3, 0))
+        buffer.write("defgh")
+        self.assertEqual(buffer.read(3), ("defgh", 8, 0))
+        self.assertEqual(buffer.read(0), ("defgh", 8, 3))
+
+    async def test_large_output(self):
+        program = PythonProgram(
+            code="print('x' * 100_000)\nprint('fin')", buffer_size=1000
+        )
+        await program.start()
+        result = await program.comunicate(timeout=5)
+        self.assertEqual(result["return_code"], 0)
+        self.assertTrue(result["stdout"].endswith("x\nfin\n"))
+        self.assertEqual(len(result["stdout"]), 1000)
+        self.assertEqual(result["stdout_lost"], 100_005 - 1000)
+
+    async def test_incremental_reads(self):
+        code = "import time\nprint('uno', flush=True)\ntime.sleep(0.3)\nprint('dos')"
+        program = PythonProgram(code=code)
+        await program.start()
+        first = await program.comunicate(timeout=0.2)
+        second = await program.comunicate(timeout=5)
+        self.assertEqual(first["stdout"], "uno\n")
+        self.assertEqual(second["stdout"], "dos\n")
+
+    async def test_scripts_are_forgotten(self):
+        program = PythonProgram(code="print('hola')")
+        self.assertIn(program.path, scripts)
+        await program.start()
+        await program.comunicate(timeout=5)
+        self.assertNotIn(program.path, scripts)
+        self.assertFalse(os.path.exists(program.path))
+
+
+class TestPythonPool(IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+
+    async def test_fresh_namespace(self):
+        self.pool = PythonPool(size=1)
+        await self.pool.run("x = 1")
+        result = await self.pool.run("print('x' in globals())")
+        self.assertEqual(result["stdout"], "False\n")
+
+    async def test_preload(self):
+        self.pool = PythonPool(size=1, preload=["decimal", "no_existe"])
+        result = await self.pool.run("import sys; print('decimal' in sys.modules)")
+        self.assertEqual(result["stdout"], "True\n")
+        self.assertIn("no_existe", self.pool.idle[0].failed)
+
+    async def test_recycle_after_runs(self):
+        self.pool = PythonPool(size=1, max_runs=2)
+        pids = set()
+        for _ in range(4):
+            result = await self.pool.run("import os; print(os.getpid())")
+            pids.add(result["stdout"])
+        self.assertEqual(len(pids), 2)
+
+    async def test_recycle_on_memory_growth(self):
+        self.pool = PythonPool(size=1, max_rss_growth=50 * 1024 * 1024)
+        first = await self.pool.run(
+            "import os, sys; sys.keep = bytearray(100 * 1024 * 1024); print(os.getpid())"
+        )
+        second = await self.pool.run("import os; print(os.getpid())")
+        self.assertNotEqual(first["stdout"], second["stdout"])
+
+    async def test_concurrent_runs(self):
+        self.pool = PythonPool(size=2)
+        start = monotonic()
+        results = await gather(
+            *(self.pool.run("import time; time.sleep(0.5)") for _ in range(2))
+        )
+        self.assertEqual(len(results), 2)
+        self.assertLess(monotonic() - start, 1.5)
+        self.assertEqual(self.pool.workers, 2)
+
+    async def test_worker_crash(self):
+        self.pool = PythonPool(size=1)
+        with self.assertRaises(RuntimeError):
+            await self.pool.run("import os; os._exit(1)")
+        result = await self.pool.run("print('hola')")
+        self.assertEqual(result["stdout"], "hola\n")
+
+
+class TestPythonKernel(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.python_pack = PythonPack(controller=MagicMock(), window=MagicMock())
+        self.python_pack.kernel_memory = 512 * 1024 * 1024
+        self.kernel = (await self.python_pack.tool_kernel_open())["kernel"]
+
+    async def asyncTearDown(self):
+        await self.python_pack.reset()
+
+    async def run_code(self, code: str, **kwargs):
+        return await self.python_pack.tool_kernel_run(
+            kernel=self.kernel, code=code, **kwargs
+        )
+
+    async def test_state_and_result(self):
+        result = await self.run_code("datos = [1, 2, 3]\nprint('cargado')\nlen(datos)")
+        self.assertEqual(result, {"stdout": "cargado\n", "stderr": "", "result": "3"})
+        result = await self.run_code("datos.append(4)\nsum(datos)")
+        self.assertEqual(result["result"], "10")
+        result = await self.run_code("_ * 2")
+        self.assertEqual(result["result"], "20")
+
+    async def test_statement_without_result(self):
+        result = await self.run_code("x = 1")
+        self.assertNotIn("result", result)
+
+    async def test_error_keeps_state(self):
+        await self.run_code("x = 1")
+        result = await self.run_code("x / 0")
+        self.assertIn("ZeroDivisionError", result["error"])
+        result = await self.run_code("def f(:")
+        self.assertIn("SyntaxError", result["error"])
+        self.assertEqual((await self.run_code("x"))["result"], "1")
+
+    async def test_timeout_interrupts(self):
+        await self.run_code("x = 1")
+        start = monotonic()
+        result = await self.run_code("while True: pass", timeout=0.3)
+        self.assertLess(monotonic() - start, 2)
+        self.assertTrue(result["timeout"])
+        self.assertIn("KeyboardInterrupt", result["error"])
+        self.assertEqual((await self.run_code("x"))["result"], "1")
+
+    async def test_memory_limit(self):
+        await self.run_code("x = 1")
+        result = await self.run_code("datos = bytearray(1024 * 1024 * 1024)")
+        self.assertIn("MemoryError", result["error"])
+        self.assertEqual((await self.run_code("x"))["result"], "1")
+
+    async def test_reset(self):
+        await self.run_code("x = 1")
+        result = await self.python_pack.tool_kernel_reset(kernel=self.kernel)
+        self.assertEqual(result, {"success": True})
+        self.assertIn("NameError", (await self.run_code("x"))["error"])
+
+    async def test_close(self):
+        result = await self.python_pack.tool_kernel_close(kernel=self.kernel)
+        self.assertEqual(result, {"success": True})
+        self.assertIn("error", await self.run_code("1"))
+
+
+class TestPythonPackReset(IsolatedAsyncioTestCase):
+
+    async def test_reset_command_stops_processes(self):
+        controller = Controller()
+        python_pack = PythonPack(controller=controller, window=MagicMock())
+        core = Core(
+            controller=controller,
+            ai=MagicMock(),
+            history=History(controller=controller, messages=[]),
+            tools=Tools(controller=controller, tool_packs=[python_pack]),
+        )
+        await python_pack.pool.run("print('hola')")
+        kernel = (await python_pack.tool_kernel_open())["kernel"]
+        program = await python_pack.tool_execute(
+            code="import time; time.sleep(60)", description="espera"
+        )
+        processes = [
+            *(worker.process for worker in python_pack.pool.idle),
+            python_pack.kernels[kernel].process,
+            python_pack.programs[program["id"]][1].process,
+        ]
+        self.assertTrue(all(process.returncode is None for process in processes))
+
+        history_pack = HistoryPack(controller=controller)
+        history_pack.join(MagicMock(core=core))
+        with patch(
+            "ai_cmd.app.commands.commands_packs.history.create_assistant_core"
+        ) as create:
+            await history_pack.do_reset()
+        create.assert_called_once()
+        self.assertIs(history_pack.app.core, create.return_value)
+        self.assertTrue(all(process.returncode is not None for process in processes))
+        self.assertEqual(python_pack.pool.workers, 0)
+        self.assertEqual(python_pack.kernels, {})
+        self.assertEqual(python_pack.programs, {})
 
 
 if __name__ == "__main__":
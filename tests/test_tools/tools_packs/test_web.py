@@ -1,9 +1,19 @@
 import os
+from tempfile import TemporaryDirectory
 from unittest import IsolatedAsyncioTestCase, main, skipIf
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+from ai_cmd.tools.http.cache import HttpCache, ParsedCache
+from ai_cmd.tools.http.client import HttpClient
+from ai_cmd.tools.tools_packs import web
 from ai_cmd.tools.tools_packs.web import WebPack
 
+from ..http.server import LocalServer
+
+PAGE = b"""<html><head><script>var a = 1;</script></head>
+<body><a href="/uno">Uno</a><p>Hola mundo</p><a href="https://example.com">Dos</a></body>
+</html>"""
+
 
 class TestWebPack(IsolatedAsyncioTestCase):
 
@@ -56,5 +66,83 @@ class TestWebPack(IsolatedAsyncioTestCase):
         self.assertIn("error", result)
 
 
+@skipIf(
+    os.system("pip show beautifulsoup4 > /dev/null 2>&1") != 0,
+    "beautifulsoup4 is not installed",
+)
+class TestWebPackLocal(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = LocalServer().__enter__()
+        self.server.route("/", PAGE)
+        self.web_pack = WebPack(controller=MagicMock(), window=MagicMock())
+
+    async def asyncTearDown(self):
+        self.server.__exit__()
+
+    async def test_tool_links(self):
+        result = await self.web_pack.tool_links(url=self.server.url("/"))
+        self.assertEqual(result["links"], ["/uno", "https://example.com"])
+
+
+class TestWebPackRead(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = TemporaryDirectory()
+        self.server = LocalServer().__enter__()
+        self.server.route("/", PAGE)
+        self.server.route("/cache", PAGE, **{"Cache-Control": "max-age=60"})
+        self.server.route("/long", b"<p>" + b"palabra " * 1000 + b"</p>")
+        self.client = HttpClient(cache=HttpCache(directory=self.directory.name))
+        self.patcher = patch.object(web, "http_client", self.client)
+        self.patcher.start()
+        self.web_pack = WebPack(controller=MagicMock(), window=MagicMock())
+
+    async def asyncTearDown(self):
+        self.patcher.stop()
+        await self.client.close()
+        self.server.__exit__()
+        self.directory.cleanup()
+
+    async def test_tool_read(self):
+        result = await self.web_pack.tool_read(url=self.server.url("/"))
+        self.assertIn("Hola mundo", result["content"])
+        self.assertNotIn("var a", result["content"])
+        self.assertNotIn("next_offset", result)
+
+    async def test_tool_read_parsed_cache(self):
+        with patch.object(web, "parsed_cache", ParsedCache()) as cache:
+            first = await self.web_pack.tool_read(url=self.server.url("/cache"))
+            self.assertEqual(len(cache.values), 1)
+            with patch.object(web.TextExtractor, "feed") as feed:
+                second = await self.web_pack.tool_read(url=self.server.url("/cache"))
+                feed.assert_not_called()
+        self.assertEqual(first, second)
+
+    async def test_tool_read_pages(self):
+        url = self.server.url("/long")
+        first = await self.web_pack.tool_read(url=url, limit=5000)
+        self.assertEqual(len(first["content"]), 5000)
+        self.assertEqual(first["next_offset"], 5000)
+        second = await self.web_pack.tool_read(url=url, offset=5000, limit=5000)
+        self.assertEqual(len(second["content"]), first["length"] - 5000)
+        self.assertNotIn("next_offset", second)
+        self.assertEqual(len(self.server.requests), 1)
+
+    async def test_tool_read_budget(self):
+        self.web_pack.max_chars = 100
+        url = self.server.url("/long")
+        result = await self.web_pack.tool_read(url=url, limit=50)
+        self.assertLessEqual(result["length"], 100)
+        self.assertEqual(result["next_offset"], 50)
+        self.assertTrue(result["truncated"])
+        result = await self.web_pack.tool_read(url=url, offset=100)
+        self.assertIn("error", result)
+
+    async def test_tool_read_error(self):
+        result = await self.web_pack.tool_read(url=self.server.url("/missing"))
+        self.assertIn("error", result)
+
+
 if __name__ == "__main__":
     main()